@@ -0,0 +1,209 @@
+"""
+Offline load benchmark for the chat, upload and translation flows.
+
+Starts the Together stub and the FastAPI app (against a throwaway SQLite DB
+in a temp dir) as subprocesses, drives them with concurrent clients and
+reports p50/p95/p99 latency and requests/sec per flow.
+
+    cd backend
+    python benchmarks/load_test.py --requests 200 --concurrency 20
+    python benchmarks/load_test.py --flows chat --stub-latency 1.0 --json
+
+Nothing leaves the machine: the app is pointed at the local stub.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from sample_pdf import make_pdf  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class FlowResult:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def summary(self):
+        ok = len(self.latencies)
+        return {
+            "flow": self.name,
+            "ok": ok,
+            "errors": self.errors,
+            "rps": round(ok / self.elapsed, 2) if self.elapsed else 0.0,
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 1),
+            "mean_ms": round(statistics.mean(self.latencies) * 1000, 1) if ok else 0.0,
+        }
+
+
+async def run_flow(name, total, concurrency, one_request):
+    result = FlowResult(name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def worker(i):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await one_request(i)
+                result.latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                result.errors += 1
+                if result.errors <= 3:
+                    print(f"  [{name}] request {i} failed: {e!r}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(total)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def benchmark(args, app_url):
+    async with httpx.AsyncClient(base_url=app_url, timeout=args.timeout,
+                                 limits=httpx.Limits(max_connections=args.concurrency * 2)) as client:
+        await client.post("/auth/register", json={"email": "bench@example.com", "password": "bench", "full_name": "Bench"})
+        login = await client.post("/auth/login", data={"username": "bench@example.com", "password": "bench"})
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        pdf_bytes = make_pdf(pages=args.pdf_pages)
+        results = []
+
+        async def chat(i):
+            # Unique text per request so the completion cache does not short-circuit the run
+            r = await client.post("/chat/message", json={"message": f"Benchmark question {i}: explain anticipatory bail."})
+            r.raise_for_status()
+
+        async def upload(i):
+            files = {"file": (f"bench_{i}.pdf", pdf_bytes, "application/pdf")}
+            r = await client.post("/cases/upload", files=files, data={"language": "English"})
+            r.raise_for_status()
+
+        async def translation(i):
+            files = {"file": (f"bench_tr_{i}.pdf", make_pdf(pages=args.pdf_pages, lines_per_page=40 + i % 7), "application/pdf")}
+            r = await client.post("/cases/upload", files=files, data={"language": "Hindi"})
+            r.raise_for_status()
+            case_id = r.json()["case_id"]
+            deadline = time.time() + args.timeout
+            while time.time() < deadline:
+                status = (await client.get(f"/cases/{case_id}/status")).json()
+                if status["status"] == "done":
+                    return
+                if status["status"] == "failed":
+                    raise RuntimeError(status["error"])
+                await asyncio.sleep(args.poll_interval)
+            raise TimeoutError(f"case {case_id} not translated within {args.timeout}s")
+
+        flows = {"chat": chat, "upload": upload, "translation": translation}
+        for name in args.flows:
+            total = args.requests if name != "translation" else max(1, args.requests // 10)
+            print(f"Running {name}: {total} requests, concurrency {args.concurrency}...")
+            results.append(await run_flow(name, total, args.concurrency, flows[name]))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", nargs="+", default=["chat", "upload", "translation"],
+                        choices=["chat", "upload", "translation"])
+    parser.add_argument("--requests", type=int, default=100, help="requests per flow (translation runs a tenth)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--pdf-pages", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    parser.add_argument("--stub-latency", type=float, default=0.2)
+    parser.add_argument("--stub-tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--stub-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the app")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="legal_ai_bench_")
+    stub_port, app_port = free_port(), free_port()
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        TOGETHER_BASE_URL=f"http://127.0.0.1:{stub_port}/v1/chat/completions",
+        TOGETHER_API_KEY="stub",
+        AI_CACHE_DB_PATH=os.path.join(workdir, "ai_cache.db"),
+        JUDGMENTS_REFRESH_ENABLED="false",
+        PYTHONPATH=BACKEND_DIR,
+    )
+
+    processes = []
+    try:
+        processes.append(subprocess.Popen([
+            sys.executable, os.path.join(BENCH_DIR, "together_stub.py"), "--port", str(stub_port),
+            "--latency", str(args.stub_latency), "--tokens-per-second", str(args.stub_tokens_per_second),
+            "--error-rate", str(args.stub_error_rate), "--rate-limit-rate", str(args.stub_rate_limit_rate),
+        ], cwd=workdir, env=env))
+        processes.append(subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+            "--port", str(app_port), "--workers", str(args.workers), "--log-level", "warning",
+        ], cwd=workdir, env=env, stdout=subprocess.DEVNULL))
+        wait_until_up(f"http://127.0.0.1:{stub_port}/_stub")
+        wait_until_up(f"http://127.0.0.1:{app_port}/health")
+
+        results = asyncio.run(benchmark(args, f"http://127.0.0.1:{app_port}"))
+        stub_stats = httpx.get(f"http://127.0.0.1:{stub_port}/_stub").json()["stats"]
+    finally:
+        for p in processes:
+            p.terminate()
+        for p in processes:
+            p.wait(timeout=10)
+
+    summaries = [r.summary() for r in results]
+    if args.json:
+        print(json.dumps({"results": summaries, "stub": stub_stats}, indent=2))
+        return
+    print()
+    print(f"{'flow':<12}{'ok':>6}{'err':>6}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for s in summaries:
+        print(f"{s['flow']:<12}{s['ok']:>6}{s['errors']:>6}{s['rps']:>9}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}")
+    print(f"\nstub: {stub_stats}")
+    print(f"artifacts: {workdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Parse-time benchmark for the judgment scrapers, against recorded pages.
+
+Runs the streaming parsers (sci_scraper.parse_judgments,
+scraper_service.parse_sc_judgments) and the full-tree reference parsers over
+the HTML fixtures in benchmarks/fixtures, reports mean/min parse time per
+page and exits non-zero if the two disagree on any fixture.
+
+    cd backend
+    python benchmarks/parse_bench.py --repeat 50
+    python benchmarks/parse_bench.py --json
+
+Fixtures: sci_home*.html are SCI homepages, indiankanoon_*.html are Indian
+Kanoon search result pages. Drop in newly saved pages with the same prefix
+to check them too.
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, BACKEND_DIR)
+
+from services import sci_scraper, scraper_service  # noqa: E402
+
+PARSERS = {
+    "sci_home": (sci_scraper.parse_judgments, sci_scraper.parse_judgments_tree),
+    "indiankanoon_": (scraper_service.parse_sc_judgments, scraper_service.parse_sc_judgments_tree),
+}
+
+
+def time_parser(parse, content, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return result, timings
+
+
+def first_difference(fast, reference):
+    for i, (a, b) in enumerate(zip(fast, reference)):
+        if a != b:
+            return f"item {i}: {a!r} != {b!r}"
+    return f"{len(fast)} items != {len(reference)} items"
+
+
+def run(repeat):
+    rows = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html"))):
+        name = os.path.basename(path)
+        parsers = next((p for prefix, p in PARSERS.items() if name.startswith(prefix)), None)
+        if parsers is None:
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        fast, reference = parsers
+        fast_result, fast_ms = time_parser(fast, content, repeat)
+        ref_result, ref_ms = time_parser(reference, content, repeat)
+        rows.append({
+            "fixture": name,
+            "bytes": len(content),
+            "items": len(ref_result),
+            "fast_mean_ms": round(statistics.mean(fast_ms), 2),
+            "fast_min_ms": round(min(fast_ms), 2),
+            "tree_mean_ms": round(statistics.mean(ref_ms), 2),
+            "tree_min_ms": round(min(ref_ms), 2),
+            "speedup": round(statistics.mean(ref_ms) / statistics.mean(fast_ms), 1),
+            "match": fast_result == ref_result,
+            "difference": None if fast_result == ref_result else first_difference(fast_result, ref_result),
+        })
+    return rows
+
+
+def print_table(rows):
+    print(f"{'fixture':<32}{'KB':>7}{'items':>7}{'fast ms':>10}{'tree ms':>10}{'speedup':>9}  match")
+    for r in rows:
+        print(f"{r['fixture']:<32}{r['bytes'] / 1024:>7.0f}{r['items']:>7}{r['fast_mean_ms']:>10.2f}"
+              f"{r['tree_mean_ms']:>10.2f}{r['speedup']:>8.1f}x  {'yes' if r['match'] else 'NO'}")
+        if r["difference"]:
+            print(f"    {r['difference']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper parsers on recorded pages.")
+    parser.add_argument("--repeat", type=int, default=20, help="parses per fixture and parser")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    rows = run(args.repeat)
+    if not rows:
+        sys.exit(f"No fixtures found in {FIXTURES_DIR}")
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+    if not all(r["match"] for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Build small multi-page text PDFs in memory, so benchmarks need no fixture files."""
+
+SENTENCE = (
+    "The appellant contends that the High Court erred in appreciating the evidence on record "
+    "and that the conviction under the relevant section cannot be sustained. "
+)
+
+
+def make_pdf(pages: int = 5, lines_per_page: int = 40) -> bytes:
+    objects = []  # bodies of objects 1..n
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # placeholders, filled in once page ids are known
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page_no in range(1, pages + 1):
+        lines = [f"Page {page_no}. Paragraph {i + 1}. {SENTENCE[:80]}" for i in range(lines_per_page)]
+        text_ops = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(
+            f"({line.replace('(', '').replace(')', '')}) '" for line in lines
+        ) + " ET"
+        stream = text_ops.encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref_at)
+    return bytes(out)
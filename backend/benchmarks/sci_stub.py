@@ -0,0 +1,103 @@
+"""
+Local stand-in for sci.gov.in and the Indian Kanoon search page.
+
+Serves the recorded pages in benchmarks/fixtures (judgment links rewritten
+to point back at the stub) and answers every view-pdf link with a generated
+PDF after a configurable latency, optionally injecting 503s, so the live
+judgments refresher and the PDF prefetch pipeline can be exercised offline.
+GET /stats reports requests served and the peak number in flight.
+
+    python benchmarks/sci_stub.py --port 9200 --latency 0.5 --busy-rate 0.1
+
+Point the backend at it with
+    JUDGMENTS_SCI_URL=http://127.0.0.1:9200/
+    JUDGMENTS_INDIANKANOON_URL=http://127.0.0.1:9200/search/
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import sys
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+sys.path.insert(0, BENCH_DIR)
+
+from sample_pdf import make_pdf  # noqa: E402
+
+_VIEW_PDF_RE = re.compile(r'href="(?:https://www\.sci\.gov\.in)?/view-pdf/')
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.2       # seconds before each PDF response
+    pages: int = 10            # pages per generated PDF
+    busy_rate: float = 0.0     # share of PDF requests answered 503 + Retry-After
+    retry_after: int = 30
+
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def create_app(config: StubConfig) -> FastAPI:
+    app = FastAPI(title="SCI stub")
+    rng = random.Random(7)
+    pdf = make_pdf(pages=config.pages)
+    stats = {"homepage": 0, "search": 0, "pdf": 0, "busy": 0, "in_flight": 0, "max_in_flight": 0}
+
+    @app.get("/")
+    def homepage(request: Request):
+        stats["homepage"] += 1
+        base = str(request.base_url).rstrip("/")
+        return Response(_VIEW_PDF_RE.sub(f'href="{base}/view-pdf/', _fixture("sci_home.html")), media_type="text/html")
+
+    @app.get("/search/")
+    def search():
+        stats["search"] += 1
+        return Response(_fixture("indiankanoon_sc_recent.html"), media_type="text/html")
+
+    @app.get("/view-pdf/")
+    async def view_pdf():
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(config.latency)
+            if rng.random() < config.busy_rate:
+                stats["busy"] += 1
+                return Response(status_code=503, headers={"Retry-After": str(config.retry_after)})
+            stats["pdf"] += 1
+            return Response(pdf, media_type="application/pdf")
+        finally:
+            stats["in_flight"] -= 1
+
+    @app.get("/stats")
+    def get_stats():
+        return JSONResponse(stats)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--latency", type=float, default=StubConfig.latency)
+    parser.add_argument("--pages", type=int, default=StubConfig.pages)
+    parser.add_argument("--busy-rate", type=float, default=StubConfig.busy_rate)
+    parser.add_argument("--retry-after", type=int, default=StubConfig.retry_after)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = StubConfig(latency=args.latency, pages=args.pages, busy_rate=args.busy_rate, retry_after=args.retry_after)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Local stand-in for Together's /v1/chat/completions endpoint.
+
+Answers with generated text at a configurable latency and token rate,
+supports `"stream": true` (OpenAI-style SSE) and can inject 429/500 errors,
+so chat/upload/translation throughput can be measured fully offline.
+
+    python benchmarks/together_stub.py --port 9100 --latency 0.3 --tokens-per-second 80
+
+Point the backend at it with
+    TOGETHER_BASE_URL=http://127.0.0.1:9100/v1/chat/completions
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = (
+    "the court held that section accused appeal petitioner respondent evidence "
+    "judgment order bench bail statute provision hearing counsel relief trial"
+).split()
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.2             # seconds before the first token
+    tokens_per_second: float = 100.0  # generation speed after the first token; 0 = instant
+    reply_tokens: int = 120          # capped by the request's max_tokens
+    error_rate: float = 0.0          # share of requests answered with 500
+    rate_limit_rate: float = 0.0     # share of requests answered with 429
+    retry_after: int = 1             # Retry-After sent with injected 429s
+    seed: Optional[int] = None
+
+
+def create_app(config: Optional[StubConfig] = None) -> FastAPI:
+    config = config or StubConfig()
+    rng = random.Random(config.seed)
+    stats = {"requests": 0, "streamed": 0, "errors_injected": 0, "rate_limited": 0}
+    app = FastAPI(title="Together API stub")
+
+    def reply_words(max_tokens: int):
+        count = max(1, min(config.reply_tokens, max_tokens))
+        return [rng.choice(WORDS) for _ in range(count)]
+
+    @app.get("/_stub")
+    def get_config():
+        return {"config": asdict(config), "stats": stats}
+
+    @app.post("/_stub")
+    async def update_config(request: Request):
+        """Change latency/error injection between benchmark phases."""
+        for key, value in (await request.json()).items():
+            if hasattr(config, key):
+                current = getattr(config, key)
+                setattr(config, key, value if current is None else type(current)(value))
+        return asdict(config)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse({"error": "rate limited"}, status_code=429,
+                                headers={"Retry-After": str(config.retry_after)})
+        if roll < config.rate_limit_rate + config.error_rate:
+            stats["errors_injected"] += 1
+            return JSONResponse({"error": "injected failure"}, status_code=500)
+
+        words = reply_words(int(body.get("max_tokens", 1024)))
+        delay_per_token = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        if body.get("stream"):
+            stats["streamed"] += 1
+
+            async def events():
+                await asyncio.sleep(config.latency)
+                for i, word in enumerate(words):
+                    chunk = {"choices": [{"index": 0, "delta": {"content": (" " if i else "") + word}}]}
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    if delay_per_token:
+                        await asyncio.sleep(delay_per_token)
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        await asyncio.sleep(config.latency + delay_per_token * len(words))
+        return {
+            "id": f"stub-{stats['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": " ".join(words)}}],
+            "usage": {"completion_tokens": len(words)},
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=StubConfig.latency)
+    parser.add_argument("--tokens-per-second", type=float, default=StubConfig.tokens_per_second)
+    parser.add_argument("--reply-tokens", type=int, default=StubConfig.reply_tokens)
+    parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=StubConfig.rate_limit_rate)
+    parser.add_argument("--retry-after", type=int, default=StubConfig.retry_after)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = StubConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        reply_tokens=args.reply_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,128 @@ class Settings(BaseSettings):
     TOGETHER_API_KEY: Optional[str] = None
     GOOGLE_TRANSLATE_API_KEY: Optional[str] = None
     HUGGINGFACE_API_KEY: Optional[str] = None
-    
+
+    # Together AI client (shared keep-alive connection pool)
+    TOGETHER_BASE_URL: str = "https://api.together.xyz/v1/chat/completions"
+    TOGETHER_MODEL: str = "mistralai/Mixtral-8x7B-Instruct-v0.1"
+    AI_POOL_MAX_CONNECTIONS: int = 20
+    AI_POOL_MAX_KEEPALIVE: int = 10
+    AI_POOL_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept open
+    AI_CONNECT_TIMEOUT: float = 10.0
+    AI_READ_TIMEOUT: float = 120.0  # long completions can take a while to generate
+
+    # Outbound protection for the Together API
+    AI_CONCURRENCY_INITIAL: int = 8      # adaptive (AIMD) limit starts here...
+    AI_CONCURRENCY_MIN: int = 1
+    AI_CONCURRENCY_MAX: int = 32         # ...and never exceeds this
+    AI_QUEUE_TIMEOUT: float = 60.0       # max wait for a free slot before giving up
+    AI_MAX_RETRIES: int = 3
+    AI_RETRY_BASE_DELAY: float = 0.5
+    AI_RETRY_MAX_DELAY: float = 20.0     # also the longest Retry-After we are willing to wait
+    AI_BREAKER_FAILURE_THRESHOLD: int = 5
+    AI_BREAKER_RESET_TIMEOUT: float = 30.0
+
+    # Completion cache: in-process LRU in front of a persistent SQLite table
+    AI_CACHE_ENABLED: bool = True
+    AI_CACHE_MAX_ENTRIES: int = 512
+    AI_CACHE_TTL_SECONDS: float = 3600.0
+    AI_CACHE_DB_PATH: Optional[str] = "ai_cache.db"
+    AI_CACHE_DISK_TTL_SECONDS: float = 7 * 24 * 3600.0
+
+    # Chat context: estimated-token budget for the prompt (Mixtral has a 32k window,
+    # leave room for the reply and estimation error); older turns are summarised.
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 24000
+    CHAT_MESSAGE_TOKEN_CAP: int = 3000
+    CHAT_SUMMARY_MAX_TOKENS: int = 600
+    CHAT_SUMMARY_INPUT_TOKENS: int = 8000
+
+    # Document Q&A: documents uploaded into a chat are split into passages and
+    # the best BM25 matches for each question are added to the prompt
+    RAG_PASSAGE_CHARS: int = 1500
+    RAG_TOP_K: int = 5
+    RAG_CONTEXT_TOKEN_BUDGET: int = 2500
+
+    # Live judgments: sci.gov.in and Indian Kanoon are polled concurrently in the
+    # background and /judgments/live answers from the merged list in memory
+    # (stale data is served while a refresh runs or a source fails)
+    JUDGMENTS_REFRESH_ENABLED: bool = True
+    JUDGMENTS_REFRESH_SECONDS: int = 900
+    JUDGMENTS_RETRY_SECONDS: int = 60
+    JUDGMENTS_FETCH_TIMEOUT: float = 30.0
+    JUDGMENTS_SOURCES: str = "sci,indiankanoon"  # comma-separated, in merge priority order
+    JUDGMENTS_INDIANKANOON_TIMEOUT: float = 15.0
+    # Only overridden to point at benchmarks/sci_stub.py; empty = the real sites
+    JUDGMENTS_SCI_URL: str = ""
+    JUDGMENTS_INDIANKANOON_URL: str = ""
+    JUDGMENTS_COLD_START_WAIT: float = 10.0
+
+    # PDFs of newly archived judgments are downloaded in the background and
+    # their text stored for reading and search; per-host limits keep it polite
+    JUDGMENT_PDF_PREFETCH_ENABLED: bool = True
+    JUDGMENT_PDF_CONCURRENCY: int = 4
+    JUDGMENT_PDF_PER_HOST: int = 2
+    JUDGMENT_PDF_HOST_DELAY: float = 1.0
+    JUDGMENT_PDF_TIMEOUT: float = 60.0
+    JUDGMENT_PDF_MAX_BYTES: int = 50 * 1024 * 1024
+    JUDGMENT_PDF_BATCH: int = 20
+    JUDGMENT_PDF_MAX_ATTEMPTS: int = 3
+    JUDGMENT_PDF_RETRY_SECONDS: int = 600
+    JUDGMENT_PDF_LEASE_SECONDS: int = 900
+    JUDGMENT_PDF_POLL_SECONDS: int = 60
+
+    # Each judgment whose PDF text is stored is summarised once in the
+    # background, paced so it stays well under the Together rate limit
+    JUDGMENT_SUMMARIES_ENABLED: bool = True
+    JUDGMENT_SUMMARY_CONCURRENCY: int = 2
+    JUDGMENT_SUMMARY_PER_MINUTE: int = 20
+    JUDGMENT_SUMMARY_BATCH: int = 10
+    JUDGMENT_SUMMARY_INPUT_CHARS: int = 24000  # head and tail of longer judgments
+    JUDGMENT_SUMMARY_MAX_TOKENS: int = 400
+    JUDGMENT_SUMMARY_MAX_ATTEMPTS: int = 3
+    JUDGMENT_SUMMARY_RETRY_SECONDS: int = 300
+    JUDGMENT_SUMMARY_LEASE_SECONDS: int = 600
+    JUDGMENT_SUMMARY_POLL_SECONDS: int = 60
+
+    # Landmark verdicts catalogue: loaded in batches by load_verdicts.py and
+    # served with ETags so clients revalidate instead of re-downloading
+    VERDICTS_LOAD_BATCH: int = 1000
+    VERDICTS_CACHE_SECONDS: int = 300
+
+    # Schedule reminders: reminders due within the lookahead window are loaded
+    # into an in-memory heap and sent when due; each is claimed in the
+    # database first, so only one app worker sends it
+    REMINDERS_ENABLED: bool = True
+    REMINDER_LOOKAHEAD_SECONDS: int = 600
+    REMINDER_MAX_LATENESS_HOURS: int = 24  # older unsent reminders (e.g. while the app was down) are dropped
+    REMINDER_BATCH: int = 100
+    REMINDER_HEAP_MAX: int = 10000
+    REMINDER_LEASE_SECONDS: int = 300      # a claim not marked sent by then is retried
+
+    # Uploads larger than this are rejected with 413 while still streaming in
+    MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024
+
+    # PDF text extraction: documents with at least this many pages are parsed
+    # across a process pool, smaller ones in-process
+    PDF_PARALLEL_PAGE_THRESHOLD: int = 40
+    PDF_EXTRACT_WORKERS: int = 0  # 0 = one per CPU
+    PDF_MIN_PAGES_PER_TASK: int = 10
+
+    # Document translation: chunks split on paragraph/sentence boundaries and
+    # translated concurrently
+    TRANSLATION_CHUNK_CHARS: int = 6000
+    TRANSLATION_CONCURRENCY: int = 4
+    TRANSLATION_CHUNK_ATTEMPTS: int = 3
+    TRANSLATION_RETRY_DELAY: float = 2.0
+
+    # Translation job queue: worker threads started inside the API process
+    # (0 = run `python worker.py` separately); a running job whose heartbeat
+    # is older than the lease is taken over by another worker
+    TRANSLATION_WORKERS_IN_APP: int = 1
+    TRANSLATION_JOB_LEASE_SECONDS: int = 120
+    TRANSLATION_JOB_MAX_ATTEMPTS: int = 3
+    TRANSLATION_JOB_RETRY_DELAY: float = 30.0
+    TRANSLATION_WORKER_POLL_SECONDS: float = 2.0
+
     @classmethod
     def clean_db_url(cls, v):
         if v and isinstance(v, str):
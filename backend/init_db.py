@@ -5,11 +5,13 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import engine, Base
-from models import user, case, schedule, history, chat
+from services.search_index import ensure_search_index
+from models import user, case, schedule, history, chat, blob, translation, passage, feed, judgment, verdict
 
 def init_db():
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
     print("Tables created successfully.")
 
 if __name__ == "__main__":
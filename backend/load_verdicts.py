@@ -0,0 +1,40 @@
+import sys
+import os
+import argparse
+import time
+
+# Add the parent directory to sys.path to allow importing 'backend' module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from config import settings
+from database import engine, Base, SessionLocal
+from models import verdict
+from services import verdicts_store
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import landmark verdicts from JSONL or CSV files. Records are upserted by ref "
+                    "(else citation, else title and date), so re-running a file only applies changes."
+    )
+    parser.add_argument("paths", nargs="+", help=".jsonl or .csv files")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.VERDICTS_LOAD_BATCH,
+                        help="records per transaction")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        for path in args.paths:
+            started = time.perf_counter()
+            totals = verdicts_store.load_file(db, path, args.format, args.batch_size)
+            elapsed = time.perf_counter() - started
+            print(f"{path}: {totals['inserted']} inserted, {totals['updated']} updated, "
+                  f"{totals['unchanged']} unchanged, {totals['invalid']} invalid ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
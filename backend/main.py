@@ -4,7 +4,7 @@ load_dotenv()  # Load .env file from backend directory
 from fastapi import FastAPI
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from routers import auth, verdicts, chat, cases, schedule, judgments
+from routers import auth, verdicts, chat, cases, schedule, judgments, admin, statutes
 from config import settings
 
 app = FastAPI(
@@ -16,14 +16,29 @@ app = FastAPI(
 from database import engine, Base, SessionLocal
 # Ensure all models are imported so tables are created
 from models import user as user_model, schedule as schedule_model, case as case_model
-from models import chat as chat_model
+from models import chat as chat_model, blob as blob_model, translation as translation_model
+from models import passage as passage_model, feed as feed_model, judgment as judgment_model
+from models import verdict as verdict_model
 Base.metadata.create_all(bind=engine)
 
+# Full-text search over cases and chat messages (FTS5 on SQLite, tsvector on Postgres)
+from services.search_index import ensure_search_index
+ensure_search_index(engine)
+
 # Seed admin account on startup
 from routers.auth import seed_admin
 with SessionLocal() as db:
     seed_admin(db)
 
+# Bundled landmark verdicts, only while the catalogue is empty (load_verdicts.py imports the full set)
+from services.verdicts_store import seed_verdicts
+with SessionLocal() as db:
+    seed_verdicts(db)
+
+# Oversized uploads are refused before the body is read (added first so CORS wraps the 413)
+from services.upload_limit import UploadSizeLimitMiddleware
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -40,6 +55,74 @@ app.include_router(chat.router, prefix="/chat", tags=["AI Chatbot"])
 app.include_router(cases.router, prefix="/cases", tags=["Case Management"])
 app.include_router(schedule.router, prefix="/schedule", tags=["Court Schedule"])
 app.include_router(judgments.router, prefix="/judgments", tags=["Live Judgments"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
+app.include_router(statutes.router, prefix="/statutes", tags=["Statutes"])
+
+@app.on_event("startup")
+def start_judgments_refresher():
+    from services.judgments_cache import judgments_cache
+    if settings.JUDGMENTS_REFRESH_ENABLED:
+        judgments_cache.start()
+    else:
+        judgments_cache.load_snapshot()
+
+@app.on_event("shutdown")
+def stop_judgments_refresher():
+    from services.judgments_cache import judgments_cache
+    judgments_cache.stop()
+
+@app.on_event("startup")
+def start_judgment_pdf_prefetch():
+    from services.judgment_pdfs import pdf_pipeline
+    if settings.JUDGMENT_PDF_PREFETCH_ENABLED:
+        pdf_pipeline.start()
+
+@app.on_event("shutdown")
+def stop_judgment_pdf_prefetch():
+    from services.judgment_pdfs import pdf_pipeline
+    pdf_pipeline.stop()
+
+@app.on_event("startup")
+def start_judgment_summaries():
+    from services.judgment_summaries import summary_worker
+    if settings.JUDGMENT_SUMMARIES_ENABLED and settings.TOGETHER_API_KEY:
+        summary_worker.start()
+
+@app.on_event("shutdown")
+def stop_judgment_summaries():
+    from services.judgment_summaries import summary_worker
+    summary_worker.stop()
+
+@app.on_event("startup")
+def start_reminder_dispatcher():
+    from services.reminder_dispatcher import reminder_dispatcher
+    if settings.REMINDERS_ENABLED:
+        reminder_dispatcher.start()
+
+@app.on_event("shutdown")
+def stop_reminder_dispatcher():
+    from services.reminder_dispatcher import reminder_dispatcher
+    reminder_dispatcher.stop()
+
+@app.on_event("startup")
+def start_translation_workers():
+    from services.translation_worker import worker_pool
+    worker_pool.start(settings.TRANSLATION_WORKERS_IN_APP)
+
+@app.on_event("shutdown")
+def stop_translation_workers():
+    from services.translation_worker import worker_pool
+    worker_pool.stop()
+
+@app.on_event("shutdown")
+async def close_ai_clients():
+    from services.ai_service import ai_service
+    await ai_service.aclose()
+
+@app.on_event("shutdown")
+def shutdown_pdf_workers():
+    from services.pdf_extraction import shutdown_pool
+    shutdown_pool()
 
 @app.get("/")
 async def root():
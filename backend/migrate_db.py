@@ -1,5 +1,6 @@
 """
-One-time migration: adds new columns to the users table for the auth overhaul.
+Adds columns introduced after the initial schema to existing SQLite databases
+(new tables are created by Base.metadata.create_all on startup).
 Safe to run multiple times (checks if columns exist before adding).
 """
 import sqlite3
@@ -13,23 +14,57 @@ print(f"Migrating: {DB_PATH}")
 conn = sqlite3.connect(DB_PATH)
 cursor = conn.cursor()
 
-# Get existing columns
-cursor.execute("PRAGMA table_info(users)")
-existing_cols = {row[1] for row in cursor.fetchall()}
-print(f"Existing columns: {existing_cols}")
+MIGRATIONS = {
+    # Auth overhaul
+    "users": [
+        ("is_admin",            "ALTER TABLE users ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT 0"),
+        ("reset_token",         "ALTER TABLE users ADD COLUMN reset_token VARCHAR(255)"),
+        ("reset_token_expiry",  "ALTER TABLE users ADD COLUMN reset_token_expiry DATETIME"),
+    ],
+    # Rolling chat summaries
+    "chat_sessions": [
+        ("summary",             "ALTER TABLE chat_sessions ADD COLUMN summary TEXT"),
+        ("summary_upto_id",     "ALTER TABLE chat_sessions ADD COLUMN summary_upto_id INTEGER"),
+    ],
+    # Content-addressed uploads
+    "cases": [
+        ("blob_sha256",         "ALTER TABLE cases ADD COLUMN blob_sha256 VARCHAR(64)"),
+        ("export_sha256",       "ALTER TABLE cases ADD COLUMN export_sha256 VARCHAR(64)"),
+    ],
+    # Reminder dispatch
+    "schedules": [
+        ("reminder_claimed_at", "ALTER TABLE schedules ADD COLUMN reminder_claimed_at DATETIME"),
+        ("reminder_sent_at",    "ALTER TABLE schedules ADD COLUMN reminder_sent_at DATETIME"),
+    ],
+}
 
-migrations = [
-    ("is_admin",            "ALTER TABLE users ADD COLUMN is_admin BOOLEAN NOT NULL DEFAULT 0"),
-    ("reset_token",         "ALTER TABLE users ADD COLUMN reset_token VARCHAR(255)"),
-    ("reset_token_expiry",  "ALTER TABLE users ADD COLUMN reset_token_expiry DATETIME"),
+# Indexes declared on tables that already existed (create_all only adds them with new tables)
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_schedules_reminder_pending ON schedules (reminder_sent_at, reminder_date)",
 ]
 
-for col, sql in migrations:
-    if col not in existing_cols:
+for table, migrations in MIGRATIONS.items():
+    # Get existing columns
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing_cols = {row[1] for row in cursor.fetchall()}
+    if not existing_cols:
+        print(f"Table {table} does not exist yet, skipping (created on startup)")
+        continue
+    print(f"Existing columns in {table}: {existing_cols}")
+
+    for col, sql in migrations:
+        if col not in existing_cols:
+            cursor.execute(sql)
+            print(f"  ✅ Added column: {table}.{col}")
+        else:
+            print(f"  ⏭  Column already exists: {table}.{col}")
+
+for sql in INDEXES:
+    try:
         cursor.execute(sql)
-        print(f"  ✅ Added column: {col}")
-    else:
-        print(f"  ⏭  Column already exists: {col}")
+        print(f"  ✅ {sql}")
+    except sqlite3.OperationalError as e:
+        print(f"  ⏭  Skipped index ({e})")
 
 conn.commit()
 conn.close()
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+class FileBlob(Base):
+    """An uploaded file stored once by content hash and shared by every CaseDocument with that content."""
+    __tablename__ = "file_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String(500))
+    size = Column(Integer)
+    ref_count = Column(Integer, default=0)
+
+    # Filled on first use; None means not extracted yet
+    extracted_text = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class BlobTranslation(Base):
+    """Translation of a blob's text into one language, reused by later uploads of the same file."""
+    __tablename__ = "blob_translations"
+    __table_args__ = (UniqueConstraint("blob_sha256", "language", name="uq_blob_translation_language"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    blob_sha256 = Column(String(64), ForeignKey("file_blobs.sha256"), index=True)
+    language = Column(String(50))
+    content = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
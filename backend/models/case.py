@@ -10,11 +10,15 @@ class CaseDocument(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     filename = Column(String(255))
     file_path = Column(String(500))  # Path to stored PDF
+    # Content hash of the shared blob (see models/blob.py); NULL for pre-dedup uploads
+    blob_sha256 = Column(String(64), ForeignKey("file_blobs.sha256"), nullable=True, index=True)
     original_language = Column(String(50), default="English")
     
     # Store translated content or path to translated file
     translated_content = Column(Text, nullable=True)
     target_language = Column(String(50), nullable=True)
+    # Hash of translated_content as last written for download (services/case_export.py)
+    export_sha256 = Column(String(64), nullable=True)
     
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     
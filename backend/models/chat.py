@@ -12,6 +12,10 @@ class ChatSession(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
 
+    # Rolling summary of the turns up to and including summary_upto_id
+    summary = Column(Text, nullable=True)
+    summary_upto_id = Column(Integer, nullable=True)
+
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
 
 class ChatMessage(Base):
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, DateTime, Text
+from database import Base
+
+class FeedSnapshot(Base):
+    """Last parsed result of an upstream feed plus its HTTP validators, so restarts serve immediately."""
+    __tablename__ = "feed_snapshots"
+
+    source = Column(String(50), primary_key=True)  # e.g. "sci_live"
+    payload = Column(Text)                         # JSON list of parsed entries
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    fetched_at = Column(DateTime, nullable=True)   # last 200 from upstream
+    checked_at = Column(DateTime, nullable=True)   # last successful request (200 or 304)
+    last_error = Column(Text, nullable=True)
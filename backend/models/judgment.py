@@ -0,0 +1,59 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from database import Base
+
+class Judgment(Base):
+    """Archive of Supreme Court judgments seen on sci.gov.in (services/judgments_store.py)."""
+    __tablename__ = "judgments"
+    __table_args__ = (
+        UniqueConstraint("diary_no", "case_number", name="uq_judgment_diary_case"),
+        # Keyset pagination walks (judgment_date, id) newest first, optionally within a category
+        Index("ix_judgments_date_id", "judgment_date", "id"),
+        Index("ix_judgments_category_date_id", "category", "judgment_date", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    diary_no = Column(String(50), nullable=False)
+    case_number = Column(String(255), nullable=False, default="")  # "" when the link text has none
+    title = Column(String(500))
+    text = Column(Text)
+    link = Column(String(1000))
+    judgment_date = Column(Date, nullable=False)
+    category = Column(String(50))
+    first_seen_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class JudgmentText(Base):
+    """Text of a judgment's PDF, fetched in the background (services/judgment_pdfs.py); one row per judgment."""
+    __tablename__ = "judgment_texts"
+    __table_args__ = (Index("ix_judgment_texts_status_available", "status", "available_at"),)
+
+    judgment_id = Column(Integer, ForeignKey("judgments.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(20), nullable=False)  # fetching, queued (retry), done, failed
+    attempts = Column(Integer, default=0)
+    claimed_at = Column(DateTime, nullable=True)
+    available_at = Column(DateTime, nullable=True)  # earliest retry
+    error = Column(Text, nullable=True)
+
+    pdf_url = Column(String(1000), nullable=True)  # where the PDF was finally found
+    pdf_sha256 = Column(String(64), nullable=True)
+    pdf_size = Column(Integer, nullable=True)
+    page_count = Column(Integer, nullable=True)
+    text = Column(Text, nullable=True)             # pages joined with "\n"
+    page_offsets = Column(Text, nullable=True)     # JSON list: offset in text where each page starts
+    fetched_at = Column(DateTime(timezone=True), nullable=True)
+
+class JudgmentSummary(Base):
+    """AI summary of a judgment, generated once in the background (services/judgment_summaries.py)."""
+    __tablename__ = "judgment_summaries"
+
+    judgment_id = Column(Integer, ForeignKey("judgments.id", ondelete="CASCADE"), primary_key=True)
+    # What produced `summary`; a row whose version or model differs from the current one is regenerated
+    prompt_version = Column(String(20), nullable=False)
+    model = Column(String(200), nullable=False)
+    status = Column(String(20), nullable=False)  # running, queued (retry), done, failed
+    attempts = Column(Integer, default=0)
+    claimed_at = Column(DateTime, nullable=True)
+    available_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+    summary = Column(Text, nullable=True)  # kept while a newer version is generated
+    generated_at = Column(DateTime(timezone=True), nullable=True)
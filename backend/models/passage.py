@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+class DocumentPassage(Base):
+    """A chunk of a document uploaded into a chat session, retrieved per question (services/passage_index.py)."""
+    __tablename__ = "document_passages"
+    __table_args__ = (UniqueConstraint("session_id", "blob_sha256", "passage_index", name="uq_document_passage"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("chat_sessions.id"), index=True)
+    document_name = Column(String(255))
+    # Identifies the uploaded content, not a reference to it: passages keep their own text and
+    # outlive the blob, which is freed with the last case that uses it (services/blob_store.py)
+    blob_sha256 = Column(String(64), nullable=True)
+    passage_index = Column(Integer)
+    content = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Index
 from sqlalchemy.sql import func
 from database import Base
 
 class Schedule(Base):
     __tablename__ = "schedules"
+    __table_args__ = (
+        # The reminder dispatcher range-scans unsent reminders by due time (services/reminder_dispatcher.py)
+        Index("ix_schedules_reminder_pending", "reminder_sent_at", "reminder_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -15,6 +19,8 @@ class Schedule(Base):
     status = Column(String(50), default="Scheduled") # Scheduled, In Progress, Closed
     progress = Column(Text, nullable=True) # Notes on progress
     notification_enabled = Column(Boolean, default=True)
+    reminder_claimed_at = Column(DateTime, nullable=True)  # a dispatcher is sending it; expires after REMINDER_LEASE_SECONDS
+    reminder_sent_at = Column(DateTime, nullable=True)     # delivered; cleared when reminder_date changes
     
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
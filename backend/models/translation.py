@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from database import Base
+
+class TranslationJob(Base):
+    """Durable translation work item, claimed by a worker (services/translation_worker.py)."""
+    __tablename__ = "translation_jobs"
+    __table_args__ = (Index("ix_translation_jobs_status_available", "status", "available_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    case_id = Column(Integer, ForeignKey("cases.id"), index=True)
+    target_language = Column(String(50))
+
+    status = Column(String(20), default="queued")  # queued, running, done, failed
+    attempts = Column(Integer, default=0)
+    chunks_total = Column(Integer, nullable=True)
+    chunks_done = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    # Lease: a running job whose heartbeat is older than the lease is reclaimed
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    available_at = Column(DateTime, server_default=func.now())  # retries are delayed by pushing this forward
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class TranslationChunk(Base):
+    """One translated chunk of a case, stored as soon as it completes so a job can resume."""
+    __tablename__ = "translation_chunks"
+    __table_args__ = (UniqueConstraint("case_id", "chunk_index", name="uq_translation_chunk"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    case_id = Column(Integer, ForeignKey("cases.id"), index=True)
+    chunk_index = Column(Integer)
+    content = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, Index
+from database import Base
+
+class Verdict(Base):
+    """Catalogue of landmark verdicts, bulk-loaded from JSONL/CSV (services/verdicts_store.py)."""
+    __tablename__ = "verdicts"
+    __table_args__ = (
+        # Keyset pagination walks (verdict_date, id) newest first, optionally within a topic
+        Index("ix_verdicts_date_id", "verdict_date", "id"),
+        Index("ix_verdicts_topic_date_id", "topic", "verdict_date", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ref = Column(String(64), nullable=False, unique=True)  # loader key: the record's "ref", else derived from citation/title
+    title = Column(String(500), nullable=False)
+    citation = Column(String(255), nullable=True)
+    verdict_date = Column(Date, nullable=False)
+    topic = Column(String(100), nullable=True)
+    statutes = Column(Text, nullable=True)  # JSON list, as given in the source file
+    summary = Column(Text, nullable=True)
+    details = Column(Text, nullable=True)
+    # Set by the loader on insert and on every change; max() of it versions the catalogue for ETags
+    updated_at = Column(DateTime, nullable=False, index=True)
+
+class VerdictStatute(Base):
+    """One row per statute a verdict relies on, keyed by the normalised statute so filtering is an index walk."""
+    __tablename__ = "verdict_statutes"
+    __table_args__ = (Index("ix_verdict_statutes_statute_date_id", "statute", "verdict_date", "verdict_id"),)
+
+    verdict_id = Column(Integer, ForeignKey("verdicts.id", ondelete="CASCADE"), primary_key=True)
+    statute = Column(String(100), primary_key=True)  # e.g. "IPC 302", "CONSTITUTION 21"
+    verdict_date = Column(Date, nullable=False)       # copy of verdicts.verdict_date for the ordered walk
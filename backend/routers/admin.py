@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+
+from models import user as user_model
+from routers.auth import require_admin
+from services.ai_service import ai_service
+from services.judgments_cache import judgments_cache
+from services.judgment_pdfs import pdf_pipeline
+from services.judgment_summaries import summary_worker
+from services.reminder_dispatcher import reminder_dispatcher
+
+router = APIRouter()
+
+
+@router.get("/ai")
+def get_ai_status(_admin: user_model.User = Depends(require_admin)):
+    """Outbound Together API health: concurrency limit, queue depth, breaker state, cache and coalescing counters."""
+    return ai_service.stats()
+
+
+@router.get("/judgments")
+def get_judgments_cache_status(_admin: user_model.User = Depends(require_admin)):
+    """Live judgments cache: entries served, age, refresh / 304 / failure counts and the last upstream error."""
+    return judgments_cache.stats()
+
+
+@router.get("/judgment-pdfs")
+def get_judgment_pdf_status(_admin: user_model.User = Depends(require_admin)):
+    """Judgment PDF prefetch: judgments waiting, counts per status, bytes fetched and the last error."""
+    return pdf_pipeline.stats()
+
+
+@router.get("/judgment-summaries")
+def get_judgment_summary_status(_admin: user_model.User = Depends(require_admin)):
+    """Background judgment summaries: current prompt version/model, counts per status and outdated rows."""
+    return summary_worker.stats()
+
+
+@router.get("/reminders")
+def get_reminder_status(_admin: user_model.User = Depends(require_admin)):
+    """Schedule reminders: unsent reminders pending, the in-memory heap, and sent / failed / lost-claim counts."""
+    return reminder_dispatcher.stats()
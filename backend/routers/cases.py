@@ -1,124 +1,99 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import shutil
 import os
-import io
 import mimetypes
-import pdfplumber
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 
 from database import get_db
 from models import case as case_model
 from models import user as user_model
 from routers.auth import get_current_user
-from services.ai_service import ai_service
+from services import blob_store
+from services import translation_worker
+from services import case_export
+from services import search_index
 
 router = APIRouter()
 
 UPLOAD_DIR = "uploaded_files"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Downloads smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+
 # ── Helpers ─────────────────────────────────────────────────────────────────
 
-def extract_pdf_text(file_path: str) -> str:
-    """Extract plain text from a PDF using pdfplumber."""
-    text_parts = []
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-    except Exception as e:
-        print(f"PDF extraction error: {e}")
-    return "\n".join(text_parts).strip()
-
-
-def translate_text_via_ai(text: str, target_language: str) -> str:
-    """Use Together AI to translate the extracted text."""
-    # Chunk large texts to stay within token limits
-    MAX_CHUNK = 6000
-    chunks = [text[i:i+MAX_CHUNK] for i in range(0, len(text), MAX_CHUNK)]
-    translated_chunks = []
-
-    for chunk in chunks:
-        prompt = (
-            f"Translate the following legal document text into {target_language}. "
-            f"Preserve all legal terminology, paragraph structure, and formatting. "
-            f"Return ONLY the translated text, nothing else.\n\n"
-            f"--- TEXT TO TRANSLATE ---\n{chunk}"
-        )
-        messages = [{"role": "user", "content": prompt}]
-        result = ai_service.get_chat_response(messages, max_tokens=3000)
-        translated_chunks.append(result)
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since for a GET."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
 
-    return "\n\n".join(translated_chunks)
 
+def _create_case(db: Session, user_id: int, incoming: blob_store.IncomingFile, language: str):
+    """Store the upload, create its case and queue its translation. Blocking; run in the threadpool."""
+    try:
+        blob = blob_store.add_reference(db, incoming)
+    finally:
+        # No-op once the file has been moved into the blob store
+        incoming.discard()
 
-def do_translation_background(case_id: int, file_path: str, target_language: str):
-    """Background task: extract → translate → save to DB."""
-    from database import SessionLocal
-    db = SessionLocal()
     try:
-        case = db.query(case_model.CaseDocument).filter(case_model.CaseDocument.id == case_id).first()
-        if not case:
-            return
-
-        # Extract raw text
-        raw_text = extract_pdf_text(file_path)
-        if not raw_text:
-            translated = "Could not extract text from this PDF."
-        elif target_language.lower() in ("english", "en"):
-            # Already English — just store the extracted text
-            translated = raw_text
-        else:
-            translated = translate_text_via_ai(raw_text, target_language)
-
-        case.translated_content = translated
+        cached_translation = blob_store.get_translation(db, blob.sha256, language)
+        new_case = case_model.CaseDocument(
+            user_id=user_id,
+            filename=incoming.filename,
+            file_path=blob.file_path,
+            blob_sha256=blob.sha256,
+            target_language=language,
+            translated_content=cached_translation or translation_worker.TRANSLATING_PLACEHOLDER
+        )
+        db.add(new_case)
         db.commit()
-    except Exception as e:
-        print(f"Translation background task error: {e}")
-        try:
-            case = db.query(case_model.CaseDocument).filter(case_model.CaseDocument.id == case_id).first()
-            if case:
-                case.translated_content = f"Translation failed: {str(e)}"
-                db.commit()
-        except Exception:
-            pass
-    finally:
-        db.close()
+    except SQLAlchemyError:
+        # No case owns the reference taken above; give it back so the blob can be freed
+        db.rollback()
+        blob_store.release_reference(db, blob.sha256)
+        raise
+    db.refresh(new_case)
+
+    if cached_translation is None:
+        # Queue the translation; a worker (in this process or `python worker.py`) picks it up
+        translation_worker.enqueue_translation(db, new_case.id, language)
+    return new_case, cached_translation is not None
 
 
 # ── Routes ───────────────────────────────────────────────────────────────────
 
 @router.post("/upload")
 async def upload_case(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     language: str = Form("English"),
     current_user: user_model.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{datetime.now().timestamp()}_{file.filename}")
-
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    new_case = case_model.CaseDocument(
-        user_id=current_user.id,
-        filename=file.filename,
-        file_path=file_path,
-        target_language=language,
-        translated_content="Translating… please check back in a moment."
-    )
-    db.add(new_case)
-    db.commit()
-    db.refresh(new_case)
+    # Hash while streaming in; identical files share one stored blob
+    try:
+        incoming = await blob_store.receive_upload(file)
+    except blob_store.UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    new_case, cached = await run_in_threadpool(_create_case, db, current_user.id, incoming, language)
 
-    # Kick off translation in background so the upload response is instant
-    background_tasks.add_task(do_translation_background, new_case.id, file_path, language)
+    if cached:
+        return {"message": "File uploaded successfully. Translation is ready.", "case_id": new_case.id}
 
     return {"message": "File uploaded successfully. Translation is in progress.", "case_id": new_case.id}
 
@@ -139,35 +114,86 @@ def list_cases(
     ]
 
 
+@router.get("/search")
+def search_cases(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: user_model.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Full-text search over the user's documents, best matches first, with highlighted snippets."""
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if not search_index.is_available(db):
+        raise HTTPException(status_code=503, detail="Search is not available on this database")
+    return search_index.search_cases(db, current_user.id, q, limit, offset)
+
+
 @router.get("/{case_id}")
 def get_case(
     case_id: int,
+    since_chunk: Optional[int] = Query(None, ge=0),
     current_user: user_model.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Return the case metadata + translated_content for the viewer page."""
+    """
+    Return the case metadata + translated_content for the viewer page.
+    With since_chunk, return the translated chunks from that index on instead
+    of the full text, so a polling viewer only fetches what is new.
+    """
     case = db.query(case_model.CaseDocument).filter(
         case_model.CaseDocument.id == case_id,
         case_model.CaseDocument.user_id == current_user.id
     ).first()
     if not case:
         raise HTTPException(status_code=404, detail="Document not found")
-    return {
+    job = translation_worker.latest_job(db, case.id)
+    result = {
         "id": case.id,
         "filename": case.filename,
         "uploaded_at": str(case.uploaded_at),
         "target_language": case.target_language,
-        "translated_content": case.translated_content or "",
+        **translation_worker.job_progress(job),
     }
+    if since_chunk is None:
+        result["translated_content"] = case.translated_content or ""
+    else:
+        result["chunks"], result["next_chunk"] = translation_worker.chunks_since(db, case, job, since_chunk)
+    return result
+
+
+@router.get("/{case_id}/status")
+def get_case_status(
+    case_id: int,
+    current_user: user_model.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Translation job state and chunk progress, for polling while a case is translating."""
+    case = db.query(case_model.CaseDocument).filter(
+        case_model.CaseDocument.id == case_id,
+        case_model.CaseDocument.user_id == current_user.id
+    ).first()
+    if not case:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    job = translation_worker.latest_job(db, case.id)
+    return {"case_id": case.id, **translation_worker.job_progress(job)}
 
 
 @router.get("/{case_id}/download")
 def download_case(
     case_id: int,
+    request: Request,
     current_user: user_model.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Download the translated content as a .txt file."""
+    """
+    Download the translated content as a .txt file. The file is written once
+    per distinct translation and served with a content-hash ETag, so repeat
+    downloads get 304 Not Modified, interrupted ones can resume with Range,
+    and clients that accept gzip get a pre-compressed copy.
+    """
     case = db.query(case_model.CaseDocument).filter(
         case_model.CaseDocument.id == case_id,
         case_model.CaseDocument.user_id == current_user.id
@@ -175,19 +201,46 @@ def download_case(
     if not case:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    content = case.translated_content or ""
     txt_filename = os.path.splitext(case.filename)[0] + f"_{case.target_language}.txt"
-    encoded = content.encode("utf-8")
+    for attempt in range(2):
+        path, sha256 = case_export.export_path(db, case)
+        try:
+            # Ranges always address the plain file; gzip is only for whole downloads
+            use_gzip = (
+                "gzip" in request.headers.get("accept-encoding", "")
+                and "range" not in request.headers
+                and os.path.getsize(path) >= GZIP_MIN_BYTES
+            )
+            if use_gzip:
+                gzipped = case_export.gzip_path(sha256)
+                if gzipped is None:
+                    raise FileNotFoundError(path)
+                path = gzipped
+            stat_result = os.stat(path)
+            break
+        except FileNotFoundError:
+            # The export was released by another case meanwhile; export_path writes it again
+            if attempt == 1:
+                raise
+    etag = f'"{sha256}-gzip"' if use_gzip else f'"{sha256}"'
 
     headers = {
-        "Content-Disposition": f'attachment; filename="{txt_filename}"',
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
         "Access-Control-Allow-Origin": "*",
-        "Access-Control-Expose-Headers": "Content-Disposition",
+        "Access-Control-Expose-Headers": "Content-Disposition, ETag, Content-Range",
     }
-    return StreamingResponse(
-        io.BytesIO(encoded),
+    if _not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return FileResponse(
+        path,
         media_type="text/plain; charset=utf-8",
-        headers=headers
+        filename=txt_filename,
+        headers=headers,
+        stat_result=stat_result,
     )
 
 
@@ -203,8 +256,14 @@ def delete_case(
     ).first()
     if not case:
         raise HTTPException(status_code=404, detail="Document not found")
-    if os.path.exists(case.file_path):
-        os.remove(case.file_path)
+    blob_sha256 = case.blob_sha256
+    export_sha256 = case.export_sha256
+    translation_worker.delete_case_translation_state(db, case.id)
     db.delete(case)
     db.commit()
+    case_export.release_export(db, export_sha256)
+    if blob_sha256:
+        blob_store.release_reference(db, blob_sha256)
+    elif case.file_path and os.path.exists(case.file_path):
+        os.remove(case.file_path)
     return {"message": "Document deleted successfully"}
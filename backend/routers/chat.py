@@ -1,20 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Body, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel
-from services.ai_service import ai_service
-from database import get_db
+from services.ai_service import ai_service, AIServiceError, FALLBACK_RESPONSE
+from services.context_builder import build_context, refresh_summary
+from services import blob_store
+from services import search_index
+from services import passage_index
+from services.statute_map import statute_map
+from database import get_db, SessionLocal
 from models.chat import ChatSession, ChatMessage
 from models.user import User
 from routers.auth import get_current_user
 from models import case as case_model
-import shutil
 import os
-
-import pdfplumber
-import io
+import json
+import anyio
+from contextlib import aclosing
 
 UPLOAD_DIR = "uploaded_files"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -65,6 +73,21 @@ def create_session(request: NewSessionRequest, current_user: User = Depends(get_
     db.refresh(new_session)
     return new_session
 
+@router.get("/search")
+def search_messages(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Full-text search across the user's past conversations."""
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if not search_index.is_available(db):
+        raise HTTPException(status_code=503, detail="Search is not available on this database")
+    return search_index.search_messages(db, current_user.id, q, limit, offset)
+
 @router.get("/sessions/{session_id}", response_model=List[ChatHistorySchema])
 def get_session_history(session_id: int, db: Session = Depends(get_db)):
     session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
@@ -82,19 +105,13 @@ def delete_session(session_id: int, db: Session = Depends(get_db)):
     
     # helper: messages should cascade delete if set up in models, but to be sure:
     db.query(ChatMessage).filter(ChatMessage.session_id == session_id).delete()
+    passage_index.delete_session_passages(db, session_id)
     db.delete(session)
     db.commit()
     return {"status": "success", "message": "Session deleted"}
 
-@router.post("/message", response_model=MessageResponse)
-def send_message(
-    request: MessageRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    if not current_user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-
+def _prepare_chat_turn(db: Session, current_user: User, request: MessageRequest):
+    """Create the session if needed, store the user message and build the AI context."""
     session_id = request.session_id
 
     # 1. Create session if not exists — always link to the current user
@@ -117,23 +134,108 @@ def send_message(
     db.add(user_msg)
     db.commit()
 
-    # 3. Build Context for AI — last 20 messages in chronological order
-    history = db.query(ChatMessage).filter(ChatMessage.session_id == session_id).order_by(ChatMessage.created_at.desc()).limit(20).all()
-    history = history[::-1]
-
-    messages_payload = [{"role": m.role, "content": m.content} for m in history]
+    # 3. Build Context for AI — rolling summary + newest turns within the token budget
+    messages_payload, needs_fold = build_context(db, session)
+    return session_id, messages_payload, needs_fold
 
-    # 4. Get AI Response
-    ai_response_text = ai_service.get_chat_response(messages_payload)
 
-    # 5. Save AI Response and update session timestamp
+def _save_ai_reply(db: Session, session_id: int, ai_response_text: str):
+    """Save AI Response and update session timestamp."""
     ai_msg = ChatMessage(session_id=session_id, role="assistant", content=ai_response_text)
     db.add(ai_msg)
-    session.updated_at = func.now()
+    db.query(ChatSession).filter(ChatSession.id == session_id).update({ChatSession.updated_at: func.now()})
     db.commit()
 
+
+@router.post("/message", response_model=MessageResponse)
+async def send_message(
+    request: MessageRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    # DB work stays on the threadpool; the AI call itself is awaited on the event
+    # loop so a slow completion no longer pins a worker thread.
+    session_id, messages_payload, needs_fold = await run_in_threadpool(_prepare_chat_turn, db, current_user, request)
+
+    # Chat turns are sampled at temperature 0.7: never answer one from the response cache
+    ai_response_text = await ai_service.aget_chat_response(messages_payload, use_cache=False)
+    if ai_response_text != FALLBACK_RESPONSE:
+        ai_response_text += statute_map.annotate_reply(ai_response_text)
+
+    await run_in_threadpool(_save_ai_reply, db, session_id, ai_response_text)
+    if needs_fold:
+        background_tasks.add_task(refresh_summary, session_id)
+
     return {"response": ai_response_text, "session_id": session_id}
 
+def _save_ai_reply_detached(session_id: int, ai_response_text: str):
+    """Same as _save_ai_reply, but with its own DB session for use after the response has started."""
+    db = SessionLocal()
+    try:
+        _save_ai_reply(db, session_id, ai_response_text)
+    finally:
+        db.close()
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/message/stream")
+async def stream_message(
+    request: MessageRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Streaming variant of /message. Emits Server-Sent Events:
+    `session` (session id), `token` (text delta) and finally `done`.
+    The assistant message is stored once the stream ends; if the client
+    disconnects midway, whatever was already streamed is stored instead.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    session_id, messages_payload, needs_fold = await run_in_threadpool(_prepare_chat_turn, db, current_user, request)
+
+    async def event_stream():
+        parts = []
+        try:
+            yield _sse("session", {"session_id": session_id})
+            try:
+                async with aclosing(ai_service.astream_chat_response(messages_payload, use_cache=False)) as tokens:
+                    async for delta in tokens:
+                        parts.append(delta)
+                        yield _sse("token", {"text": delta})
+            except AIServiceError as e:
+                print(f"Error streaming from Together AI: {e}")
+                if not parts:
+                    parts.append(FALLBACK_RESPONSE)
+                    yield _sse("token", {"text": FALLBACK_RESPONSE})
+            if parts and parts != [FALLBACK_RESPONSE]:
+                footer = statute_map.annotate_reply("".join(parts))
+                if footer:
+                    parts.append(footer)
+                    yield _sse("token", {"text": footer})
+            yield _sse("done", {"session_id": session_id})
+        finally:
+            # Runs on normal completion and on client disconnect (cancellation);
+            # shield the write so the partial reply still lands in history.
+            if parts:
+                with anyio.CancelScope(shield=True):
+                    await run_in_threadpool(_save_ai_reply_detached, session_id, "".join(parts))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(refresh_summary, session_id) if needs_fold else None,
+    )
+
 @router.post("/upload")
 async def upload_document(
     file: UploadFile = File(...), 
@@ -145,46 +247,54 @@ async def upload_document(
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
     try:
-        content = await file.read()
-        
-        text = ""
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-
-        # Save to disk for Library/Cases view
-        file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{datetime.now().timestamp()}_{file.filename}")
-        file.file.seek(0) # Reset file pointer to read again (if needed) or just write buffer
-        # Since we read 'content' already, we can write 'content' to file_path
-        with open(file_path, "wb") as f:
-            f.write(content)
-            
+        # Stored once per content hash; text extracted on first upload and reused after
+        incoming = await blob_store.receive_upload(file)
+    except blob_store.UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    try:
+        blob = await run_in_threadpool(blob_store.add_reference, db, incoming)
+    except (SQLAlchemyError, OSError) as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to store PDF: {str(e)}")
+    finally:
+        # No-op once the file has been moved into the blob store
+        incoming.discard()
+
+    case_saved = False
+    try:
+        text = await run_in_threadpool(blob_store.get_text, db, blob.sha256)
+
         # Create CaseDocument
         new_case = case_model.CaseDocument(
             user_id=current_user.id,
             filename=file.filename,
-            file_path=file_path,
+            file_path=blob.file_path,
+            blob_sha256=blob.sha256,
             target_language="English", # Default
             translated_content="Auto-uploaded from Chat"
         )
         db.add(new_case)
         db.commit() # Commit to get ID if needed, but we mostly just need it saved
-        
-        # Save as a system/user message with context
-        context_msg = f"Reading Document: {file.filename}\n\nContent:\n{text[:10000]}" # Limit context to avoid token limits
-        if len(text) > 10000:
-            context_msg += "\n...(document truncated)..."
-            
+        case_saved = True  # the case owns the blob reference from here on
+
+        # Index the whole document for retrieval; each question pulls in only the passages it needs
+        await run_in_threadpool(passage_index.index_document, db, session_id, file.filename, blob.sha256, text)
+
         msg = ChatMessage(
-            session_id=session_id, 
-            role="user", 
-            content=f"I have uploaded a document named '{file.filename}'. Use this context for our discussion.\n\n{context_msg}",
+            session_id=session_id,
+            role="user",
+            content=f"I have uploaded a document named '{file.filename}'. Use it as context for our discussion.",
             document_name=file.filename
         )
         db.add(msg)
         db.commit()
-        
+
         return {"status": "success", "message": "Document processed and added to context"}
         
-    except Exception as e:
+    except (SQLAlchemyError, OSError) as e:
+        db.rollback()
+        if not case_saved:
+            # Nothing owns the reference taken above; give it back so the blob can be freed
+            await run_in_threadpool(blob_store.release_reference, db, blob.sha256)
         raise HTTPException(status_code=500, detail=f"Failed to process PDF: {str(e)}")
@@ -1,21 +1,124 @@
-from fastapi import APIRouter, HTTPException
-from services.sci_scraper import fetch_live_judgments
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
+from datetime import date
+
+from config import settings
+from database import get_db
+from services.judgments_cache import judgments_cache
+from services import judgments_store, judgment_pdfs, judgment_summaries, search_index
+from services.judgment_pdfs import pdf_pipeline
+from models.judgment import Judgment as JudgmentRow, JudgmentText
 
 router = APIRouter()
 
 class Judgment(BaseModel):
+    id: str
     title: str
     text: str
     link: str
     date: str
     category: str
+    sources: List[str]
 
 @router.get("/live", response_model=List[Judgment])
-def get_live_judgments():
+async def get_live_judgments(request: Request):
+    """Served from the background-refreshed cache; never waits on an upstream source once it has data."""
+    entry = judgments_cache.get()
+    if entry.checked_at is None and not entry.count and judgments_cache.running:
+        # Cold start with nothing persisted yet: give the first refresh a moment
+        await run_in_threadpool(judgments_cache.wait_loaded, settings.JUDGMENTS_COLD_START_WAIT)
+        entry = judgments_cache.get()
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age=60, stale-while-revalidate={settings.JUDGMENTS_REFRESH_SECONDS}",
+    }
+    if judgments_cache.is_stale(entry):
+        headers["Warning"] = '110 - "Response is Stale"'
+    if entry.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/")
+def list_judgments(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category: Optional[str] = Query(None, description="Criminal, Civil or Other"),
+    db: Session = Depends(get_db),
+):
+    """Browse the judgments archive, newest first, with keyset pagination."""
     try:
-        data = fetch_live_judgments()
-        return data
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return judgments_store.list_judgments(db, limit, cursor, date_from, date_to, category)
+    except judgments_store.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/search")
+def search_judgments(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Full-text search over the text of archived judgments whose PDFs have been fetched."""
+    if not search_index.is_available(db):
+        raise HTTPException(status_code=503, detail="Search is not available on this database")
+    return search_index.search_judgments(db, q, limit, offset)
+
+
+@router.get("/{judgment_id}/text")
+def get_judgment_text(
+    judgment_id: int,
+    page: Optional[int] = Query(None, ge=1, description="1-based page; the whole text if omitted"),
+    db: Session = Depends(get_db),
+):
+    """Stored text of an archived judgment's PDF, fetched ahead of time by the prefetch pipeline."""
+    judgment = db.query(JudgmentRow).filter(JudgmentRow.id == judgment_id).first()
+    if not judgment:
+        raise HTTPException(status_code=404, detail="Judgment not found")
+    row = db.query(JudgmentText).filter(JudgmentText.judgment_id == judgment_id).first()
+    result = {
+        "judgment_id": judgment.id,
+        "title": judgment.title,
+        "link": judgment.link,
+        "status": row.status if row else judgment_pdfs.QUEUED,
+        "page_count": None,
+        "text": None,
+    }
+    if row is None or row.status != judgment_pdfs.DONE:
+        if row is not None:
+            result["error"] = row.error
+        pdf_pipeline.notify()
+        return result
+
+    result["page_count"] = row.page_count
+    if page is None:
+        result["text"] = row.text
+        result["page_offsets"] = json.loads(row.page_offsets or "[]")
+        return result
+    text = judgment_pdfs.page_text(row, page)
+    if text is None:
+        raise HTTPException(status_code=404, detail=f"Page {page} not found (judgment has {row.page_count} pages)")
+    result["page"] = page
+    result["text"] = text
+    return result
+
+
+@router.get("/{judgment_id}/summary")
+def get_judgment_summary(judgment_id: int, db: Session = Depends(get_db)):
+    """AI summary generated when the judgment was ingested; a database read, never a live model call."""
+    if not db.query(JudgmentRow.id).filter(JudgmentRow.id == judgment_id).first():
+        raise HTTPException(status_code=404, detail="Judgment not found")
+    summary = judgment_summaries.get_summary(db, judgment_id)
+    if summary is None:
+        # Waiting for the PDF text, or for the summary worker to reach it
+        return {"judgment_id": judgment_id, "status": judgment_summaries.QUEUED, "summary": None, "current": False}
+    return {"judgment_id": judgment_id, **summary}
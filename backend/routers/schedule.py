@@ -2,15 +2,22 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timezone
 
 from database import get_db
 from models import schedule as schedule_model
 from models import user as user_model
 from routers.auth import get_current_user
+from services.reminder_dispatcher import reminder_dispatcher
 
 router = APIRouter()
 
+def _utc(value: datetime) -> datetime:
+    """Stored naive in UTC, which the reminder dispatcher compares against datetime.utcnow()."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 class ScheduleCreate(BaseModel):
     case_name: str
     court_date: datetime
@@ -38,14 +45,15 @@ def create_schedule(
     new_schedule = schedule_model.Schedule(
         user_id=current_user.id,
         case_name=schedule.case_name,
-        court_date=schedule.court_date,
-        reminder_date=schedule.reminder_date,
+        court_date=_utc(schedule.court_date),
+        reminder_date=_utc(schedule.reminder_date),
         status=schedule.status,
         notification_enabled=schedule.notification_enabled
     )
     db.add(new_schedule)
     db.commit()
     db.refresh(new_schedule)
+    reminder_dispatcher.notify()
     return new_schedule
 
 @router.get("/", response_model=List[ScheduleResponse])
@@ -86,13 +94,22 @@ def update_schedule(
     if not existing:
         raise HTTPException(status_code=404, detail="Schedule not found")
 
+    reminder_date = _utc(schedule.reminder_date)
+    reminder_changed = existing.reminder_date != reminder_date
+    if reminder_changed:
+        # A new reminder time is a new reminder: send it again even if the old one went out
+        existing.reminder_sent_at = None
+        existing.reminder_claimed_at = None
+
     existing.case_name = schedule.case_name
-    existing.court_date = schedule.court_date
-    existing.reminder_date = schedule.reminder_date
+    existing.court_date = _utc(schedule.court_date)
+    existing.reminder_date = reminder_date
     existing.status = schedule.status
     existing.notification_enabled = schedule.notification_enabled
     db.commit()
     db.refresh(existing)
+    if reminder_changed or schedule.notification_enabled:
+        reminder_dispatcher.notify()
     return existing
 
 @router.delete("/{schedule_id}")
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from services.statute_map import statute_map, normalize_code
+
+router = APIRouter()
+
+
+@router.get("/map")
+def map_section(
+    code: str = Query(..., description="IPC, CrPC, IEA, BNS, BNSS or BSA"),
+    section: str = Query(..., max_length=20),
+):
+    """Corresponding section(s) in the old or new criminal code, e.g. ?code=IPC&section=302 → BNS 103(1)."""
+    if normalize_code(code) is None:
+        raise HTTPException(status_code=400, detail=f"Unknown code '{code}'. Use one of: {', '.join(statute_map.codes)}")
+    result = statute_map.lookup(code, section)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No mapping for section {section} {normalize_code(code)}")
+    return result
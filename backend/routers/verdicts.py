@@ -1,7 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
-from datetime import datetime, timedelta
+
+from config import settings
+from database import get_db
+from models.verdict import Verdict as VerdictRow
+from services import verdicts_store
 
 router = APIRouter()
 
@@ -12,39 +19,93 @@ class Verdict(BaseModel):
     effective_date: str
     details: str
 
-# Mock Data simulating Indian Supreme Court verdicts
-MOCK_VERDICTS = [
-    {
-        "id": 1,
-        "title": "Sulochana Amma vs Narayanan Nair",
-        "summary": "Section Supreme Court of India - 1994 AIR 152, 1994 SCC (2) 14",
-        "effective_date": "Tue Oct 23 2018",
-        "details": "Clarification on inheritance rights and property succession."
-    },
-    {
-        "id": 2,
-        "title": "Estoppel : Indian Evidence Act, 1872 section 115",
-        "summary": "Estoppel regarding land acquisition disputes.",
-        "effective_date": "Tue Oct 23 2018",
-        "details": "Ruling on the applicability of Estoppel against the government statutes."
-    },
-    {
-        "id": 3,
-        "title": "Res Judicata",
-        "summary": "Section 11 of the Code of Civil Procedure",
-        "effective_date": "Tue Oct 23 2018",
-        "details": "Finality of judgment and preventing re-litigation of the same cause of action."
-    },
-    {
-        "id": 4,
-        "title": "Fundamental Rights vs Directive Principles",
-        "summary": "Minerva Mills Ltd. vs Union of India",
-        "effective_date": "Mon Oct 22 2018",
-        "details": "Balance between Fundamental Rights and Directive Principles of State Policy."
-    }
-]
+
+def _etag(*parts) -> str:
+    return '"' + hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32] + '"'
+
+
+def _cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={settings.VERDICTS_CACHE_SECONDS}"}
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    tags = [t.strip() for t in request.headers.get("if-none-match", "").split(",")]
+    return "*" in tags or etag in tags
+
 
 @router.get("/recent", response_model=List[Verdict])
-def get_recent_verdicts():
-    # In production, this would fetch from Indian Kanoon API or Database
-    return MOCK_VERDICTS
+def get_recent_verdicts(
+    request: Request,
+    response: Response,
+    limit: int = Query(4, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    """Latest verdicts in the catalogue for the dashboard widget; revalidated with the catalogue ETag."""
+    etag = _etag("recent", limit, verdicts_store.catalogue_version(db))
+    headers = _cache_headers(etag)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    rows = db.query(VerdictRow).order_by(VerdictRow.verdict_date.desc(), VerdictRow.id.desc()).limit(limit).all()
+    return [
+        {
+            "id": r.id,
+            "title": r.title,
+            "summary": r.summary or r.citation or "",
+            "effective_date": r.verdict_date.strftime("%a %b %d %Y"),
+            "details": r.details or "",
+        }
+        for r in rows
+    ]
+
+
+@router.get("/")
+def list_verdicts(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    topic: Optional[str] = None,
+    statute: Optional[str] = Query(None, max_length=100, description='e.g. "IPC 302" or "Constitution Art. 21"'),
+    db: Session = Depends(get_db),
+):
+    """
+    Browse the catalogue newest first with keyset pagination. The ETag covers
+    the query and the catalogue version, so a revalidation is answered 304
+    without running the page query.
+    """
+    etag = _etag("list", limit, cursor, topic, statute and verdicts_store.normalize_statute(statute),
+                 verdicts_store.catalogue_version(db))
+    headers = _cache_headers(etag)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    try:
+        page = verdicts_store.list_verdicts(db, limit, cursor, topic, statute)
+    except verdicts_store.InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers.update(headers)
+    return page
+
+
+@router.get("/topics")
+def list_topics(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Topics in the catalogue with the number of verdicts in each, for the topic filter."""
+    etag = _etag("topics", verdicts_store.catalogue_version(db))
+    headers = _cache_headers(etag)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return verdicts_store.list_topics(db)
+
+
+@router.get("/{verdict_id}")
+def get_verdict(verdict_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    row = db.query(VerdictRow).filter(VerdictRow.id == verdict_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Verdict not found")
+    etag = _etag("verdict", row.id, row.updated_at.isoformat())
+    headers = _cache_headers(etag)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return verdicts_store.to_item(row, details=True)
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+
+
+def make_cache_key(payload: dict) -> str:
+    """
+    SHA-256 over the request payload minus transport-only fields. The payload
+    already holds the cleaned message list, so whitespace and role merging are
+    normalised before hashing; model and sampling params are part of the key.
+    """
+    normalized = {k: v for k, v in payload.items() if k != "stream"}
+    raw = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier completion cache: an in-process LRU with TTL in front of a
+    persistent SQLite table that survives restarts.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, db_path: Optional[str], disk_ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_ttl_seconds = disk_ttl_seconds
+        self._memory = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS ai_response_cache ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"AI cache: persistent tier disabled ({e})")
+                self._db = None
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        response = self._disk_get(key, now)
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._memory_set(key, response, now)
+        return response
+
+    def set(self, key: str, response: str):
+        now = time.time()
+        self._memory_set(key, response, now)
+        self._disk_set(key, response, now)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM ai_response_cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "persistent": self._db is not None,
+            }
+
+    # ── Tiers ────────────────────────────────────────────────────────────────
+
+    def _memory_set(self, key: str, response: str, now: float):
+        with self._lock:
+            self._memory[key] = (now + self.ttl_seconds, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT response FROM ai_response_cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"AI cache read error: {e}")
+            return None
+        return row[0] if row else None
+
+    def _disk_set(self, key: str, response: str, now: float):
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO ai_response_cache (key, response, expires_at) VALUES (?, ?, ?)",
+                    (key, response, now + self.disk_ttl_seconds),
+                )
+                self._writes += 1
+                # Sweep expired rows now and then instead of on every write
+                if self._writes % 100 == 0:
+                    self._db.execute("DELETE FROM ai_response_cache WHERE expires_at <= ?", (now,))
+                self._db.commit()
+        except sqlite3.Error as e:
+            print(f"AI cache write error: {e}")
+
+
+response_cache = ResponseCache(
+    max_entries=settings.AI_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AI_CACHE_TTL_SECONDS,
+    db_path=settings.AI_CACHE_DB_PATH if settings.AI_CACHE_ENABLED else None,
+    disk_ttl_seconds=settings.AI_CACHE_DISK_TTL_SECONDS,
+)
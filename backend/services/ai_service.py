@@ -1,58 +1,132 @@
-import requests
-import os
+import httpx
+import json
+import threading
 from datetime import datetime
 from config import settings
+from services.ai_cache import response_cache, make_cache_key
+from services.singleflight import SingleFlight
+from services.upstream_guard import UpstreamGuard, AdaptiveLimiter, CircuitBreaker, classify_status, OVERLOADED, FAILED
+
+FALLBACK_RESPONSE = "I'm sorry, I'm unable to process your request right now. The AI service may be temporarily unavailable. Please try again in a moment."
+
+
+class AIServiceError(Exception):
+    """Raised when a completion could not be obtained from Together AI."""
+
+
+def build_system_prompt():
+    return f"You are an advanced Legal AI Assistant designed for Indian Law. Current Date: {datetime.now().strftime('%Y-%m-%d')}\n\n**Guidelines:**\n1. **Conversation**: For casual greetings (e.g., 'Hi', 'Hello'), respond naturally and briefly without legal jargon. Do not hallucinate legal scenarios unless asked.\n2. **Legal Knowledge**: When discussing legal matters, you MUST be well-versed with **Bharatiya Nyaya Sanhita (BNS)**, **Bharatiya Nagarik Suraksha Sanhita (BNSS)**, and **Bharatiya Sakshya Adhiniyam (BSA)**. Cite sections precisely. Corresponding old IPC/CrPC/IEA (or new) sections are cross-referenced automatically from a verified table, so do not list the mappings yourself.\n3. **Scheduling**: ONLY if the user EXPLICITLY asks to 'schedule', 'add to calendar', or 'remind me' of an event:\n   - Check if the requested date is in the past relative to the Current Date. If it is, DO NOT schedule; instead, ask for a valid future date.\n   - If the date is valid or ambiguous, ask for clarification.\n   - ONLY if strict 'title', 'date' (future), and 'time' are present, output a JSON block at the end of your response in this format:\n```json\n{{\n  \"action\": \"schedule\",\n  \"title\": \"Event Title\",\n  \"date\": \"YYYY-MM-DD\",\n  \"time\": \"HH:MM\"\n}}\n```\nDo NOT output this JSON for general questions, past dates, or if information is missing."
+
 
 class AIService:
     def __init__(self):
         self.api_key = settings.TOGETHER_API_KEY or ""
-        self.base_url = "https://api.together.xyz/v1/chat/completions"
-        self.model = "mistralai/Mixtral-8x7B-Instruct-v0.1" 
+        self.base_url = settings.TOGETHER_BASE_URL
+        self.model = settings.TOGETHER_MODEL
         # Using Mixtral-8x7B for 32k context window to handle large legal documents.
 
-    def get_chat_response(self, messages, max_tokens=1024):
-        """
-        messages: list of dicts [{"role": "user", "content": "..."}]
-        """
-        headers = {
+        # One keep-alive pool per client, shared by every request in the process,
+        # so chat turns and translation chunks reuse TCP+TLS connections.
+        self.limits = httpx.Limits(
+            max_connections=settings.AI_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AI_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.AI_POOL_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(settings.AI_READ_TIMEOUT, connect=settings.AI_CONNECT_TIMEOUT)
+        self._client = None
+        self._async_client = None
+        self._client_lock = threading.Lock()
+        self.cache = response_cache if settings.AI_CACHE_ENABLED else None
+        # Identical concurrent requests (double submits, retried translation
+        # chunks) share one upstream call
+        self.inflight = SingleFlight()
+        # Adaptive concurrency limit + retries with backoff + circuit breaker
+        self.guard = UpstreamGuard(
+            limiter=AdaptiveLimiter(
+                settings.AI_CONCURRENCY_INITIAL, settings.AI_CONCURRENCY_MIN, settings.AI_CONCURRENCY_MAX
+            ),
+            breaker=CircuitBreaker(settings.AI_BREAKER_FAILURE_THRESHOLD, settings.AI_BREAKER_RESET_TIMEOUT),
+            max_retries=settings.AI_MAX_RETRIES,
+            base_delay=settings.AI_RETRY_BASE_DELAY,
+            max_delay=settings.AI_RETRY_MAX_DELAY,
+            queue_timeout=settings.AI_QUEUE_TIMEOUT,
+        )
+
+    # ── Clients ──────────────────────────────────────────────────────────────
+
+    @property
+    def client(self) -> httpx.Client:
+        """Pooled client for sync callers (background translation threads)."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(limits=self.limits, timeout=self.timeout)
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled client for async callers (chat endpoints on the event loop)."""
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+        return self._async_client
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    # ── Request building ─────────────────────────────────────────────────────
+
+    def _headers(self):
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
-        # Ensure system prompt for legal context if not present
+
+    def _clean_messages(self, messages):
+        """
+        Prepend the legal system prompt if missing, drop empty messages, truncate
+        oversized ones and merge consecutive messages from the same role.
+        """
+        messages = list(messages)
         if messages and messages[0]['role'] != 'system':
-            messages.insert(0, {
-                "role": "system", 
-                "content": f"You are an advanced Legal AI Assistant designed for Indian Law. Current Date: {datetime.now().strftime('%Y-%m-%d')}\n\n**Guidelines:**\n1. **Conversation**: For casual greetings (e.g., 'Hi', 'Hello'), respond naturally and briefly without legal jargon. Do not hallucinate legal scenarios unless asked.\n2. **Legal Knowledge**: When discussing legal matters, you MUST be well-versed with **Bharatiya Nyaya Sanhita (BNS)**, **Bharatiya Nagarik Suraksha Sanhita (BNSS)**, and **Bharatiya Sakshya Adhiniyam (BSA)**. ALWAYS provide references to both these new laws AND the corresponding old IPC/CrPC/IEA sections for clarity.\n3. **Scheduling**: ONLY if the user EXPLICITLY asks to 'schedule', 'add to calendar', or 'remind me' of an event:\n   - Check if the requested date is in the past relative to the Current Date. If it is, DO NOT schedule; instead, ask for a valid future date.\n   - If the date is valid or ambiguous, ask for clarification.\n   - ONLY if strict 'title', 'date' (future), and 'time' are present, output a JSON block at the end of your response in this format:\n```json\n{{\n  \"action\": \"schedule\",\n  \"title\": \"Event Title\",\n  \"date\": \"YYYY-MM-DD\",\n  \"time\": \"HH:MM\"\n}}\n```\nDo NOT output this JSON for general questions, past dates, or if information is missing."
-            })
+            messages.insert(0, {"role": "system", "content": build_system_prompt()})
 
-        # Validate and clean messages, merging consecutive messages from the same role
         cleaned_messages = []
         last_role = None
-        
+
         for msg in messages:
             content = msg.get('content', '').strip()
             role = msg['role']
-            
+
             if not content:
                 continue
-                
+
             # Truncate extremely long individual messages
             if len(content) > 12000:
                 content = content[:12000] + "...[truncated]"
-            
+
             if role == last_role and cleaned_messages:
                 # Merge with previous message
                 cleaned_messages[-1]['content'] += "\n\n" + content
             else:
                 # Append new message
                 cleaned_messages.append({"role": role, "content": content})
-            
+
             last_role = role
-        
-        payload = {
+
+        return cleaned_messages
+
+    def _build_payload(self, messages, max_tokens):
+        return {
             "model": self.model,
-            "messages": cleaned_messages,
+            "messages": self._clean_messages(messages),
             "max_tokens": max_tokens,
             "temperature": 0.7,
             "top_p": 0.7,
@@ -60,23 +134,160 @@ class AIService:
             "repetition_penalty": 1
         }
 
+    def _cached(self, key, use_cache):
+        if not use_cache or self.cache is None:
+            return None
+        return self.cache.get(key)
+
+    def _store(self, key, use_cache, content):
+        if use_cache and self.cache is not None:
+            self.cache.set(key, content)
+
+    def _parse_response(self, response: httpx.Response):
+        if response.status_code != 200:
+            print(f"AI API Error Status: {response.status_code}")
+            print(f"AI API Error Body: {response.text}")
+        response.raise_for_status()
+        data = response.json()
+        return data['choices'][0]['message']['content']
+
+    # ── Completions ──────────────────────────────────────────────────────────
+
+    def _post(self, payload, key, use_cache):
+        try:
+            response = self.guard.call(
+                lambda: self.client.post(self.base_url, json=payload, headers=self._headers())
+            )
+            content = self._parse_response(response)
+        except Exception as e:
+            raise AIServiceError(str(e)) from e
+        self._store(key, use_cache, content)
+        return content
+
+    async def _apost(self, payload, key, use_cache):
+        try:
+            response = await self.guard.acall(
+                lambda: self.async_client.post(self.base_url, json=payload, headers=self._headers())
+            )
+            content = self._parse_response(response)
+        except Exception as e:
+            raise AIServiceError(str(e)) from e
+        self._store(key, use_cache, content)
+        return content
+
+    def complete(self, messages, max_tokens=1024, use_cache=True):
+        """
+        Blocking completion. Raises AIServiceError on failure.
+        Pass use_cache=False when a fresh sample is wanted for an identical prompt
+        (it is then neither cached nor shared with a concurrent identical call).
+        """
+        payload = self._build_payload(messages, max_tokens)
+        key = make_cache_key(payload)
+        if not use_cache:
+            return self._post(payload, key, use_cache)
+        cached = self._cached(key, use_cache)
+        if cached is not None:
+            return cached
+        return self.inflight.do(key, lambda: self._post(payload, key, use_cache))
+
+    async def acomplete(self, messages, max_tokens=1024, use_cache=True):
+        """Non-blocking completion. Raises AIServiceError on failure."""
+        payload = self._build_payload(messages, max_tokens)
+        key = make_cache_key(payload)
+        if not use_cache:
+            return await self._apost(payload, key, use_cache)
+        cached = self._cached(key, use_cache)
+        if cached is not None:
+            return cached
+        return await self.inflight.ado(key, lambda: self._apost(payload, key, use_cache))
+
+    async def astream_chat_response(self, messages, max_tokens=1024, use_cache=True):
+        """
+        Yield the completion text piece by piece as Together streams it.
+        Raises AIServiceError if the stream cannot be opened or breaks off.
+        A cached completion is yielded in one piece.
+        """
+        payload = self._build_payload(messages, max_tokens)
+        key = make_cache_key(payload)
+        cached = self._cached(key, use_cache)
+        if cached is not None:
+            yield cached
+            return
+        payload["stream"] = True
+        parts = []
+        # Streams are not retried (tokens may already be on the wire), but they
+        # still take a concurrency slot and feed the circuit breaker.
         try:
-            response = requests.post(self.base_url, json=payload, headers=headers)
-            
-            if response.status_code != 200:
-                print(f"AI API Error Status: {response.status_code}")
-                print(f"AI API Error Body: {response.text}")
-                
-            response.raise_for_status()
-            data = response.json()
-            return data['choices'][0]['message']['content']
+            await self.guard.abefore()
         except Exception as e:
+            raise AIServiceError(str(e)) from e
+        outcome = None
+        try:
+            async with self.async_client.stream("POST", self.base_url, json=payload, headers=self._headers()) as response:
+                outcome = classify_status(response.status_code)
+                if response.status_code != 200:
+                    await response.aread()
+                    self._parse_response(response)
+                async for line in response.aiter_lines():
+                    # Together sends OpenAI-style SSE: "data: {...}" lines, ending with "data: [DONE]"
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    choice = json.loads(data)['choices'][0]
+                    delta = (choice.get('delta') or {}).get('content') or choice.get('text')
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+        except httpx.TimeoutException as e:
+            outcome = OVERLOADED
+            raise AIServiceError(str(e)) from e
+        except httpx.TransportError as e:
+            outcome = FAILED
+            raise AIServiceError(str(e)) from e
+        except (httpx.HTTPError, ValueError, KeyError, IndexError) as e:
+            raise AIServiceError(str(e)) from e
+        finally:
+            self.guard.after(outcome)
+        # Only a stream that ran to completion is worth caching
+        if parts:
+            self._store(key, use_cache, "".join(parts))
+
+    def get_chat_response(self, messages, max_tokens=1024, use_cache=True):
+        """
+        messages: list of dicts [{"role": "user", "content": "..."}]
+        """
+        try:
+            return self.complete(messages, max_tokens=max_tokens, use_cache=use_cache)
+        except AIServiceError as e:
             print(f"Error calling Together AI: {e}")
-            return "I'm sorry, I'm unable to process your request right now. The AI service may be temporarily unavailable. Please try again in a moment."
+            return FALLBACK_RESPONSE
 
-    def draft_legal_document(self, topic, details):
+    async def aget_chat_response(self, messages, max_tokens=1024, use_cache=True):
+        """Async variant of get_chat_response; does not tie up a threadpool worker."""
+        try:
+            return await self.acomplete(messages, max_tokens=max_tokens, use_cache=use_cache)
+        except AIServiceError as e:
+            print(f"Error calling Together AI: {e}")
+            return FALLBACK_RESPONSE
+
+    def stats(self) -> dict:
+        """Runtime view of the outbound path for the admin status endpoint."""
+        return {
+            "upstream": self.guard.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "coalescing": self.inflight.stats(),
+        }
+
+    def _draft_messages(self, topic, details):
         prompt = f"Draft a detailed legal document regarding '{topic}'.\n\nDetails:\n{details}\n\nFormat strictly as a professional {topic} under Indian Law."
-        messages = [{"role": "user", "content": prompt}]
-        return self.get_chat_response(messages, max_tokens=2048)
+        return [{"role": "user", "content": prompt}]
+
+    def draft_legal_document(self, topic, details, use_cache=True):
+        return self.get_chat_response(self._draft_messages(topic, details), max_tokens=2048, use_cache=use_cache)
+
+    async def adraft_legal_document(self, topic, details, use_cache=True):
+        return await self.aget_chat_response(self._draft_messages(topic, details), max_tokens=2048, use_cache=use_cache)
 
 ai_service = AIService()
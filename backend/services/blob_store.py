@@ -0,0 +1,172 @@
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.blob import FileBlob, BlobTranslation
+from services.pdf_extraction import extract_pdf_text
+
+BLOB_DIR = os.path.join("uploaded_files", "blobs")
+TMP_DIR = os.path.join(BLOB_DIR, "tmp")
+CHUNK_SIZE = 1024 * 1024
+os.makedirs(TMP_DIR, exist_ok=True)
+
+
+def normalize_language(language: Optional[str]) -> str:
+    return (language or "English").strip().lower()
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"File exceeds the {limit / (1024 * 1024):g} MB upload limit")
+
+
+class IncomingFile:
+    """An upload spooled to a temp file, with its SHA-256 computed on the way in."""
+
+    def __init__(self, temp_path: str, sha256: str, size: int, filename: str):
+        self.temp_path = temp_path
+        self.sha256 = sha256
+        self.size = size
+        self.filename = filename
+
+    def discard(self):
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def _append(out, hasher, chunk: bytes):
+    hasher.update(chunk)
+    out.write(chunk)
+
+
+async def receive_upload(file: UploadFile, max_bytes: Optional[int] = None) -> IncomingFile:
+    """
+    Stream an upload to disk chunk by chunk, hashing as it arrives. Disk
+    writes and hashing run in the threadpool so large files don't block the
+    event loop; only one chunk is held in memory at a time. Raises
+    UploadTooLargeError as soon as more than max_bytes have arrived.
+    """
+    limit = max_bytes or settings.MAX_UPLOAD_BYTES
+    if file.size is not None and file.size > limit:
+        raise UploadTooLargeError(limit)
+    hasher = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=TMP_DIR)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLargeError(limit)
+                await run_in_threadpool(_append, out, hasher, chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return IncomingFile(temp_path, hasher.hexdigest(), size, file.filename)
+
+
+def _blob_path(sha256: str, filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return os.path.join(BLOB_DIR, sha256[:2], sha256 + ext)
+
+
+def add_reference(db: Session, incoming: IncomingFile) -> FileBlob:
+    """
+    Store the incoming file under its hash (once) and take a reference on it.
+    Returns the blob; callers point their CaseDocument at blob.sha256.
+    """
+    blob = db.query(FileBlob).filter(FileBlob.sha256 == incoming.sha256).first()
+    if blob is None:
+        path = _blob_path(incoming.sha256, incoming.filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Same hash means same bytes, so replacing an existing file is harmless
+        os.replace(incoming.temp_path, path)
+        try:
+            db.add(FileBlob(sha256=incoming.sha256, file_path=path, size=incoming.size, ref_count=1))
+            db.commit()
+        except IntegrityError:
+            # Another request stored the same content concurrently
+            db.rollback()
+            _increment(db, incoming.sha256)
+    else:
+        if os.path.exists(blob.file_path):
+            incoming.discard()
+        else:
+            # The stored file went missing; the upload has the same bytes, so restore it
+            os.makedirs(os.path.dirname(blob.file_path), exist_ok=True)
+            os.replace(incoming.temp_path, blob.file_path)
+        _increment(db, incoming.sha256)
+    return db.query(FileBlob).filter(FileBlob.sha256 == incoming.sha256).first()
+
+
+def _increment(db: Session, sha256: str):
+    db.query(FileBlob).filter(FileBlob.sha256 == sha256).update(
+        {FileBlob.ref_count: FileBlob.ref_count + 1}, synchronize_session=False
+    )
+    db.commit()
+
+
+def release_reference(db: Session, sha256: str):
+    """
+    Drop one reference; the file, its text and translations go with the last
+    one. Chat passages indexed from the blob keep their own copy of the text
+    and are not references.
+    """
+    db.query(FileBlob).filter(FileBlob.sha256 == sha256).update(
+        {FileBlob.ref_count: FileBlob.ref_count - 1}, synchronize_session=False
+    )
+    db.commit()
+    blob = db.query(FileBlob).filter(FileBlob.sha256 == sha256, FileBlob.ref_count <= 0).first()
+    if blob is None:
+        return
+    path = blob.file_path
+    db.query(BlobTranslation).filter(BlobTranslation.blob_sha256 == sha256).delete(synchronize_session=False)
+    deleted = db.query(FileBlob).filter(FileBlob.sha256 == sha256, FileBlob.ref_count <= 0).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    if deleted and path and os.path.exists(path):
+        os.remove(path)
+
+
+def get_text(db: Session, sha256: str) -> str:
+    """Extracted text of a blob, computed on first request and then reused."""
+    blob = db.query(FileBlob).filter(FileBlob.sha256 == sha256).first()
+    if blob is None:
+        return ""
+    if blob.extracted_text is None:
+        text = extract_pdf_text(blob.file_path)
+        db.query(FileBlob).filter(FileBlob.sha256 == sha256).update(
+            {FileBlob.extracted_text: text}, synchronize_session=False
+        )
+        db.commit()
+        return text
+    return blob.extracted_text
+
+
+def get_translation(db: Session, sha256: str, language: str) -> Optional[str]:
+    row = db.query(BlobTranslation).filter(
+        BlobTranslation.blob_sha256 == sha256,
+        BlobTranslation.language == normalize_language(language),
+    ).first()
+    return row.content if row else None
+
+
+def save_translation(db: Session, sha256: str, language: str, content: str):
+    try:
+        db.add(BlobTranslation(blob_sha256=sha256, language=normalize_language(language), content=content))
+        db.commit()
+    except IntegrityError:
+        # Translated concurrently by another job; keep the first result
+        db.rollback()
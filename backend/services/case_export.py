@@ -0,0 +1,98 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from models.case import CaseDocument
+
+EXPORT_DIR = os.path.join("uploaded_files", "exports")
+os.makedirs(EXPORT_DIR, exist_ok=True)
+
+
+def _path(sha256: str, gzipped: bool = False) -> str:
+    return os.path.join(EXPORT_DIR, sha256 + (".txt.gz" if gzipped else ".txt"))
+
+
+def _write_atomic(path: str, data: bytes):
+    fd, temp_path = tempfile.mkstemp(dir=EXPORT_DIR)
+    with os.fdopen(fd, "wb") as out:
+        out.write(data)
+    os.replace(temp_path, path)
+
+
+def content_sha256(text: Optional[str]) -> str:
+    """Name of the export file holding text."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def export_path(db: Session, case: CaseDocument) -> tuple:
+    """
+    The case's translated text as a .txt file, written once and named by its
+    SHA-256 (identical translations share a file). Returns (path, sha256).
+    replace_content() clears export_sha256 whenever translated_content changes.
+    """
+    for attempt in range(3):
+        if case.export_sha256 and os.path.exists(_path(case.export_sha256)):
+            return _path(case.export_sha256), case.export_sha256
+
+        content = case.translated_content
+        sha256 = content_sha256(content)
+        path = _path(sha256)
+        if not os.path.exists(path):
+            _write_atomic(path, (content or "").encode("utf-8"))
+        # Only if the text is still the one hashed: the worker may have saved
+        # a new translation (and cleared export_sha256) since it was loaded
+        unchanged = (CaseDocument.translated_content.is_(None) if content is None
+                     else CaseDocument.translated_content == content)
+        recorded = db.query(CaseDocument).filter(
+            CaseDocument.id == case.id,
+            or_(CaseDocument.export_sha256.is_(None), CaseDocument.export_sha256 == sha256),
+            unchanged,
+        ).update({CaseDocument.export_sha256: sha256}, synchronize_session=False)
+        db.commit()
+        db.refresh(case)
+        if recorded or attempt == 2:
+            # (Still changing after three tries: this snapshot is sent unrecorded)
+            return path, sha256
+        # Export the new text instead; the file just written may belong to no case now
+        release_export(db, sha256)
+
+
+def gzip_path(sha256: str) -> Optional[str]:
+    """Pre-compressed copy of an export, created on first request."""
+    path = _path(sha256, gzipped=True)
+    if not os.path.exists(path):
+        source = _path(sha256)
+        if not os.path.exists(source):
+            return None
+        with open(source, "rb") as f:
+            _write_atomic(path, gzip.compress(f.read(), compresslevel=6, mtime=0))
+    return path
+
+
+def replace_content(case: CaseDocument, text: str) -> set:
+    """
+    Set a case's translated text and clear its export. Returns the hashes of
+    the exports it may have used, to release_export() after the commit (the
+    recorded one, and the file of the old text in case a download is just
+    recording it).
+    """
+    stale = {case.export_sha256, content_sha256(case.translated_content)} - {None}
+    case.translated_content = text
+    case.export_sha256 = None
+    return stale
+
+
+def release_export(db: Session, sha256: Optional[str]):
+    """Remove an export's files once no case points at it any more."""
+    if not sha256:
+        return
+    if db.query(CaseDocument.id).filter(CaseDocument.export_sha256 == sha256).first():
+        return
+    for path in (_path(sha256), _path(sha256, gzipped=True)):
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,188 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.chat import ChatSession, ChatMessage
+from services.ai_service import ai_service, build_system_prompt, AIServiceError
+from services import passage_index
+from services.statute_map import statute_map
+
+# Rough size of a Mixtral token for mostly-English legal text. Only used for
+# budgeting, so being a little pessimistic is fine.
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+# When folding, summarise until the unfolded tail fits in this share of the
+# budget, so the summary is refreshed every few turns rather than every turn.
+FOLD_TARGET_RATIO = 0.5
+
+_folding_sessions = set()
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def _capped(content: str) -> str:
+    cap_chars = settings.CHAT_MESSAGE_TOKEN_CAP * CHARS_PER_TOKEN
+    content = content or ""
+    if len(content) > cap_chars:
+        return content[:cap_chars] + "...[truncated]"
+    return content
+
+
+def _unfolded_messages(db: Session, session: ChatSession):
+    query = db.query(ChatMessage).filter(ChatMessage.session_id == session.id)
+    if session.summary_upto_id:
+        query = query.filter(ChatMessage.id > session.summary_upto_id)
+    return query.order_by(ChatMessage.id.asc()).all()
+
+
+def _split_tail(messages, budget: int):
+    """Return (older, recent) where recent is the longest suffix that fits in budget."""
+    used = 0
+    start = len(messages)
+    while start > 0:
+        cost = estimate_tokens(_capped(messages[start - 1].content))
+        # The newest message is always sent, however large
+        if used + cost > budget and start < len(messages):
+            break
+        used += cost
+        start -= 1
+    return messages[:start], messages[start:]
+
+
+def _document_excerpts(db: Session, session: ChatSession, messages) -> str:
+    """Passages of the session's uploaded documents relevant to the latest user question."""
+    question = next((m.content for m in reversed(messages) if m.role == "user"), None)
+    if not question:
+        return ""
+    budget = settings.RAG_CONTEXT_TOKEN_BUDGET
+    blocks = []
+    for passage in passage_index.retrieve(db, session.id, question):
+        block = f"[{passage.document_name}, passage {passage.passage_index + 1}]\n{passage.content}"
+        cost = estimate_tokens(block)
+        if cost > budget:
+            break
+        blocks.append(block)
+        budget -= cost
+    if not blocks:
+        return ""
+    return "\n\n**Relevant excerpts from documents uploaded in this conversation:**\n\n" + "\n\n".join(blocks)
+
+
+def build_context(db: Session, session: ChatSession):
+    """
+    Build the message list for the next completion within CHAT_CONTEXT_TOKEN_BUDGET.
+
+    Turns already folded into session.summary are replaced by that summary; the
+    newest unfolded turns are added until the budget is spent. Passages of
+    uploaded documents that match the latest question go into the system
+    message, and the latest question gets the old/new counterparts of any
+    sections it cites. Returns (messages, needs_fold) where needs_fold means some
+    unfolded turns did not fit and refresh_summary should be run.
+    """
+    system_content = build_system_prompt()
+    if session.summary:
+        system_content += f"\n\n**Summary of the earlier conversation:**\n{session.summary}"
+
+    unfolded = _unfolded_messages(db, session)
+    system_content += _document_excerpts(db, session, unfolded)
+
+    budget = settings.CHAT_CONTEXT_TOKEN_BUDGET - estimate_tokens(system_content)
+    older, recent = _split_tail(unfolded, budget)
+
+    messages = [{"role": "system", "content": system_content}]
+    messages += [{"role": m.role, "content": _capped(m.content)} for m in recent]
+    if messages[-1]["role"] == "user":
+        # Give the model the verified old/new section mapping for what the user cited
+        messages[-1]["content"] += statute_map.annotate_question(messages[-1]["content"])
+    return messages, bool(older)
+
+
+def _summary_prompt(previous_summary, messages):
+    transcript = "\n\n".join(f"{m.role.upper()}: {_capped(m.content)}" for m in messages)
+    return [{
+        "role": "user",
+        "content": (
+            "You maintain a running summary of a conversation between a user and a Legal AI Assistant "
+            "for Indian law. Update the summary with the new turns below. Keep facts, parties, dates, "
+            "statute sections, documents referred to and any open questions; drop pleasantries. "
+            "Return ONLY the updated summary.\n\n"
+            f"--- CURRENT SUMMARY ---\n{previous_summary or '(none)'}\n\n"
+            f"--- NEW TURNS ---\n{transcript}"
+        ),
+    }]
+
+
+async def refresh_summary(session_id: int):
+    """
+    Fold the oldest unfolded turns of a session into its stored summary.
+    Meant to run after the reply has been sent (BackgroundTask); a failed
+    summary call leaves the session untouched and is retried next turn.
+    """
+    if session_id in _folding_sessions:
+        return
+    _folding_sessions.add(session_id)
+    try:
+        plan = await run_in_threadpool(_plan_fold, session_id)
+        while plan:
+            previous_summary, upto_id, batch = plan
+            try:
+                summary = await ai_service.acomplete(
+                    _summary_prompt(previous_summary, batch),
+                    max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+                )
+            except AIServiceError as e:
+                print(f"Chat summary update failed for session {session_id}: {e}")
+                return
+            stored = await run_in_threadpool(_store_summary, session_id, upto_id, batch[-1].id, summary.strip())
+            if not stored:
+                return
+            plan = await run_in_threadpool(_plan_fold, session_id)
+    finally:
+        _folding_sessions.discard(session_id)
+
+
+def _plan_fold(session_id: int):
+    """Pick the next batch of turns to fold, or None if the unfolded tail is small enough."""
+    db = SessionLocal()
+    try:
+        session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
+        if not session:
+            return None
+        target = int(settings.CHAT_CONTEXT_TOKEN_BUDGET * FOLD_TARGET_RATIO)
+        older, _ = _split_tail(_unfolded_messages(db, session), target)
+        if not older:
+            return None
+        # Cap a single summarisation call so a long backlog is folded over several passes
+        batch, used = [], 0
+        for m in older:
+            cost = estimate_tokens(_capped(m.content))
+            if batch and used + cost > settings.CHAT_SUMMARY_INPUT_TOKENS:
+                break
+            batch.append(m)
+            used += cost
+        db.expunge_all()
+        return session.summary, session.summary_upto_id, batch
+    finally:
+        db.close()
+
+
+def _store_summary(session_id: int, expected_upto_id, new_upto_id: int, summary: str) -> bool:
+    """Compare-and-set so a concurrent fold from another worker is not overwritten."""
+    db = SessionLocal()
+    try:
+        query = db.query(ChatSession).filter(ChatSession.id == session_id)
+        if expected_upto_id is None:
+            query = query.filter(ChatSession.summary_upto_id.is_(None))
+        else:
+            query = query.filter(ChatSession.summary_upto_id == expected_upto_id)
+        updated = query.update(
+            {ChatSession.summary: summary, ChatSession.summary_upto_id: new_upto_id},
+            synchronize_session=False,
+        )
+        db.commit()
+        return updated == 1
+    finally:
+        db.close()
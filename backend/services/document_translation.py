@@ -0,0 +1,175 @@
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from config import settings
+from services.ai_service import ai_service, AIServiceError
+
+# Split on the coarsest boundary that works: paragraphs, then lines, then sentences
+_BOUNDARIES = [
+    re.compile(r"\n\s*\n"),
+    re.compile(r"\n"),
+    re.compile(r"(?<=[.!?;:।])\s+"),
+]
+
+
+class ChunkTranslationError(Exception):
+    """Raised when some chunks still failed after their retries; the rest are done."""
+
+    def __init__(self, failed: Dict[int, Exception]):
+        self.failed = failed
+        first = next(iter(failed.values()))
+        super().__init__(f"{len(failed)} chunk(s) failed to translate (e.g. chunk {next(iter(failed))}: {first})")
+
+
+class TranslationCancelled(Exception):
+    """Raised when the cancel event was set; chunks not started by then were skipped."""
+
+
+def _pieces(text: str, boundary: re.Pattern) -> List[str]:
+    """Cut text after each boundary match, keeping the separator on the left piece."""
+    pieces, start = [], 0
+    for match in boundary.finditer(text):
+        pieces.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        pieces.append(text[start:])
+    return pieces
+
+
+def _hard_split(text: str, max_chars: int) -> List[str]:
+    chunks = []
+    while len(text) > max_chars:
+        cut = text.rfind(" ", 0, max_chars)
+        cut = cut + 1 if cut > max_chars // 2 else max_chars
+        chunks.append(text[:cut])
+        text = text[cut:]
+    if text:
+        chunks.append(text)
+    return chunks
+
+
+def split_into_chunks(text: str, max_chars: int, level: int = 0) -> List[str]:
+    """
+    Split text into chunks of at most max_chars, breaking on paragraph
+    boundaries where possible and only falling back to line, sentence and
+    finally word boundaries for oversized pieces. Concatenating the chunks
+    gives back the original text.
+    """
+    if len(text) <= max_chars:
+        return [text] if text else []
+    if level >= len(_BOUNDARIES):
+        return _hard_split(text, max_chars)
+
+    chunks, current = [], ""
+    for piece in _pieces(text, _BOUNDARIES[level]):
+        if len(piece) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(split_into_chunks(piece, max_chars, level + 1))
+        elif len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current += piece
+    if current:
+        chunks.append(current)
+    if level == 0:
+        # Fold whitespace-only leftovers (trailing separators) into the previous chunk
+        merged = []
+        for chunk in chunks:
+            if merged and not chunk.strip():
+                merged[-1] += chunk
+            else:
+                merged.append(chunk)
+        chunks = merged
+    return chunks
+
+
+def _translation_prompt(chunk: str, target_language: str):
+    prompt = (
+        f"Translate the following legal document text into {target_language}. "
+        f"Preserve all legal terminology, paragraph structure, and formatting. "
+        f"Return ONLY the translated text, nothing else.\n\n"
+        f"--- TEXT TO TRANSLATE ---\n{chunk}"
+    )
+    return [{"role": "user", "content": prompt}]
+
+
+def translate_chunk(chunk: str, target_language: str) -> str:
+    """
+    Translate one chunk, retrying it on its own. Transient HTTP errors are
+    already retried by the AI client; this also covers an open circuit or a
+    full queue, which clear after a short wait.
+    """
+    body = chunk.strip()
+    if not body:
+        return chunk
+    trailing = chunk[len(chunk.rstrip()):]
+    attempts = settings.TRANSLATION_CHUNK_ATTEMPTS
+    for attempt in range(attempts):
+        try:
+            return ai_service.complete(_translation_prompt(body, target_language), max_tokens=3000).strip() + trailing
+        except AIServiceError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(settings.TRANSLATION_RETRY_DELAY * (2 ** attempt))
+
+
+def translate_chunks(
+    chunks: List[str],
+    target_language: str,
+    completed: Optional[Dict[int, str]] = None,
+    on_chunk_done: Optional[Callable[[int, str], None]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> List[str]:
+    """
+    Translate chunks concurrently (at most TRANSLATION_CONCURRENCY at a time)
+    and return them in their original order. Chunks already in `completed`
+    are skipped. on_chunk_done(index, text) is called from the calling thread
+    as each chunk finishes. If any chunk still fails, the others are finished
+    first and ChunkTranslationError lists the failures. Once `cancel` is set
+    no further chunk is started and TranslationCancelled is raised.
+    """
+    results = dict(completed or {})
+    pending = iter([i for i in range(len(chunks)) if i not in results])
+    failed = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.TRANSLATION_CONCURRENCY)) as pool:
+        # A chunk is only submitted when a slot frees up, so cancelling stops the rest from starting
+        running = {}
+
+        def submit_next():
+            index = next(pending, None)
+            if index is not None and not (cancel is not None and cancel.is_set()):
+                running[pool.submit(translate_chunk, chunks[index], target_language)] = index
+
+        for _ in range(max(1, settings.TRANSLATION_CONCURRENCY)):
+            submit_next()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    failed[index] = e
+                else:
+                    if on_chunk_done:
+                        on_chunk_done(index, results[index])
+                submit_next()
+
+    if cancel is not None and cancel.is_set():
+        raise TranslationCancelled()
+    if failed:
+        raise ChunkTranslationError(dict(sorted(failed.items())))
+    return [results[i] for i in range(len(chunks))]
+
+
+def translate_text_via_ai(text: str, target_language: str) -> str:
+    """Use Together AI to translate the extracted text."""
+    chunks = split_into_chunks(text, settings.TRANSLATION_CHUNK_CHARS)
+    return "".join(translate_chunks(chunks, target_language))
@@ -0,0 +1,85 @@
+from html.parser import HTMLParser
+from typing import List, Optional, Pattern, Tuple
+
+from bs4.dammit import UnicodeDammit
+
+
+def decode_html(html) -> str:
+    """Decode a response body the way BeautifulSoup would (declared charset, then sniffing)."""
+    if isinstance(html, str):
+        return html
+    try:
+        return html.decode("utf-8")
+    except UnicodeDecodeError:
+        return UnicodeDammit(html, is_html=True).unicode_markup
+
+
+class AnchorCollector(HTMLParser):
+    """
+    Streaming pass over a page that keeps only the <a> elements we care about,
+    without building a tree. Each hit is (href, strings) where strings are the
+    anchor's text nodes in order, entities already decoded.
+
+    href_pattern: only anchors whose href matches (re.search).
+    container: (tag, css_class) — only anchors inside such an element, and
+    only the first one per element (e.g. ('div', 'result_title')).
+    """
+
+    def __init__(self, href_pattern: Optional[Pattern] = None, container: Optional[Tuple[str, str]] = None):
+        super().__init__(convert_charrefs=True)
+        self.href_pattern = href_pattern
+        self.container = container
+        self.anchors: List[Tuple[str, List[str]]] = []
+        self._current = None
+        self._container_depth = 0  # open container-tag elements since entering the container
+        self._container_used = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.container:
+            container_tag, container_class = self.container
+            if tag == container_tag:
+                if self._container_depth:
+                    self._container_depth += 1
+                else:
+                    classes = (dict(attrs).get("class") or "").split()
+                    if container_class in classes:
+                        self._container_depth = 1
+                        self._container_used = False
+        if tag != "a":
+            return
+        self._finish()
+        if self.container:
+            if not self._container_depth or self._container_used:
+                return
+            self._container_used = True
+        href = dict(attrs).get("href")
+        if href is None or (self.href_pattern and not self.href_pattern.search(href)):
+            return
+        self._current = (href, [])
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._finish()
+        elif self.container and self._container_depth and tag == self.container[0]:
+            self._container_depth -= 1
+
+    def handle_data(self, data):
+        if self._current is not None:
+            self._current[1].append(data)
+
+    def close(self):
+        super().close()
+        self._finish()
+
+    def _finish(self):
+        if self._current is not None:
+            self.anchors.append(self._current)
+            self._current = None
+
+
+def collect_anchors(html, href_pattern: Optional[Pattern] = None,
+                    container: Optional[Tuple[str, str]] = None) -> List[Tuple[str, List[str]]]:
+    parser = AnchorCollector(href_pattern, container)
+    parser.feed(decode_html(html))
+    parser.close()
+    return parser.anchors
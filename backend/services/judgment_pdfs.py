@@ -0,0 +1,305 @@
+import asyncio
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.judgment import Judgment, JudgmentText
+from services.judgment_summaries import summary_worker
+from services.lease_queue import BackgroundWorker, LeaseQueue, first_line
+from services.pdf_extraction import extract_pdf_pages
+from services.sci_scraper import HEADERS
+from services.upstream_guard import parse_retry_after
+
+FETCHING = "fetching"
+QUEUED = "queued"
+DONE = "done"
+FAILED = "failed"
+
+TMP_DIR = os.path.join("uploaded_files", "judgments", "tmp")
+CHUNK_SIZE = 64 * 1024
+os.makedirs(TMP_DIR, exist_ok=True)
+
+# view-pdf links sometimes answer with an HTML viewer that embeds the actual file
+_EMBEDDED_PDF_RE = re.compile(r"""(?:src|href|data)\s*=\s*["']([^"']+?\.pdf(?:[?#][^"']*)?)["']""", re.I)
+
+
+class UpstreamBusy(Exception):
+    """429/503 from the host; retry no earlier than retry_after seconds."""
+
+    def __init__(self, status: int, retry_after: Optional[float]):
+        self.retry_after = retry_after
+        super().__init__(f"HTTP {status} from upstream")
+
+
+# ── Stored text ──────────────────────────────────────────────────────────────
+
+def join_pages(pages: List[str]) -> Tuple[str, List[int]]:
+    """Pages joined with "\\n", plus the offset in the result where each page starts."""
+    offsets, position = [], 0
+    for page in pages:
+        offsets.append(position)
+        position += len(page) + 1
+    return "\n".join(pages), offsets
+
+
+def page_text(row: JudgmentText, page: int) -> Optional[str]:
+    """Text of one page (1-based) of a fetched judgment, or None if out of range."""
+    offsets = json.loads(row.page_offsets or "[]")
+    if not 1 <= page <= len(offsets):
+        return None
+    start = offsets[page - 1]
+    end = offsets[page] - 1 if page < len(offsets) else len(row.text or "")
+    return (row.text or "")[start:end]
+
+
+# ── Claiming ─────────────────────────────────────────────────────────────────
+# The judgments table is the queue: a judgment without a judgment_texts row
+# has not been fetched yet. Inserting that row (primary key = judgment id)
+# claims it, and retries are claimed with a conditional UPDATE, so several
+# processes can run the pipeline against one database. The claim's
+# claimed_at is its token: results are only stored while it still holds.
+
+queue = LeaseQueue(
+    JudgmentText.judgment_id,
+    claimed_at=JudgmentText.claimed_at,
+    lease_seconds=lambda: settings.JUDGMENT_PDF_LEASE_SECONDS,
+    status=JudgmentText.status,
+    attempts=JudgmentText.attempts,
+    available_at=JudgmentText.available_at,
+    error=JudgmentText.error,
+    running=FETCHING,
+    retry_seconds=lambda: settings.JUDGMENT_PDF_RETRY_SECONDS,
+    max_attempts=lambda: settings.JUDGMENT_PDF_MAX_ATTEMPTS,
+)
+
+
+def claim_batch(db: Session, limit: int) -> List[Tuple[int, str, datetime]]:
+    """
+    Claim up to limit judgments to fetch, retries first, then the newest
+    unseen ones. Returns (judgment_id, link, claimed_at) triples.
+    """
+    now = datetime.utcnow()
+    claimed = queue.claim_next(db, limit, now)
+
+    if len(claimed) < limit:
+        unseen = (
+            db.query(Judgment.id)
+            .outerjoin(JudgmentText, JudgmentText.judgment_id == Judgment.id)
+            .filter(JudgmentText.judgment_id.is_(None))
+            .order_by(Judgment.judgment_date.desc(), Judgment.id.desc())
+            .limit(limit - len(claimed))
+            .all()
+        )
+        claimed += [row.id for row in unseen if queue.claim_new(db, row.id, now)]
+
+    if not claimed:
+        return []
+    links = dict(db.query(Judgment.id, Judgment.link).filter(Judgment.id.in_(claimed)).all())
+    return [(judgment_id, links[judgment_id], now) for judgment_id in claimed if links.get(judgment_id)]
+
+
+def _store_text(judgment_id: int, claimed_at: datetime, pdf_url: str, sha256: str, size: int,
+                pages: List[str]) -> bool:
+    text, offsets = join_pages(pages)
+    db = SessionLocal()
+    try:
+        return queue.finish(db, judgment_id, claimed_at, {
+            JudgmentText.status: DONE,
+            JudgmentText.error: None,
+            JudgmentText.pdf_url: pdf_url,
+            JudgmentText.pdf_sha256: sha256,
+            JudgmentText.pdf_size: size,
+            JudgmentText.page_count: len(pages),
+            JudgmentText.text: text,
+            JudgmentText.page_offsets: json.dumps(offsets),
+            JudgmentText.fetched_at: datetime.now(),
+        }) == 1
+    finally:
+        db.close()
+
+
+def _record_failure(judgment_id: int, claimed_at: datetime, error: str, retry_after: Optional[float] = None):
+    db = SessionLocal()
+    try:
+        queue.record_failure(db, judgment_id, claimed_at, error, retry_after)
+    finally:
+        db.close()
+
+
+# ── Downloading ──────────────────────────────────────────────────────────────
+
+class _HostLimiter:
+    """
+    Politeness per host: at most JUDGMENT_PDF_PER_HOST requests in flight and
+    request starts spaced JUDGMENT_PDF_HOST_DELAY seconds apart. The spacing
+    is remembered across batches; the semaphores belong to one event loop.
+    """
+
+    def __init__(self, next_start: Dict[str, float]):
+        self._next_start = next_start
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = urlsplit(url).netloc.lower()
+        slots = self._slots.setdefault(host, asyncio.Semaphore(settings.JUDGMENT_PDF_PER_HOST))
+        async with slots:
+            async with self._locks.setdefault(host, asyncio.Lock()):
+                wait = self._next_start.get(host, 0) - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[host] = time.monotonic() + settings.JUDGMENT_PDF_HOST_DELAY
+            yield
+
+
+async def _get_to_file(client: httpx.AsyncClient, limiter: _HostLimiter, url: str, path: str):
+    """Stream one GET into path, hashing on the way. Returns (final_url, sha256, size)."""
+    hasher = hashlib.sha256()
+    size = 0
+    async with limiter.slot(url):
+        async with client.stream("GET", url, headers=HEADERS, timeout=settings.JUDGMENT_PDF_TIMEOUT) as response:
+            if response.status_code in (429, 503):
+                raise UpstreamBusy(response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+            response.raise_for_status()
+            with open(path, "wb") as out:
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > settings.JUDGMENT_PDF_MAX_BYTES:
+                        raise ValueError(f"PDF exceeds {settings.JUDGMENT_PDF_MAX_BYTES} bytes")
+                    hasher.update(chunk)
+                    out.write(chunk)
+            return str(response.url), hasher.hexdigest(), size
+
+
+async def download_pdf(client: httpx.AsyncClient, limiter: _HostLimiter, url: str, path: str):
+    """Download the judgment PDF behind url into path, following one HTML viewer page if needed."""
+    final_url, sha256, size = await _get_to_file(client, limiter, url, path)
+    with open(path, "rb") as f:
+        head = f.read(1024)
+    if head.lstrip().startswith(b"%PDF"):
+        return final_url, sha256, size
+    with open(path, "rb") as f:
+        match = _EMBEDDED_PDF_RE.search(f.read().decode("utf-8", "replace"))
+    if not match:
+        raise ValueError("Response is neither a PDF nor a page embedding one")
+    pdf_url = urljoin(final_url, html.unescape(match.group(1)))
+    final_url, sha256, size = await _get_to_file(client, limiter, pdf_url, path)
+    with open(path, "rb") as f:
+        if not f.read(1024).lstrip().startswith(b"%PDF"):
+            raise ValueError(f"Embedded link {pdf_url} is not a PDF")
+    return final_url, sha256, size
+
+
+# ── Pipeline ─────────────────────────────────────────────────────────────────
+
+class JudgmentPdfPipeline(BackgroundWorker):
+    """
+    Background thread that downloads the PDFs of newly archived judgments and
+    stores their text with page offsets (judgment_texts), so they open
+    without a round trip to sci.gov.in and are full-text searchable.
+    Downloads run concurrently (JUDGMENT_PDF_CONCURRENCY) within per-host
+    limits; text extraction uses the pdfplumber path of uploaded cases.
+    """
+
+    thread_name = "judgment-pdf-prefetch"
+
+    def __init__(self):
+        super().__init__()
+        self._next_start: Dict[str, float] = {}
+        self.fetched = 0
+        self.failures = 0
+        self.bytes = 0
+        self.last_error = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = []
+            db = SessionLocal()
+            try:
+                batch = claim_batch(db, settings.JUDGMENT_PDF_BATCH)
+            except Exception as e:
+                print(f"Judgment PDF claim error: {e}")
+            finally:
+                db.close()
+
+            if batch:
+                asyncio.run(self.run_batch(batch))
+                continue
+            # Also woken by notify() when new judgments are archived
+            self._sleep(settings.JUDGMENT_PDF_POLL_SECONDS)
+
+    async def run_batch(self, batch: List[Tuple[int, str, datetime]]):
+        limiter = _HostLimiter(self._next_start)
+        downloads = asyncio.Semaphore(settings.JUDGMENT_PDF_CONCURRENCY)
+        # One extraction at a time: long PDFs already fan out over the extraction process pool
+        extraction = asyncio.Lock()
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            await asyncio.gather(*(
+                self._fetch_one(client, limiter, downloads, extraction, judgment_id, link, claimed_at)
+                for judgment_id, link, claimed_at in batch
+            ))
+
+    async def _fetch_one(self, client, limiter, downloads, extraction, judgment_id: int, link: str,
+                         claimed_at: datetime):
+        fd, path = tempfile.mkstemp(dir=TMP_DIR, suffix=".pdf")
+        os.close(fd)
+        try:
+            async with downloads:
+                pdf_url, sha256, size = await download_pdf(client, limiter, link, path)
+            async with extraction:
+                pages = await asyncio.to_thread(extract_pdf_pages, path)
+            if not await asyncio.to_thread(_store_text, judgment_id, claimed_at, pdf_url, sha256, size, pages):
+                print(f"Judgment PDF for judgment {judgment_id} was claimed again meanwhile; result discarded")
+                return
+            summary_worker.notify()
+            self.fetched += 1
+            self.bytes += size
+        except Exception as e:
+            error = first_line(e)
+            self.failures += 1
+            self.last_error = f"judgment {judgment_id}: {error}"
+            print(f"Judgment PDF fetch failed for judgment {judgment_id} ({link}): {error}")
+            await asyncio.to_thread(_record_failure, judgment_id, claimed_at, error, getattr(e, "retry_after", None))
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def stats(self) -> dict:
+        db = SessionLocal()
+        try:
+            by_status = dict(db.query(JudgmentText.status, func.count()).group_by(JudgmentText.status).all())
+            unseen = (
+                db.query(func.count(Judgment.id))
+                .outerjoin(JudgmentText, JudgmentText.judgment_id == Judgment.id)
+                .filter(JudgmentText.judgment_id.is_(None))
+                .scalar()
+            )
+        finally:
+            db.close()
+        return {
+            "running": self.running,
+            "pending": unseen + by_status.get(QUEUED, 0),
+            "by_status": by_status,
+            "fetched": self.fetched,
+            "failures": self.failures,
+            "bytes": self.bytes,
+            "last_error": self.last_error,
+        }
+
+
+pdf_pipeline = JudgmentPdfPipeline()
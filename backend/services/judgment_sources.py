@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+from config import settings
+from services import sci_scraper, scraper_service
+
+
+def judgment_id(link: str) -> str:
+    """Stable across processes and restarts: derived from the judgment's canonical link."""
+    return hashlib.sha256(link.encode("utf-8")).hexdigest()[:16]
+
+
+_VERSUS_RE = re.compile(r"\b(?:versus|vs|v)\b\.?", re.I)
+_NOISE_WORDS = {"and", "ors", "anr", "others", "another", "the", "m", "s", "smt", "shri", "sri"}
+
+
+def dedup_key(item: dict) -> tuple:
+    """
+    (parties, date) with case, punctuation and 'vs.'/'versus'/'& Ors.' spellings
+    normalised, so the same judgment listed by two sources gets the same key.
+    """
+    title = _VERSUS_RE.sub(" vs ", item["title"].lower().replace("&", " and "))
+    words = [w for w in re.findall(r"[a-z0-9]+", title) if w not in _NOISE_WORDS]
+    return " ".join(words), item["date"]
+
+
+class FetchResult:
+    def __init__(self, status: int, items: Optional[List[dict]], etag=None, last_modified=None):
+        self.status = status          # 200, or 304 when the source's page has not changed
+        self.items = items            # None on 304
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class JudgmentSource:
+    """
+    One upstream listing of judgments. Subclasses set name/url and implement
+    parse(content) → [{title, text, link, date, category}]. fetch() does a
+    conditional GET and parses off the event loop, so a slow or large page
+    from one source does not hold up the others.
+    """
+
+    name = ""
+    url = ""
+    headers: Dict[str, str] = {}
+    archive = False  # whether parsed pages feed the judgments archive
+
+    def __init__(self, timeout: float, url: Optional[str] = None):
+        self.timeout = timeout
+        if url:
+            self.url = url
+
+    def parse(self, content: bytes) -> List[dict]:
+        raise NotImplementedError
+
+    async def fetch(self, client: httpx.AsyncClient, etag=None, last_modified=None) -> FetchResult:
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = await client.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return FetchResult(304, None, etag, last_modified)
+        response.raise_for_status()
+        items = await asyncio.to_thread(self.parse, response.content)
+        return FetchResult(response.status_code, items,
+                           response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+
+class SCISource(JudgmentSource):
+    name = "sci_live"  # also the feed_snapshots key used before sources were pluggable
+    url = sci_scraper.SCI_URL
+    headers = sci_scraper.HEADERS
+    archive = True
+
+    def parse(self, content):
+        return sci_scraper.parse_judgments(content)
+
+
+class IndianKanoonSource(JudgmentSource):
+    name = "indiankanoon"
+    url = scraper_service.SEARCH_URL
+    headers = scraper_service.HEADERS
+
+    def parse(self, content):
+        judgments = []
+        today = datetime.now()
+        for result in scraper_service.parse_sc_judgments(content):
+            title, date = scraper_service.split_title_date(result["title"])
+            judgments.append({
+                "title": title,
+                "text": result["title"],
+                "link": result["link"],
+                # The results are sorted by most recent; undated ones are taken as today's
+                "date": (date or today).strftime("%Y-%m-%d"),
+                "category": sci_scraper.categorize(result["title"]),
+            })
+        return judgments
+
+
+SOURCES = {
+    "sci": lambda: SCISource(settings.JUDGMENTS_FETCH_TIMEOUT, settings.JUDGMENTS_SCI_URL),
+    "indiankanoon": lambda: IndianKanoonSource(settings.JUDGMENTS_INDIANKANOON_TIMEOUT,
+                                               settings.JUDGMENTS_INDIANKANOON_URL),
+}
+
+
+def configured_sources() -> List[JudgmentSource]:
+    """Sources named in JUDGMENTS_SOURCES, in priority order (earlier wins when merging)."""
+    sources = []
+    for name in settings.JUDGMENTS_SOURCES.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in SOURCES:
+            print(f"Unknown judgments source ignored: {name}")
+            continue
+        sources.append(SOURCES[name]())
+    return sources
+
+
+def merge_judgments(per_source: List[tuple]) -> List[dict]:
+    """
+    Merge [(source_name, items)] given in priority order into one list, newest
+    first. A judgment listed by several sources appears once, as the
+    highest-priority source has it, with every source named in "sources".
+    """
+    merged = []
+    by_key = {}
+    for source_name, items in per_source:
+        for item in items:
+            key = dedup_key(item)
+            existing = by_key.get(key)
+            if existing is not None and source_name not in existing["sources"]:
+                existing["sources"].append(source_name)
+                continue
+            judgment = dict(item, id=judgment_id(item["link"]), sources=[source_name])
+            by_key.setdefault(key, judgment)
+            merged.append(judgment)
+    # Stable sort keeps page order (and source priority) within a day
+    merged.sort(key=lambda j: j["date"], reverse=True)
+    return merged
@@ -0,0 +1,267 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.judgment import Judgment, JudgmentText, JudgmentSummary
+from services.ai_service import ai_service, AIServiceError
+from services.lease_queue import BackgroundWorker, LeaseQueue, first_line
+
+# Bump whenever _summary_prompt changes: stored summaries of an older version
+# (or of another TOGETHER_MODEL) are regenerated in the background.
+PROMPT_VERSION = "v1"
+
+RUNNING = "running"
+QUEUED = "queued"
+DONE = "done"
+FAILED = "failed"
+
+
+def current_version():
+    return PROMPT_VERSION, settings.TOGETHER_MODEL
+
+
+def _summary_prompt(judgment: Judgment, text: str):
+    limit = settings.JUDGMENT_SUMMARY_INPUT_CHARS
+    if len(text) > limit:
+        # Facts and issues come first in a judgment, the holding and order last
+        head = text[:limit * 2 // 3]
+        tail = text[-(limit - len(head)):]
+        text = f"{head}\n\n[... middle of the judgment omitted ...]\n\n{tail}"
+    return [{
+        "role": "user",
+        "content": (
+            "Summarise the following judgment of the Supreme Court of India for a legal professional. "
+            "In at most 200 words cover: the parties, the question(s) of law, the statutes and sections "
+            "relied on, the Court's reasoning and holding, and the final order. Do not add anything that "
+            "is not in the text. Return ONLY the summary.\n\n"
+            f"--- {judgment.title} ({judgment.judgment_date}) ---\n{text}"
+        ),
+    }]
+
+
+def get_summary(db: Session, judgment_id: int) -> Optional[dict]:
+    """Stored summary of a judgment; "current" is False while an outdated version awaits regeneration."""
+    row = db.query(JudgmentSummary).filter(JudgmentSummary.judgment_id == judgment_id).first()
+    if row is None:
+        return None
+    return {
+        "status": row.status,
+        "summary": row.summary,
+        "prompt_version": row.prompt_version,
+        "model": row.model,
+        "current": row.summary is not None and (row.prompt_version, row.model) == current_version(),
+        "generated_at": row.generated_at,
+        "error": row.error if row.status == FAILED else None,
+    }
+
+
+# ── Claiming ─────────────────────────────────────────────────────────────────
+# A judgment gets a summary row once its PDF text is stored (judgment_texts
+# done); inserting the row claims it. Retries, abandoned claims and outdated
+# versions are claimed with a conditional UPDATE, as for translation jobs.
+
+def invalidate_outdated(db: Session) -> int:
+    """Queue every summary produced by another prompt version or model for regeneration."""
+    version, model = current_version()
+    updated = db.query(JudgmentSummary).filter(
+        JudgmentSummary.status.in_([DONE, FAILED]),
+        or_(JudgmentSummary.prompt_version != version, JudgmentSummary.model != model),
+    ).update(
+        {JudgmentSummary.status: QUEUED, JudgmentSummary.attempts: 0, JudgmentSummary.available_at: datetime.utcnow()},
+        synchronize_session=False,
+    )
+    db.commit()
+    return updated
+
+
+queue = LeaseQueue(
+    JudgmentSummary.judgment_id,
+    claimed_at=JudgmentSummary.claimed_at,
+    lease_seconds=lambda: settings.JUDGMENT_SUMMARY_LEASE_SECONDS,
+    status=JudgmentSummary.status,
+    attempts=JudgmentSummary.attempts,
+    available_at=JudgmentSummary.available_at,
+    error=JudgmentSummary.error,
+    retry_seconds=lambda: settings.JUDGMENT_SUMMARY_RETRY_SECONDS,
+    max_attempts=lambda: settings.JUDGMENT_SUMMARY_MAX_ATTEMPTS,
+)
+
+
+def claim_batch(db: Session, limit: int) -> List[tuple]:
+    """Claim up to limit judgments to summarise: (judgment_id, claimed_at) pairs."""
+    now = datetime.utcnow()
+    claimed = queue.claim_next(db, limit, now)
+
+    if len(claimed) < limit:
+        version, model = current_version()
+        fresh = (
+            db.query(JudgmentText.judgment_id)
+            .join(Judgment, Judgment.id == JudgmentText.judgment_id)
+            .outerjoin(JudgmentSummary, JudgmentSummary.judgment_id == JudgmentText.judgment_id)
+            .filter(JudgmentText.status == "done", JudgmentSummary.judgment_id.is_(None))  # judgment_pdfs.DONE
+            .order_by(Judgment.judgment_date.desc(), Judgment.id.desc())
+            .limit(limit - len(claimed))
+            .all()
+        )
+        claimed += [
+            row.judgment_id for row in fresh
+            if queue.claim_new(db, row.judgment_id, now, prompt_version=version, model=model)
+        ]
+    return [(judgment_id, now) for judgment_id in claimed]
+
+
+# ── Processing ───────────────────────────────────────────────────────────────
+
+class _Pacer:
+    """Spaces calls evenly to stay under JUDGMENT_SUMMARY_PER_MINUTE across all worker threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self, stop: threading.Event) -> bool:
+        interval = 60.0 / max(1, settings.JUDGMENT_SUMMARY_PER_MINUTE)
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + interval
+        return not stop.wait(start - now) if start > now else not stop.is_set()
+
+
+def _finish(db: Session, judgment_id: int, claimed_at: datetime, values: dict) -> bool:
+    """Write the outcome only if the claim is still ours (it may have been taken over after a stall)."""
+    return queue.finish(db, judgment_id, claimed_at, values) == 1
+
+
+def summarise(judgment_id: int, claimed_at: datetime, pacer: _Pacer, stop: threading.Event) -> bool:
+    """Generate and store the summary of one claimed judgment. Returns True on success."""
+    db = SessionLocal()
+    try:
+        judgment = db.query(Judgment).filter(Judgment.id == judgment_id).first()
+        text_row = db.query(JudgmentText).filter(JudgmentText.judgment_id == judgment_id).first()
+        text = (text_row.text or "").strip() if text_row else ""
+        if judgment is None or not text:
+            # Scanned PDFs have no text layer; nothing to summarise
+            version, model = current_version()
+            _finish(db, judgment_id, claimed_at, {JudgmentSummary.status: FAILED,
+                                                  JudgmentSummary.prompt_version: version,
+                                                  JudgmentSummary.model: model,
+                                                  JudgmentSummary.error: "No text extracted from the PDF"})
+            return False
+        if not pacer.wait(stop):
+            # Shutting down: hand the claim back
+            queue.release(db, judgment_id, claimed_at)
+            return False
+
+        version, model = current_version()
+        try:
+            # Stored permanently below, so the response cache would only duplicate it
+            summary = ai_service.complete(_summary_prompt(judgment, text),
+                                          max_tokens=settings.JUDGMENT_SUMMARY_MAX_TOKENS, use_cache=False)
+        except AIServiceError as e:
+            print(f"Judgment summary failed for judgment {judgment_id}: {e}")
+            queue.record_failure(db, judgment_id, claimed_at, first_line(e))
+            return False
+        if not _finish(db, judgment_id, claimed_at, {
+            JudgmentSummary.status: DONE,
+            JudgmentSummary.summary: summary.strip(),
+            JudgmentSummary.prompt_version: version,
+            JudgmentSummary.model: model,
+            JudgmentSummary.error: None,
+            JudgmentSummary.generated_at: datetime.utcnow(),
+        }):
+            print(f"Judgment summary for judgment {judgment_id} was claimed again meanwhile; result discarded")
+            return False
+        return True
+    except Exception as e:
+        print(f"Judgment summary error for judgment {judgment_id}: {e}")
+        db.rollback()
+        queue.record_failure(db, judgment_id, claimed_at, first_line(e))
+        return False
+    finally:
+        db.close()
+
+
+# ── Worker ───────────────────────────────────────────────────────────────────
+
+class JudgmentSummaryWorker(BackgroundWorker):
+    """
+    Background thread that summarises judgments as soon as their PDF text is
+    stored, so viewing a summary is a database read. Claims batches of
+    JUDGMENT_SUMMARY_BATCH and runs them JUDGMENT_SUMMARY_CONCURRENCY at a
+    time, paced to JUDGMENT_SUMMARY_PER_MINUTE; every call also goes through
+    the AI client's adaptive limiter and circuit breaker, so it yields to
+    interactive traffic when Together pushes back.
+    """
+
+    thread_name = "judgment-summaries"
+
+    def __init__(self):
+        super().__init__()
+        self._pacer = _Pacer()
+        self.generated = 0
+        self.failures = 0
+
+    def _run(self):
+        db = SessionLocal()
+        try:
+            outdated = invalidate_outdated(db)
+            if outdated:
+                print(f"Regenerating {outdated} judgment summaries for prompt {PROMPT_VERSION} / {settings.TOGETHER_MODEL}")
+        except Exception as e:
+            print(f"Judgment summary invalidation error: {e}")
+        finally:
+            db.close()
+
+        with ThreadPoolExecutor(max_workers=max(1, settings.JUDGMENT_SUMMARY_CONCURRENCY)) as pool:
+            while not self._stop.is_set():
+                batch = []
+                db = SessionLocal()
+                try:
+                    batch = claim_batch(db, settings.JUDGMENT_SUMMARY_BATCH)
+                except Exception as e:
+                    print(f"Judgment summary claim error: {e}")
+                finally:
+                    db.close()
+
+                if batch:
+                    results = list(pool.map(
+                        lambda claim: summarise(claim[0], claim[1], self._pacer, self._stop), batch
+                    ))
+                    self.generated += sum(results)
+                    self.failures += len(results) - sum(results)
+                    if all(results):
+                        continue
+                    # Something failed (often the upstream): don't spin on the next batch
+                # Also woken by notify() when new judgment text is stored
+                self._sleep(settings.JUDGMENT_SUMMARY_POLL_SECONDS)
+
+    def stats(self) -> dict:
+        version, model = current_version()
+        db = SessionLocal()
+        try:
+            by_status = dict(db.query(JudgmentSummary.status, func.count()).group_by(JudgmentSummary.status).all())
+            outdated = db.query(func.count(JudgmentSummary.judgment_id)).filter(
+                or_(JudgmentSummary.prompt_version != version, JudgmentSummary.model != model)
+            ).scalar()
+        finally:
+            db.close()
+        return {
+            "running": self.running,
+            "prompt_version": version,
+            "model": model,
+            "by_status": by_status,
+            "outdated": outdated,
+            "generated": self.generated,
+            "failures": self.failures,
+        }
+
+
+summary_worker = JudgmentSummaryWorker()
@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import httpx
+
+from config import settings
+from database import SessionLocal
+from models.feed import FeedSnapshot
+from services import sci_scraper, judgments_store, judgment_sources
+from services.judgment_sources import JudgmentSource
+from services.judgment_pdfs import pdf_pipeline
+
+class _Entry:
+    """What the endpoint serves: the response body encoded once, with its ETag."""
+
+    def __init__(self, judgments: list, checked_at: Optional[float]):
+        self.body = json.dumps(judgments, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.count = len(judgments)
+        self.checked_at = checked_at  # epoch seconds of the last good upstream check
+
+
+class _SourceState:
+    """Last parsed page, HTTP validators and counters of one source."""
+
+    def __init__(self, source: JudgmentSource):
+        self.source = source
+        self.parsed = []
+        self.validators = (None, None)
+        self.checked_at = None
+        self.last_error = None
+        self.refreshes = 0
+        self.not_modified = 0
+        self.failures = 0
+
+    def due_in(self) -> float:
+        """Seconds until this source should be polled again (<= 0: now)."""
+        if self.checked_at is None:
+            return 0
+        return self.checked_at + settings.JUDGMENTS_REFRESH_SECONDS - time.time()
+
+
+class JudgmentsCache:
+    """
+    Live judgments from every configured source (JUDGMENTS_SOURCES), refreshed
+    by a background thread and served from memory. Sources are polled
+    concurrently every JUDGMENTS_REFRESH_SECONDS with If-None-Match /
+    If-Modified-Since, each under its own timeout; a failing or slow source
+    keeps its previous data and the merged list is republished as soon as
+    any source finishes. The last parsed page of each source is persisted in
+    feed_snapshots so a restart or an outage still has data to serve
+    (stale-while-revalidate).
+    """
+
+    def __init__(self, sources: Optional[List[JudgmentSource]] = None):
+        self._entry = _Entry([], None)
+        self._states = [_SourceState(source) for source in (sources or judgment_sources.configured_sources())]
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._loaded = threading.Event()
+        self._thread = None
+        self.archived = 0
+
+    # ── Serving ──────────────────────────────────────────────────────────────
+
+    def get(self) -> _Entry:
+        entry = self._entry
+        if self.is_stale(entry):
+            # Serve what we have; the refresher fetches a fresh copy in the background
+            self._wake.set()
+        return entry
+
+    def is_stale(self, entry: _Entry) -> bool:
+        return entry.checked_at is None or time.time() - entry.checked_at > settings.JUDGMENTS_REFRESH_SECONDS
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def last_error(self) -> Optional[str]:
+        errors = [f"{s.source.name}: {s.last_error}" for s in self._states if s.last_error]
+        return "; ".join(errors) or None
+
+    def wait_loaded(self, timeout: float) -> bool:
+        """Block until the first refresh (or the persisted snapshot) has filled the cache."""
+        return self._loaded.wait(timeout)
+
+    # ── Refreshing ───────────────────────────────────────────────────────────
+
+    def load_snapshot(self):
+        db = SessionLocal()
+        try:
+            snapshots = {
+                s.source: s for s in db.query(FeedSnapshot)
+                .filter(FeedSnapshot.source.in_([state.source.name for state in self._states]))
+            }
+            for state in self._states:
+                snapshot = snapshots.get(state.source.name)
+                if snapshot and snapshot.payload:
+                    state.parsed = json.loads(snapshot.payload)
+                    state.validators = (snapshot.etag, snapshot.last_modified)
+                    state.checked_at = snapshot.checked_at.timestamp() if snapshot.checked_at else None
+            if snapshots:
+                self._publish()
+        except Exception as e:
+            print(f"Judgments snapshot load error: {e}")
+        finally:
+            db.close()
+
+    def refresh(self, states: Optional[List[_SourceState]] = None):
+        """One conditional fetch of each source, concurrently; failures leave that source's data in place."""
+        asyncio.run(self._refresh_all(self._states if states is None else states))
+
+    async def _refresh_all(self, states: List[_SourceState]):
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            await asyncio.gather(*(self._refresh_source(client, state) for state in states))
+        self._loaded.set()
+
+    async def _refresh_source(self, client: httpx.AsyncClient, state: _SourceState):
+        source = state.source
+        try:
+            result = await asyncio.wait_for(source.fetch(client, *state.validators), source.timeout)
+        except Exception as e:
+            error = str(e) or f"{type(e).__name__} after {source.timeout:g}s"
+            state.failures += 1
+            state.last_error = error
+            print(f"Judgments refresh from {source.name} failed, serving cached data: {error}")
+            await asyncio.to_thread(self._save_snapshot, state, None, error)
+            return
+
+        if result.status == 304:
+            state.not_modified += 1
+        else:
+            state.refreshes += 1
+            state.parsed = result.items
+            if source.archive:
+                await asyncio.to_thread(self._archive, result.items)
+        state.validators = (result.etag, result.last_modified)
+        state.checked_at = time.time()
+        state.last_error = None
+        self._publish()
+        await asyncio.to_thread(self._save_snapshot, state, result.items)
+
+    def _archive(self, parsed: list):
+        """Add newly seen judgments to the permanent archive (judgments table)."""
+        db = SessionLocal()
+        try:
+            added = judgments_store.ingest(db, parsed)
+            self.archived += added
+            if added:
+                pdf_pipeline.notify()
+        except Exception as e:
+            print(f"Judgments archive error: {e}")
+        finally:
+            db.close()
+
+    def _publish(self):
+        with self._lock:
+            merged = judgment_sources.merge_judgments([(s.source.name, s.parsed) for s in self._states])
+            checked = [s.checked_at for s in self._states if s.checked_at is not None]
+            # The 30-day window moves with the clock, so it is re-applied on every check
+            self._entry = _Entry(sci_scraper.recent_judgments(merged), max(checked) if checked else None)
+        self._loaded.set()
+
+    def _save_snapshot(self, state: _SourceState, parsed: Optional[list], error: Optional[str] = None):
+        db = SessionLocal()
+        try:
+            snapshot = db.query(FeedSnapshot).filter(FeedSnapshot.source == state.source.name).first()
+            if snapshot is None:
+                snapshot = FeedSnapshot(source=state.source.name)
+                db.add(snapshot)
+            now = datetime.now()
+            snapshot.last_error = error
+            if error is None:
+                snapshot.checked_at = now
+                snapshot.etag, snapshot.last_modified = state.validators
+            if parsed is not None:
+                snapshot.payload = json.dumps(parsed)
+                snapshot.fetched_at = now
+            db.commit()
+        except Exception as e:
+            print(f"Judgments snapshot save error: {e}")
+        finally:
+            db.close()
+
+    # ── Background thread ────────────────────────────────────────────────────
+
+    def start(self):
+        if self._thread is not None or not self._states:
+            return
+        self.load_snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="judgments-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            due = [s for s in self._states if s.due_in() <= 0]
+            if due:
+                self.refresh(due)
+            if self.last_error:
+                # Back off after a failure; requests for stale data must not hammer upstream
+                self._stop.wait(settings.JUDGMENTS_RETRY_SECONDS)
+            else:
+                self._wake.wait(max(1, min(s.due_in() for s in self._states)))
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        entry = self._entry
+        now = time.time()
+        return {
+            "entries": entry.count,
+            "age_seconds": round(now - entry.checked_at, 1) if entry.checked_at else None,
+            "stale": self.is_stale(entry),
+            "refreshes": sum(s.refreshes for s in self._states),
+            "not_modified": sum(s.not_modified for s in self._states),
+            "failures": sum(s.failures for s in self._states),
+            "archived": self.archived,
+            "last_error": self.last_error,
+            "sources": {
+                s.source.name: {
+                    "entries": len(s.parsed),
+                    "age_seconds": round(now - s.checked_at, 1) if s.checked_at else None,
+                    "refreshes": s.refreshes,
+                    "not_modified": s.not_modified,
+                    "failures": s.failures,
+                    "last_error": s.last_error,
+                }
+                for s in self._states
+            },
+        }
+
+
+judgments_cache = JudgmentsCache()
@@ -0,0 +1,138 @@
+import base64
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.judgment import Judgment, JudgmentSummary
+from services import sci_scraper
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _key(diary_no: str, case_number: Optional[str]):
+    return diary_no, case_number or ""
+
+
+def ingest(db: Session, parsed: List[dict]) -> int:
+    """
+    Insert judgments not already stored, keyed by (diary number, case number).
+    Only the keys of this batch are looked up, so cost does not grow with the
+    archive. Returns the number of new rows.
+    """
+    rows = {}
+    for item in parsed:
+        diary_no, case_number = sci_scraper.parse_identifiers(item["text"], item["link"])
+        if not diary_no:
+            continue
+        rows.setdefault(_key(diary_no, case_number), item)
+    if not rows:
+        return 0
+
+    existing = set(
+        db.query(Judgment.diary_no, Judgment.case_number)
+        .filter(tuple_(Judgment.diary_no, Judgment.case_number).in_(list(rows)))
+        .all()
+    )
+    new = [
+        Judgment(
+            diary_no=diary_no,
+            case_number=case_number,
+            title=item["title"],
+            text=item["text"],
+            link=item["link"],
+            judgment_date=datetime.strptime(item["date"], "%Y-%m-%d").date(),
+            category=item["category"],
+        )
+        for (diary_no, case_number), item in rows.items()
+        if (diary_no, case_number) not in existing
+    ]
+    if not new:
+        return 0
+    try:
+        db.add_all(new)
+        db.commit()
+        return len(new)
+    except IntegrityError:
+        # Another process ingested part of this batch; fall back to row by row
+        db.rollback()
+        inserted = 0
+        for row in new:
+            try:
+                db.add(row)
+                db.commit()
+                inserted += 1
+            except IntegrityError:
+                db.rollback()
+        return inserted
+
+
+def encode_cursor(row: Judgment) -> str:
+    raw = f"{row.judgment_date.isoformat()}|{row.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day, row_id = raw.split("|")
+        return date.fromisoformat(day), int(row_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def list_judgments(
+    db: Session,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    category: Optional[str] = None,
+) -> dict:
+    """
+    Newest first by (judgment_date, id). The cursor is the last row of the
+    previous page, so each page is an index range scan however deep it is.
+    """
+    query = db.query(Judgment)
+    if category:
+        query = query.filter(Judgment.category == category)
+    if date_from:
+        query = query.filter(Judgment.judgment_date >= date_from)
+    if date_to:
+        query = query.filter(Judgment.judgment_date <= date_to)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            Judgment.judgment_date < last_date,
+            and_(Judgment.judgment_date == last_date, Judgment.id < last_id),
+        ))
+    rows = query.order_by(Judgment.judgment_date.desc(), Judgment.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    # Precomputed summaries (services/judgment_summaries.py), one primary-key lookup for the page
+    summaries = dict(
+        db.query(JudgmentSummary.judgment_id, JudgmentSummary.summary)
+        .filter(JudgmentSummary.judgment_id.in_([r.id for r in rows]))
+        .all()
+    ) if rows else {}
+    return {
+        "items": [
+            {
+                "id": r.id,
+                "diary_no": r.diary_no,
+                "case_number": r.case_number or None,
+                "title": r.title,
+                "text": r.text,
+                "link": r.link,
+                "date": r.judgment_date.isoformat(),
+                "category": r.category,
+                "summary": summaries.get(r.id),
+            }
+            for r in rows
+        ],
+        "next_cursor": encode_cursor(rows[-1]) if has_more else None,
+    }
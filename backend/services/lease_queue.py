@@ -0,0 +1,227 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+QUEUED = "queued"
+RUNNING = "running"
+FAILED = "failed"
+
+
+class LeaseQueue:
+    """
+    Claim → lease → retry over a table whose rows are work items, shared by
+    the background workers (translation jobs, judgment PDFs, judgment
+    summaries, schedule reminders) so their claim guards and backoff can't
+    drift apart.
+
+    A claim is a conditional UPDATE that only one worker wins, in whatever
+    process it runs. It stamps claimed_at (the lease) and returns a token:
+    the owner id when the table has an owner column, else the claimed_at
+    value itself. Every later write goes through finish(), which only
+    applies while that token still holds the row, so a worker whose lease
+    expired and was taken over can't overwrite the new owner's result.
+
+    With a status column, rows are claimable when QUEUED and available, or
+    RUNNING with a lease older than lease_seconds; failures are retried
+    with a growing delay (or the upstream's Retry-After, if longer) until
+    max_attempts. Without one, "pending" conditions select the rows and an
+    expired or missing lease makes them claimable.
+    Settings are passed as callables so they are read at claim time.
+    """
+
+    def __init__(
+        self,
+        key,
+        claimed_at,
+        lease_seconds: Callable[[], float],
+        status=None,
+        attempts=None,
+        available_at=None,
+        error=None,
+        owner=None,
+        running: str = RUNNING,
+        retry_seconds: Optional[Callable[[], float]] = None,
+        max_attempts: Optional[Callable[[], int]] = None,
+        pending: Callable[[datetime], Iterable] = lambda now: (),
+    ):
+        self.key = key
+        self.claimed_at = claimed_at
+        self.lease_seconds = lease_seconds
+        self.status = status
+        self.attempts = attempts
+        self.available_at = available_at
+        self.error = error
+        self.owner = owner
+        self.running = running
+        self.retry_seconds = retry_seconds
+        self.max_attempts = max_attempts
+        self.pending = pending
+        self.model = key.class_
+
+    # ── Claiming ─────────────────────────────────────────────────────────────
+
+    def claimable(self, now: datetime):
+        abandoned = now - timedelta(seconds=self.lease_seconds())
+        if self.status is None:
+            return and_(*self.pending(now),
+                        or_(self.claimed_at.is_(None), self.claimed_at < abandoned))
+        return and_(*self.pending(now), or_(
+            and_(self.status == QUEUED, self.available_at <= now),
+            # Claimed but not finished within a lease: that worker died or stalled
+            and_(self.status == self.running, self.claimed_at < abandoned),
+        ))
+
+    def _claim_values(self, now: datetime, owner: Optional[str]) -> dict:
+        values = {self.claimed_at: now}
+        if self.status is not None:
+            values[self.status] = self.running
+        if self.attempts is not None:
+            values[self.attempts] = self.attempts + 1
+        if self.owner is not None:
+            values[self.owner] = owner
+        return values
+
+    def token(self, now: datetime, owner: Optional[str] = None):
+        return owner if self.owner is not None else now
+
+    def claim(self, db: Session, keys: Iterable, now: datetime, owner: Optional[str] = None) -> list:
+        """Claim the given rows if still claimable, committed together. Returns the keys won."""
+        claimed = []
+        values = self._claim_values(now, owner)
+        for key in keys:
+            updated = db.query(self.model).filter(self.key == key, self.claimable(now)).update(
+                values, synchronize_session=False
+            )
+            if updated == 1:
+                claimed.append(key)
+        db.commit()
+        return claimed
+
+    def claim_next(self, db: Session, limit: int, now: datetime, owner: Optional[str] = None,
+                   order_by=None) -> list:
+        """Claim up to limit claimable rows (in order_by order, if given)."""
+        query = db.query(self.key).filter(self.claimable(now))
+        if order_by is not None:
+            query = query.order_by(order_by)
+        return self.claim(db, [row[0] for row in query.limit(limit).all()], now, owner)
+
+    def claim_new(self, db: Session, key, now: datetime, owner: Optional[str] = None, **fields) -> bool:
+        """Claim an item that has no row yet by inserting it; the primary key makes only one insert win."""
+        values = {self.key.key: key, self.claimed_at.key: now, **fields}
+        if self.status is not None:
+            values[self.status.key] = self.running
+        if self.attempts is not None:
+            values[self.attempts.key] = 1
+        if self.owner is not None:
+            values[self.owner.key] = owner
+        try:
+            db.add(self.model(**values))
+            db.commit()
+            return True
+        except IntegrityError:
+            # Claimed by another worker in the meantime
+            db.rollback()
+            return False
+
+    # ── Writing under a claim ────────────────────────────────────────────────
+
+    def _held(self, token):
+        guard = (self.owner == token) if self.owner is not None else (self.claimed_at == token)
+        if self.status is not None:
+            return and_(guard, self.status == self.running)
+        return guard
+
+    def finish(self, db: Session, keys, token, values: dict, commit: bool = True) -> int:
+        """
+        Write values to the rows still held under token; returns how many were.
+        With commit=False the caller adds its own writes and commits them
+        together (or rolls back if the claim was lost).
+        """
+        keys = keys if isinstance(keys, (list, tuple, set)) else [keys]
+        updated = db.query(self.model).filter(self.key.in_(list(keys)), self._held(token)).update(
+            values, synchronize_session=False
+        )
+        if commit:
+            db.commit()
+        return updated
+
+    def renew(self, db: Session, key, token) -> bool:
+        """Extend the lease of a long-running claim. Needs an owner column (the token must not change)."""
+        return self.finish(db, key, token, {self.claimed_at: datetime.utcnow()}) == 1
+
+    def release(self, db: Session, key, token) -> bool:
+        """Hand a claim back unprocessed (e.g. on shutdown) without spending an attempt."""
+        values = {self.status: QUEUED, self.available_at: datetime.utcnow()}
+        if self.attempts is not None:
+            values[self.attempts] = self.attempts - 1
+        return self.finish(db, key, token, values) == 1
+
+    def record_failure(self, db: Session, key, token, error: str, retry_after: Optional[float] = None,
+                       values: Optional[dict] = None) -> Optional[str]:
+        """
+        Queue a retry after max(retry_after, retry_seconds × attempts), or mark
+        the row FAILED once max_attempts is spent. Returns the new status, or
+        None if the claim was lost meanwhile (nothing is written then).
+        """
+        attempts = db.query(self.attempts).filter(self.key == key).scalar() or 0
+        values = dict(values or {})
+        if self.error is not None:
+            values[self.error] = error
+        if attempts < self.max_attempts():
+            delay = max(retry_after or 0, self.retry_seconds() * attempts)
+            values[self.status] = QUEUED
+            values[self.available_at] = datetime.utcnow() + timedelta(seconds=delay)
+        else:
+            values[self.status] = FAILED
+        if not self.finish(db, key, token, values):
+            return None
+        return values[self.status]
+
+
+class BackgroundWorker:
+    """A daemon thread that sleeps between rounds of work and can be woken early with notify()."""
+
+    thread_name = "background-worker"
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def notify(self):
+        """Wake the worker now instead of at the end of its current wait."""
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _sleep(self, seconds: float):
+        self._wake.wait(max(0.0, seconds))
+        self._wake.clear()
+
+    def _run(self):
+        raise NotImplementedError
+
+
+def first_line(error: Exception) -> str:
+    """Stored error text: the first line of the message (httpx errors run to several)."""
+    return (str(error) or type(error).__name__).splitlines()[0]
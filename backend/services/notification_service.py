@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from typing import List
 
 class NotificationService:
     def __init__(self):
@@ -13,4 +15,22 @@ class NotificationService:
         # Write to database notification table
         self.logger.info(f"System Notification for User {user_id}: {message}")
 
+    async def send_schedule_reminder(self, reminder: dict):
+        """reminder: {user_id, email, case_name, court_date}. Raises if delivery fails."""
+        when = reminder["court_date"].strftime("%d %b %Y, %H:%M UTC") if reminder["court_date"] else "soon"
+        message = f"Reminder: '{reminder['case_name']}' is scheduled for {when}."
+        await self.create_system_notification(reminder["user_id"], message)
+        if reminder["email"]:
+            await self.send_email(reminder["email"], f"Court reminder: {reminder['case_name']}", message)
+
+    async def send_schedule_reminders(self, reminders: List[dict]) -> List[bool]:
+        """Send a batch of reminders concurrently; one flag per reminder, True if it was delivered."""
+        results = await asyncio.gather(
+            *(self.send_schedule_reminder(r) for r in reminders), return_exceptions=True
+        )
+        for reminder, result in zip(reminders, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Reminder for schedule {reminder['schedule_id']} failed: {result}")
+        return [not isinstance(result, Exception) for result in results]
+
 notification_service = NotificationService()
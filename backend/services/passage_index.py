@@ -0,0 +1,151 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import List
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.passage import DocumentPassage
+from services.document_translation import split_into_chunks
+
+# BM25 parameters (the usual defaults)
+K1 = 1.5
+B = 0.75
+# Sessions whose index is kept in memory; rebuilt from the table on a miss
+CACHED_SESSIONS = 64
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "will with what which who whom how when where why can could would should shall may do does did "
+    "not no i you he she we they me my your our their there here".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words minus stopwords; numbers are kept (section and article numbers matter)."""
+    return [t for t in re.findall(r"\w+", (text or "").lower()) if t not in _STOPWORDS and (len(t) > 1 or t.isdigit())]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed set of passages. Postings are stored term-major in
+    flat NumPy arrays, so scoring a query is one vectorised update per query
+    term over just the passages that contain it.
+    """
+
+    def __init__(self, passages: List[str]):
+        self.size = len(passages)
+        self.vocab = {}
+        term_ids, doc_ids, tfs, lengths = [], [], [], []
+        for doc, text in enumerate(passages):
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                term_ids.append(self.vocab.setdefault(term, len(self.vocab)))
+                doc_ids.append(doc)
+                tfs.append(tf)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids, kind="stable")
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int64)[order]
+        self.tfs = np.asarray(tfs, dtype=np.float32)[order]
+        self.offsets = np.searchsorted(term_ids[order], np.arange(len(self.vocab) + 1))
+
+        df = np.diff(self.offsets).astype(np.float32)
+        self.idf = np.log1p((self.size - df + 0.5) / (df + 0.5))
+        doc_len = np.asarray(lengths, dtype=np.float32)
+        avg_len = float(doc_len.mean()) if self.size and doc_len.mean() > 0 else 1.0
+        self.norm = K1 * (1 - B + B * doc_len / avg_len)
+
+    def search(self, query: str, k: int) -> List[tuple]:
+        """Top-k (passage position, score) pairs with a positive score, best first."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            t = self.vocab.get(term)
+            if t is None:
+                continue
+            start, end = self.offsets[t], self.offsets[t + 1]
+            docs, tf = self.doc_ids[start:end], self.tfs[start:end]
+            scores[docs] += self.idf[t] * tf * (K1 + 1) / (tf + self.norm[docs])
+
+        hits = np.flatnonzero(scores > 0)
+        if hits.size > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(int(i), float(scores[i])) for i in hits]
+
+
+class _SessionIndex:
+    def __init__(self, version, passage_ids, index):
+        self.version = version
+        self.passage_ids = passage_ids
+        self.index = index
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def index_document(db: Session, session_id: int, document_name: str, blob_sha256: str, text: str) -> int:
+    """Split a document into passages and store them for the session; returns the passage count."""
+    existing = db.query(func.count(DocumentPassage.id)).filter(
+        DocumentPassage.session_id == session_id, DocumentPassage.blob_sha256 == blob_sha256
+    ).scalar()
+    if existing:
+        # Same file uploaded into this session again
+        return existing
+    passages = [p for p in split_into_chunks(text, settings.RAG_PASSAGE_CHARS) if p.strip()]
+    db.add_all([
+        DocumentPassage(session_id=session_id, document_name=document_name, blob_sha256=blob_sha256,
+                        passage_index=i, content=p.strip())
+        for i, p in enumerate(passages)
+    ])
+    db.commit()
+    return len(passages)
+
+
+def _session_index(db: Session, session_id: int):
+    version = db.query(func.count(DocumentPassage.id), func.max(DocumentPassage.id)).filter(
+        DocumentPassage.session_id == session_id
+    ).one()
+    if not version[0]:
+        return None
+    version = tuple(version)
+    with _cache_lock:
+        cached = _cache.get(session_id)
+        if cached and cached.version == version:
+            _cache.move_to_end(session_id)
+            return cached
+
+    rows = db.query(DocumentPassage.id, DocumentPassage.content).filter(
+        DocumentPassage.session_id == session_id
+    ).order_by(DocumentPassage.id).all()
+    built = _SessionIndex(version, [r.id for r in rows], BM25Index([r.content for r in rows]))
+    with _cache_lock:
+        _cache[session_id] = built
+        _cache.move_to_end(session_id)
+        while len(_cache) > CACHED_SESSIONS:
+            _cache.popitem(last=False)
+    return built
+
+
+def retrieve(db: Session, session_id: int, query: str, k: int = None) -> List[DocumentPassage]:
+    """The k passages of the session's documents most relevant to query, best first."""
+    session_index = _session_index(db, session_id)
+    if session_index is None:
+        return []
+    hits = session_index.index.search(query, k or settings.RAG_TOP_K)
+    if not hits:
+        return []
+    ids = [session_index.passage_ids[i] for i, _ in hits]
+    by_id = {p.id: p for p in db.query(DocumentPassage).filter(DocumentPassage.id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def delete_session_passages(db: Session, session_id: int):
+    db.query(DocumentPassage).filter(DocumentPassage.session_id == session_id).delete(synchronize_session=False)
+    with _cache_lock:
+        _cache.pop(session_id, None)
@@ -0,0 +1,88 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List
+
+import pdfplumber
+
+from config import settings
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _worker_count() -> int:
+    return settings.PDF_EXTRACT_WORKERS or os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the web process has threads (event loop, DB pool)
+                _pool = ProcessPoolExecutor(
+                    max_workers=_worker_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _extract_range(file_path: str, start: int, end: int) -> List[str]:
+    """Text of pages [start, end) — runs in a worker process or inline."""
+    texts = []
+    with pdfplumber.open(file_path, pages=list(range(start + 1, end + 1))) as pdf:
+        for page in pdf.pages:
+            texts.append(page.extract_text() or "")
+            # Drop the parsed layout so long documents don't accumulate it
+            page.close()
+    return texts
+
+
+def count_pages(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_pages(file_path: str) -> List[str]:
+    """
+    Extract text per page, in page order. Documents with at least
+    PDF_PARALLEL_PAGE_THRESHOLD pages are split into page ranges and parsed
+    across a process pool; smaller ones are parsed in-process, where pool
+    start-up and IPC would cost more than they save.
+    """
+    total = count_pages(file_path)
+    workers = _worker_count()
+    if total < settings.PDF_PARALLEL_PAGE_THRESHOLD or workers < 2:
+        return _extract_range(file_path, 0, total)
+
+    # A couple of ranges per worker evens out pages of very different density
+    per_task = max(settings.PDF_MIN_PAGES_PER_TASK, -(-total // (workers * 2)))
+    ranges = [(start, min(start + per_task, total)) for start in range(0, total, per_task)]
+    try:
+        futures = [_get_pool().submit(_extract_range, file_path, start, end) for start, end in ranges]
+        return [text for future in futures for text in future.result()]
+    except BrokenProcessPool as e:
+        print(f"PDF process pool unavailable ({e}); extracting in-process")
+        shutdown_pool()
+        return _extract_range(file_path, 0, total)
+
+
+def extract_pdf_text(file_path: str) -> str:
+    """Extract plain text from a PDF using pdfplumber."""
+    try:
+        pages = extract_pdf_pages(file_path)
+    except Exception as e:
+        print(f"PDF extraction error: {e}")
+        return ""
+    return "\n".join(text for text in pages if text).strip()
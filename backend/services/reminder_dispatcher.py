@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func
+
+from config import settings
+from database import SessionLocal
+from models.schedule import Schedule
+from models.user import User
+from services.lease_queue import BackgroundWorker, LeaseQueue
+from services.notification_service import notification_service
+
+
+def _pending(now: datetime):
+    """Unsent, enabled reminders not too overdue to send; (reminder_sent_at, reminder_date) index range."""
+    return (
+        Schedule.reminder_sent_at.is_(None),
+        Schedule.reminder_date >= now - timedelta(hours=settings.REMINDER_MAX_LATENESS_HOURS),
+        Schedule.notification_enabled.is_(True),
+    )
+
+
+# Due reminders are claimed with one conditional UPDATE each, committed
+# together. A row another worker claimed (or sent, edited or disabled) since
+# it was loaded matches no row, so every reminder is claimed by one worker only.
+queue = LeaseQueue(
+    Schedule.id,
+    claimed_at=Schedule.reminder_claimed_at,
+    lease_seconds=lambda: settings.REMINDER_LEASE_SECONDS,
+    pending=lambda now: _pending(now) + (Schedule.reminder_date <= now,),
+)
+
+
+class ReminderDispatcher(BackgroundWorker):
+    """
+    Sends schedule reminders when their reminder_date arrives. Instead of
+    polling every schedule, a range query on the (reminder_sent_at,
+    reminder_date) index loads the unsent reminders due within
+    REMINDER_LOOKAHEAD_SECONDS into a min-heap, and the thread sleeps until
+    the earliest is due. Due reminders are claimed in the database, sent in
+    batches of REMINDER_BATCH through notification_service and marked sent
+    under the same claim, so several app workers never send one twice. A
+    worker that dies after sending but before marking leaves its claim to
+    expire, after which the reminder is sent again.
+    """
+
+    thread_name = "reminder-dispatcher"
+
+    def __init__(self):
+        super().__init__()
+        self._heap = []            # (reminder_date, schedule_id), earliest first
+        self._reload = True
+        self._next_load: Optional[datetime] = None
+        self.loads = 0
+        self.sent = 0
+        self.failures = 0
+        self.lost_claims = 0       # due here but claimed elsewhere, edited or disabled meanwhile
+        self.last_error = None
+
+    def notify(self):
+        """A schedule was created or its reminder changed: reload the window now."""
+        self._reload = True
+        super().notify()
+
+    def _load(self, now: datetime):
+        horizon = now + timedelta(seconds=settings.REMINDER_LOOKAHEAD_SECONDS)
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Schedule.reminder_date, Schedule.id)
+                .filter(*_pending(now), Schedule.reminder_date <= horizon)
+                .order_by(Schedule.reminder_date, Schedule.id)
+                .limit(settings.REMINDER_HEAP_MAX)
+                .all()
+            )
+        finally:
+            db.close()
+        self._heap = [(row.reminder_date, row.id) for row in rows]  # sorted, so already a heap
+        self.loads += 1
+        if len(rows) == settings.REMINDER_HEAP_MAX:
+            # More are due in the window than fit: continue from the last one loaded
+            self._next_load = rows[-1].reminder_date
+        else:
+            # Half the window, so reminders entering it are loaded well before they fall due
+            self._next_load = now + timedelta(seconds=settings.REMINDER_LOOKAHEAD_SECONDS / 2)
+
+    def _dispatch(self, schedule_ids: List[int], now: datetime):
+        db = SessionLocal()
+        try:
+            claimed = queue.claim(db, schedule_ids, now)
+            self.lost_claims += len(schedule_ids) - len(claimed)
+            if not claimed:
+                return
+            rows = (
+                db.query(Schedule.id, Schedule.user_id, Schedule.case_name, Schedule.court_date, User.email)
+                .outerjoin(User, User.id == Schedule.user_id)
+                .filter(Schedule.id.in_(claimed))
+                .all()
+            )
+            reminders = [
+                {"schedule_id": r.id, "user_id": r.user_id, "email": r.email,
+                 "case_name": r.case_name, "court_date": r.court_date}
+                for r in rows
+            ]
+            results = asyncio.run(notification_service.send_schedule_reminders(reminders))
+            delivered = [r["schedule_id"] for r, ok in zip(reminders, results) if ok]
+            if delivered:
+                # Only under our claim: one worker marks each reminder sent
+                queue.finish(db, delivered, now, {Schedule.reminder_sent_at: datetime.utcnow()})
+            self.sent += len(delivered)
+            # Failed ones keep their claim and are retried here once it expires
+            retry_at = now + timedelta(seconds=settings.REMINDER_LEASE_SECONDS, microseconds=1)
+            for reminder, ok in zip(reminders, results):
+                if not ok:
+                    self.failures += 1
+                    heapq.heappush(self._heap, (retry_at, reminder["schedule_id"]))
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = datetime.utcnow()
+            try:
+                if self._reload or self._next_load is None or now >= self._next_load:
+                    self._reload = False
+                    self._load(now)
+
+                due = []
+                while self._heap and self._heap[0][0] <= now and len(due) < settings.REMINDER_BATCH:
+                    due.append(heapq.heappop(self._heap)[1])
+                if due:
+                    self._dispatch(due, now)
+                    continue
+            except Exception as e:
+                self.last_error = f"{datetime.utcnow().isoformat()}: {e}"
+                print(f"Reminder dispatch error: {e}")
+                self._reload = True
+                self._stop.wait(settings.REMINDER_LEASE_SECONDS / 10)
+                continue
+
+            wait = (self._next_load - now).total_seconds()
+            if self._heap:
+                wait = min(wait, (self._heap[0][0] - now).total_seconds())
+            self._sleep(wait)
+
+    def stats(self) -> dict:
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            pending = db.query(func.count(Schedule.id)).filter(*_pending(now)).scalar()
+        finally:
+            db.close()
+        heap = list(self._heap)
+        return {
+            "running": self.running,
+            "pending": pending,
+            "in_heap": len(heap),
+            "next_due": heap[0][0].isoformat() if heap else None,
+            "next_load": self._next_load.isoformat() if self._next_load else None,
+            "loads": self.loads,
+            "sent": self.sent,
+            "failures": self.failures,
+            "lost_claims": self.lost_claims,
+            "last_error": self.last_error,
+        }
+
+
+reminder_dispatcher = ReminderDispatcher()
@@ -1,24 +1,87 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime, timedelta
-import logging
-
-logger = logging.getLogger(__name__)
-
-def fetch_live_judgments():
-    url = "https://www.sci.gov.in/"
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-    except Exception as e:
-        logger.error(f"Failed to fetch SCI homepage: {e}")
-        return []
-
-    soup = BeautifulSoup(response.content, 'html.parser')
+
+from services.html_links import collect_anchors
+
+SCI_URL = "https://www.sci.gov.in/"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+WINDOW_DAYS = 30
+
+
+_VIEW_PDF_RE = re.compile(r'view-pdf')
+_DATE_RE = re.compile(r'(\d{2}-[A-Za-z]{3}-\d{4})')
+_UPLOADED_RE = re.compile(r'Uploaded On (\d{2}-\d{2}-\d{4})')
+_CRIMINAL_RE = re.compile(r'Crl\.|Criminal|SLP\(Crl\)')
+_CIVIL_RE = re.compile(r'C\.A\.|Civil|SLP\(C\)')
+
+
+def _judgment_date(text):
+    # "06-Jan-2026" first, then "Uploaded On 06-01-2026"
+    match = _DATE_RE.search(text)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%d-%b-%Y')
+        except ValueError:
+            pass
+    match = _UPLOADED_RE.search(text)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%d-%m-%Y')
+        except ValueError:
+            pass
+    return None
+
+
+def categorize(text):
+    if _CRIMINAL_RE.search(text):
+        return "Criminal"
+    if _CIVIL_RE.search(text):
+        return "Civil"
+    return "Other"
+
+
+def _judgment_fields(href, text):
+    """The judgment dict for one link, or None if its text carries no date."""
+    date_obj = _judgment_date(text)
+    if not date_obj:
+        return None
+    if not href.startswith(("http://", "https://")):
+        href = "https://www.sci.gov.in" + href
+    return {
+        "title": text.split(' - ', 1)[0],
+        "text": text,
+        "link": href,
+        "date": date_obj.strftime('%Y-%m-%d'),
+        "category": categorize(text)
+    }
+
+
+def parse_judgments(html):
+    """
+    Every dated judgment link on the homepage, in page order (no date window
+    applied). Streams the page and only looks at view-pdf anchors; gives the
+    same result as parse_judgments_tree (see benchmarks/parse_bench.py).
+    """
+    judgments = []
+    seen = set()
+    for href, strings in collect_anchors(html, _VIEW_PDF_RE):
+        text = "".join(s.strip() for s in strings)
+        if not text or href in seen:
+            continue
+        judgment = _judgment_fields(href, text)
+        if judgment is None:
+            continue
+        seen.add(href)
+        judgments.append(judgment)
+    return judgments
+
+
+def parse_judgments_tree(html):
+    """Reference parser: builds the full BeautifulSoup tree of the page."""
+    soup = BeautifulSoup(html, 'html.parser')
     
     # The judgments are in the "Latest Information" or "Judgments" section.
     # Based on the text view, they seem to be in a list under a section.
@@ -31,9 +94,6 @@ def fetch_live_judgments():
     # Find all links that look like judgment PDFs
     links = soup.find_all('a', href=re.compile(r'view-pdf'))
     
-    today = datetime.now()
-    one_month_ago = today - timedelta(days=30)
-    
     unique_links = set()
 
     for link in links:
@@ -72,14 +132,7 @@ def fetch_live_judgments():
                 except ValueError:
                     pass
         
-        # If we still don't have a date, skip or include carefully. 
-        # But user asked for specific date range.
-        if date_obj:
-            if one_month_ago <= date_obj <= today + timedelta(days=1): # +1 just in case of timezone diffs
-                 pass
-            else:
-                continue
-        else:
+        if not date_obj:
              # parsing failed, maybe not a judgment entry in that format
              continue
 
@@ -96,7 +149,7 @@ def fetch_live_judgments():
         parts = text.split(' - ')
         title = parts[0] if parts else text
         
-        if "https" not in href:
+        if not href.startswith(("http://", "https://")):
              href = "https://www.sci.gov.in" + href
 
         judgments.append({
@@ -108,3 +161,39 @@ def fetch_live_judgments():
         })
         
     return judgments
+
+
+def recent_judgments(judgments, now=None):
+    """Judgments dated within the last WINDOW_DAYS (+1 day just in case of timezone diffs)."""
+    today = now or datetime.now()
+    earliest = (today - timedelta(days=WINDOW_DAYS)).strftime('%Y-%m-%d')
+    latest = (today + timedelta(days=1)).strftime('%Y-%m-%d')
+    return [j for j in judgments if earliest <= j["date"] <= latest]
+
+
+_DIARY_RE = re.compile(r'Diary\s*(?:Number|No\.?)\s*(\d+)\s*/\s*(\d{4})', re.I)
+_DIARY_PARAM_RE = re.compile(r'diary_no=(\d+)')
+_CASE_NO_RE = re.compile(r'\bNo\.?\s*\d')
+
+
+def parse_identifiers(text, link):
+    """
+    (diary_no, case_number) from a judgment's link text, e.g.
+    "... - C.A. No. 70/2026 - Diary Number 8661 / 2024 - ..." → ("8661/2024", "C.A. No. 70/2026").
+    Falls back to the diary_no query parameter of the PDF link; either may be None.
+    """
+    diary_no = None
+    match = _DIARY_RE.search(text or "")
+    if match:
+        diary_no = f"{match.group(1)}/{match.group(2)}"
+    else:
+        match = _DIARY_PARAM_RE.search(link or "")
+        if match:
+            diary_no = match.group(1)
+
+    case_number = None
+    for part in (text or "").split(' - ')[1:]:
+        if _CASE_NO_RE.search(part) and not _DIARY_RE.search(part):
+            case_number = " ".join(part.split())
+            break
+    return diary_no, case_number
@@ -1,62 +1,66 @@
-import requests
+import re
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 
-def fetch_sc_judgments():
+from services.html_links import collect_anchors
+
+IK_BASE_URL = "https://indiankanoon.org"
+# Construct URL for "Supreme Court" doctype, sorted by most recent
+SEARCH_URL = IK_BASE_URL + "/search/?formInput=doctypes:supremecourt&sortby=mostrecent"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# "State Of Punjab vs Rajesh Kumar on 6 January, 2026"
+_TITLE_DATE_RE = re.compile(r'\s+on\s+(\d{1,2}\s+[A-Za-z]+,?\s+\d{4})\s*$')
+
+
+def split_title_date(title):
+    """("State Of Punjab vs Rajesh Kumar", datetime(2026, 1, 6)); the date is None if absent."""
+    match = _TITLE_DATE_RE.search(title)
+    if match:
+        try:
+            date = datetime.strptime(match.group(1).replace(",", ""), "%d %B %Y")
+            return title[:match.start()], date
+        except ValueError:
+            pass
+    return title, None
+
+
+def parse_sc_judgments(html):
     """
-    Fetches recent Supreme Court judgments from Indian Kanoon.
-    The official sci.gov.in includes CAPTCHAs, making it unreliable for direct scraping.
-    Indian Kanoon provides a cleaner list of recent SC judgments.
+    Title and link of every search result, in page order. Indian Kanoon
+    structure: div.result_title contains the link and title; only that anchor
+    is looked at, without building a tree of the page.
     """
-    try:
-        # Construct URL for "Supreme Court" doctype, sorted by most recent
-        # Indian Kanoon doesn't strictly support "last 7 days" via URL params easily without form submission,
-        # but the "latest" page usually has them.
-        url = "https://indiankanoon.org/search/?formInput=doctypes:supremecourt&sortby=mostrecent"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print(f"Failed to fetch data: {response.status_code}")
-            return []
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        judgments = []
-        # Indian Kanoon structure: div.result_title contains the link and title
-        results = soup.find_all('div', class_='result_title')
-        
-        for item in results[:10]: # Get top 10
-            a_tag = item.find('a')
-            if a_tag:
-                title = a_tag.get_text().strip()
-                # Relative link, need to prepend domain
-                link = "https://indiankanoon.org" + a_tag['href']
-                
-                # Try to find date/snippet if available in adjacent divs?
-                # Indian Kanoon puts snippet in div.headline
-                # Date is often in the title or snippet, but we can default to "Recent" or "Today" for the dashboard feel
-                # if exact date isn't easily parsed from the list view.
-                
-                # For realistic feel, we'll try to extract date from the snippet below the title if possible
-                # But for now, we assume these ARE the latest.
-                
-                judgments.append({
-                    "id": abs(hash(title)) % 100000, # Generate a pseudo ID
-                    "title": title,
-                    "summary": f"Supreme Court Judgment - {title}",
-                    "effective_date": datetime.now().strftime("%a %b %d %Y"), # Fallback to today as these are "Most Recent"
-                    "details": f"Full text available at: {link}"
-                })
-                
-        return judgments
-
-    except Exception as e:
-        print(f"Scraping error: {e}")
-        return []
+    return [
+        {"title": "".join(strings).strip(), "link": IK_BASE_URL + href}  # Relative link, need to prepend domain
+        for href, strings in collect_anchors(html, container=("div", "result_title"))
+    ]
+
+
+def parse_sc_judgments_tree(html):
+    """Reference parser: builds the full BeautifulSoup tree of the page."""
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    for item in soup.find_all('div', class_='result_title'):
+        a_tag = item.find('a')
+        if a_tag and a_tag.get('href') is not None:
+            results.append({"title": a_tag.get_text().strip(), "link": IK_BASE_URL + a_tag['href']})
+    return results
+
 
 if __name__ == "__main__":
-    print(fetch_sc_judgments())
+    import asyncio
+
+    import httpx
+
+    from services.judgment_sources import SOURCES
+
+    async def main():
+        async with httpx.AsyncClient(follow_redirects=True) as client:
+            result = await SOURCES["indiankanoon"]().fetch(client)
+        for item in result.items[:10]:
+            print(item["date"], item["title"], item["link"])
+
+    asyncio.run(main())
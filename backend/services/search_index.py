@@ -0,0 +1,274 @@
+import html
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# The database brackets matches with these private-use characters; the snippet is
+# HTML-escaped before they become <mark> tags, so document and chat text can't inject markup
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+_HEADLINE_OPTS = f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxFragments=2, MaxWords=24"
+
+_available = {"sqlite": False, "postgresql": False}
+
+# ── Index setup ──────────────────────────────────────────────────────────────
+# SQLite: external-content FTS5 tables over cases / chat_messages /
+# judgment_texts, kept in step by triggers, so every insert/update/delete
+# (including the background workers') is indexed incrementally. Postgres:
+# generated tsvector columns with GIN indexes, maintained by the database itself.
+
+_SQLITE_SETUP = {
+    "cases_fts": [
+        """CREATE VIRTUAL TABLE cases_fts USING fts5(
+            filename, translated_content, content='cases', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2')""",
+        """CREATE TRIGGER cases_fts_ai AFTER INSERT ON cases BEGIN
+            INSERT INTO cases_fts(rowid, filename, translated_content)
+            VALUES (new.id, new.filename, new.translated_content);
+        END""",
+        """CREATE TRIGGER cases_fts_ad AFTER DELETE ON cases BEGIN
+            INSERT INTO cases_fts(cases_fts, rowid, filename, translated_content)
+            VALUES ('delete', old.id, old.filename, old.translated_content);
+        END""",
+        """CREATE TRIGGER cases_fts_au AFTER UPDATE OF filename, translated_content ON cases BEGIN
+            INSERT INTO cases_fts(cases_fts, rowid, filename, translated_content)
+            VALUES ('delete', old.id, old.filename, old.translated_content);
+            INSERT INTO cases_fts(rowid, filename, translated_content)
+            VALUES (new.id, new.filename, new.translated_content);
+        END""",
+        "INSERT INTO cases_fts(cases_fts) VALUES ('rebuild')",
+    ],
+    "chat_messages_fts": [
+        """CREATE VIRTUAL TABLE chat_messages_fts USING fts5(
+            content, content='chat_messages', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2')""",
+        """CREATE TRIGGER chat_messages_fts_ai AFTER INSERT ON chat_messages BEGIN
+            INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content);
+        END""",
+        """CREATE TRIGGER chat_messages_fts_ad AFTER DELETE ON chat_messages BEGIN
+            INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END""",
+        """CREATE TRIGGER chat_messages_fts_au AFTER UPDATE OF content ON chat_messages BEGIN
+            INSERT INTO chat_messages_fts(chat_messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO chat_messages_fts(rowid, content) VALUES (new.id, new.content);
+        END""",
+        "INSERT INTO chat_messages_fts(chat_messages_fts) VALUES ('rebuild')",
+    ],
+    "judgment_texts_fts": [
+        """CREATE VIRTUAL TABLE judgment_texts_fts USING fts5(
+            text, content='judgment_texts', content_rowid='judgment_id',
+            tokenize='unicode61 remove_diacritics 2')""",
+        """CREATE TRIGGER judgment_texts_fts_ai AFTER INSERT ON judgment_texts BEGIN
+            INSERT INTO judgment_texts_fts(rowid, text) VALUES (new.judgment_id, new.text);
+        END""",
+        """CREATE TRIGGER judgment_texts_fts_ad AFTER DELETE ON judgment_texts BEGIN
+            INSERT INTO judgment_texts_fts(judgment_texts_fts, rowid, text) VALUES ('delete', old.judgment_id, old.text);
+        END""",
+        """CREATE TRIGGER judgment_texts_fts_au AFTER UPDATE OF text ON judgment_texts BEGIN
+            INSERT INTO judgment_texts_fts(judgment_texts_fts, rowid, text) VALUES ('delete', old.judgment_id, old.text);
+            INSERT INTO judgment_texts_fts(rowid, text) VALUES (new.judgment_id, new.text);
+        END""",
+        "INSERT INTO judgment_texts_fts(judgment_texts_fts) VALUES ('rebuild')",
+    ],
+}
+
+_POSTGRES_SETUP = [
+    """ALTER TABLE cases ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(filename, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(translated_content, '')), 'B')) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_cases_search_tsv ON cases USING GIN (search_tsv)",
+    """ALTER TABLE chat_messages ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(content, ''))) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_chat_messages_search_tsv ON chat_messages USING GIN (search_tsv)",
+    """ALTER TABLE judgment_texts ADD COLUMN IF NOT EXISTS search_tsv tsvector GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(text, ''))) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_judgment_texts_search_tsv ON judgment_texts USING GIN (search_tsv)",
+]
+
+
+def ensure_search_index(engine: Engine):
+    """Create the full-text indexes (once each) and backfill them from existing rows."""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                for table, statements in _SQLITE_SETUP.items():
+                    exists = conn.execute(text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                    ), {"name": table}).first()
+                    if not exists:
+                        for statement in statements:
+                            conn.execute(text(statement))
+            elif dialect == "postgresql":
+                for statement in _POSTGRES_SETUP:
+                    conn.execute(text(statement))
+            else:
+                return
+        _available[dialect] = True
+    except Exception as e:
+        print(f"Full-text search index unavailable ({dialect}): {e}")
+
+
+def is_available(db: Session) -> bool:
+    return _available.get(db.bind.dialect.name, False)
+
+
+# ── Queries ──────────────────────────────────────────────────────────────────
+
+def _terms(query: str):
+    return re.findall(r"\w+", query)
+
+
+def _fts5_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 expression: every word must match, each
+    quoted so FTS5 operators in the input are taken literally, and the last
+    word matches as a prefix for search-as-you-type.
+    """
+    terms = _terms(query)
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _tsquery(query: str) -> Optional[str]:
+    terms = _terms(query)
+    if not terms:
+        return None
+    return " & ".join(terms[:-1] + [terms[-1] + ":*"])
+
+
+def _highlight(snippet: Optional[str]) -> Optional[str]:
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(_MATCH_START, HIGHLIGHT_START).replace(_MATCH_END, HIGHLIGHT_END)
+
+
+def _page(rows, total, limit, offset):
+    results = []
+    for row in rows:
+        result = dict(row._mapping)
+        result["snippet"] = _highlight(result.get("snippet"))
+        results.append(result)
+    return {"total": total, "limit": limit, "offset": offset, "results": results}
+
+
+def search_cases(db: Session, user_id: int, query: str, limit: int = 20, offset: int = 0) -> dict:
+    """Rank the user's cases by BM25 over filename (weighted higher) and translated text."""
+    if db.bind.dialect.name == "postgresql":
+        q = _tsquery(query)
+        if q is None:
+            return _page([], 0, limit, offset)
+        params = {"q": q, "user_id": user_id, "limit": limit, "offset": offset,
+                  "opts": _HEADLINE_OPTS}
+        where = "c.user_id = :user_id AND c.search_tsv @@ to_tsquery('simple', :q)"
+        total = db.execute(text(f"SELECT count(*) FROM cases c WHERE {where}"), params).scalar()
+        rows = db.execute(text(f"""
+            SELECT c.id, c.filename, c.target_language, c.uploaded_at,
+                   ts_headline('simple', coalesce(c.translated_content, ''), to_tsquery('simple', :q), :opts) AS snippet,
+                   ts_rank_cd(c.search_tsv, to_tsquery('simple', :q)) AS score
+            FROM cases c WHERE {where}
+            ORDER BY score DESC, c.id DESC LIMIT :limit OFFSET :offset"""), params)
+        return _page(rows, total, limit, offset)
+
+    q = _fts5_query(query)
+    if q is None:
+        return _page([], 0, limit, offset)
+    params = {"q": q, "user_id": user_id, "limit": limit, "offset": offset,
+              "start": _MATCH_START, "end": _MATCH_END}
+    where = "cases_fts MATCH :q AND c.user_id = :user_id"
+    total = db.execute(text(
+        f"SELECT count(*) FROM cases_fts JOIN cases c ON c.id = cases_fts.rowid WHERE {where}"
+    ), params).scalar()
+    rows = db.execute(text(f"""
+        SELECT c.id, c.filename, c.target_language, c.uploaded_at,
+               snippet(cases_fts, 1, :start, :end, '…', 24) AS snippet,
+               -bm25(cases_fts, 5.0, 1.0) AS score
+        FROM cases_fts JOIN cases c ON c.id = cases_fts.rowid
+        WHERE {where}
+        ORDER BY bm25(cases_fts, 5.0, 1.0), c.id DESC LIMIT :limit OFFSET :offset"""), params)
+    return _page(rows, total, limit, offset)
+
+
+def search_messages(db: Session, user_id: int, query: str, limit: int = 20, offset: int = 0) -> dict:
+    """Rank messages across the user's chat sessions by BM25."""
+    if db.bind.dialect.name == "postgresql":
+        q = _tsquery(query)
+        if q is None:
+            return _page([], 0, limit, offset)
+        params = {"q": q, "user_id": user_id, "limit": limit, "offset": offset,
+                  "opts": _HEADLINE_OPTS}
+        where = "s.user_id = :user_id AND m.search_tsv @@ to_tsquery('simple', :q)"
+        total = db.execute(text(
+            f"SELECT count(*) FROM chat_messages m JOIN chat_sessions s ON s.id = m.session_id WHERE {where}"
+        ), params).scalar()
+        rows = db.execute(text(f"""
+            SELECT m.id, m.session_id, s.title AS session_title, m.role, m.created_at, m.document_name,
+                   ts_headline('simple', coalesce(m.content, ''), to_tsquery('simple', :q), :opts) AS snippet,
+                   ts_rank_cd(m.search_tsv, to_tsquery('simple', :q)) AS score
+            FROM chat_messages m JOIN chat_sessions s ON s.id = m.session_id
+            WHERE {where}
+            ORDER BY score DESC, m.id DESC LIMIT :limit OFFSET :offset"""), params)
+        return _page(rows, total, limit, offset)
+
+    q = _fts5_query(query)
+    if q is None:
+        return _page([], 0, limit, offset)
+    params = {"q": q, "user_id": user_id, "limit": limit, "offset": offset,
+              "start": _MATCH_START, "end": _MATCH_END}
+    joins = ("FROM chat_messages_fts JOIN chat_messages m ON m.id = chat_messages_fts.rowid "
+             "JOIN chat_sessions s ON s.id = m.session_id")
+    where = "chat_messages_fts MATCH :q AND s.user_id = :user_id"
+    total = db.execute(text(f"SELECT count(*) {joins} WHERE {where}"), params).scalar()
+    rows = db.execute(text(f"""
+        SELECT m.id, m.session_id, s.title AS session_title, m.role, m.created_at, m.document_name,
+               snippet(chat_messages_fts, 0, :start, :end, '…', 24) AS snippet,
+               -bm25(chat_messages_fts) AS score
+        {joins}
+        WHERE {where}
+        ORDER BY bm25(chat_messages_fts), m.id DESC LIMIT :limit OFFSET :offset"""), params)
+    return _page(rows, total, limit, offset)
+
+
+def search_judgments(db: Session, query: str, limit: int = 20, offset: int = 0) -> dict:
+    """Rank fetched judgment texts (judgment_texts) by BM25."""
+    if db.bind.dialect.name == "postgresql":
+        q = _tsquery(query)
+        if q is None:
+            return _page([], 0, limit, offset)
+        params = {"q": q, "limit": limit, "offset": offset,
+                  "opts": _HEADLINE_OPTS}
+        where = "t.search_tsv @@ to_tsquery('simple', :q)"
+        total = db.execute(text(f"SELECT count(*) FROM judgment_texts t WHERE {where}"), params).scalar()
+        rows = db.execute(text(f"""
+            SELECT j.id, j.title, j.link, j.judgment_date AS date, j.category, t.page_count,
+                   ts_headline('simple', coalesce(t.text, ''), to_tsquery('simple', :q), :opts) AS snippet,
+                   ts_rank_cd(t.search_tsv, to_tsquery('simple', :q)) AS score
+            FROM judgment_texts t JOIN judgments j ON j.id = t.judgment_id
+            WHERE {where}
+            ORDER BY score DESC, j.id DESC LIMIT :limit OFFSET :offset"""), params)
+        return _page(rows, total, limit, offset)
+
+    q = _fts5_query(query)
+    if q is None:
+        return _page([], 0, limit, offset)
+    params = {"q": q, "limit": limit, "offset": offset, "start": _MATCH_START, "end": _MATCH_END}
+    total = db.execute(text("SELECT count(*) FROM judgment_texts_fts WHERE judgment_texts_fts MATCH :q"), params).scalar()
+    rows = db.execute(text("""
+        SELECT j.id, j.title, j.link, j.judgment_date AS date, j.category, t.page_count,
+               snippet(judgment_texts_fts, 0, :start, :end, '…', 24) AS snippet,
+               -bm25(judgment_texts_fts) AS score
+        FROM judgment_texts_fts
+        JOIN judgment_texts t ON t.judgment_id = judgment_texts_fts.rowid
+        JOIN judgments j ON j.id = t.judgment_id
+        WHERE judgment_texts_fts MATCH :q
+        ORDER BY bm25(judgment_texts_fts), j.id DESC LIMIT :limit OFFSET :offset"""), params)
+    return _page(rows, total, limit, offset)
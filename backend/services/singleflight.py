@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into a single execution.
+
+    The first caller for a key (the leader) runs the work; callers arriving
+    while it is in flight wait on the same result instead of repeating it.
+    Works across threads and coroutines alike because the shared result is a
+    concurrent.futures.Future.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _resolve(self, key, future, result=None, error=None):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn):
+        """Run fn() once per key among concurrent blocking callers."""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._resolve(key, future, error=e)
+            raise
+        self._resolve(key, future, result=result)
+        return result
+
+    async def ado(self, key, coro_fn):
+        """
+        Await coro_fn() once per key among concurrent callers. The shared call
+        runs as its own task, so a caller that is cancelled (e.g. client
+        disconnect) does not abort it for the others.
+        """
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(coro_fn())
+            task.add_done_callback(lambda t: self._resolve(
+                key, future,
+                result=None if t.cancelled() or t.exception() else t.result(),
+                error=asyncio.CancelledError() if t.cancelled() else t.exception(),
+            ))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._inflight),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+            }
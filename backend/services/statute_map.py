@@ -0,0 +1,153 @@
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "statute_map.json")
+
+# Spellings seen in judgments and user questions, keyed by their letters only
+_CODE_ALIASES = {
+    "IPC": "IPC", "INDIANPENALCODE": "IPC",
+    "CRPC": "CrPC", "CODEOFCRIMINALPROCEDURE": "CrPC",
+    "IEA": "IEA", "EVIDENCEACT": "IEA", "INDIANEVIDENCEACT": "IEA",
+    "BNS": "BNS", "BHARATIYANYAYASANHITA": "BNS",
+    "BNSS": "BNSS", "BHARATIYANAGARIKSURAKSHASANHITA": "BNSS",
+    "BSA": "BSA", "BHARATIYASAKSHYAADHINIYAM": "BSA",
+}
+
+_CODE = r"(I\.?\s?P\.?\s?C\.?|Cr\.?\s?P\.?\s?C\.?|I\.?E\.?A\.?|(?:Indian\s+)?Evidence\s+Act|BNSS|BNS|BSA)"
+_SECTION = r"\d{1,3}[A-Z]{0,2}(?:\s?\(\d{1,2}[a-z]?\))?"
+_SECTION_LIST = rf"{_SECTION}(?:\s*(?:,|and|&|/|or)\s*{_SECTION})*"
+_SECTION_WORD = r"(?:sections?|secs?\.?|ss?\.|u/s\.?)"
+# "Section 302 IPC", "ss. 302 and 307 of the IPC", "302 IPC", "u/s 438 Cr.P.C."
+_SECTION_FIRST = re.compile(
+    rf"(?:{_SECTION_WORD}\s*)?\b({_SECTION_LIST})\s*(?:,\s*)?(?:of\s+(?:the\s+)?)?\b{_CODE}(?![A-Za-z])", re.I
+)
+# "IPC 302", "BNS Section 103(1)"
+_CODE_FIRST = re.compile(rf"(?<![A-Za-z]){_CODE}\s*(?:{_SECTION_WORD}\s*)?\b({_SECTION_LIST})(?![\d(])", re.I)
+_ONE_SECTION = re.compile(_SECTION, re.I)
+
+
+def normalize_code(code: str) -> Optional[str]:
+    return _CODE_ALIASES.get(re.sub(r"[^A-Za-z]", "", code or "").upper())
+
+
+def normalize_section(section: str) -> str:
+    """'304 a' → '304A', '103 (1)' → '103(1)'; subsection letters stay lower case."""
+    section = re.sub(r"\s+", "", section or "")
+    match = re.match(r"^(\d+)([A-Za-z]*)(\(.*\))?$", section)
+    if not match:
+        return section.upper()
+    number, suffix, sub = match.groups()
+    return number + suffix.upper() + (sub or "").lower()
+
+
+def _base_section(section: str) -> str:
+    return section.split("(", 1)[0]
+
+
+class StatuteMap:
+    """
+    Old ↔ new criminal code cross-reference (IPC/CrPC/IEA ↔ BNS/BNSS/BSA),
+    loaded once from data/statute_map.json into dicts keyed by (code, section)
+    for constant-time lookups in both directions.
+    """
+
+    def __init__(self, path: str = DATA_PATH):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.codes = data["codes"]
+        self._index: Dict[Tuple[str, str], List[dict]] = {}
+        self._titles: Dict[Tuple[str, str], str] = {}
+        for mapping in data["mappings"]:
+            old_code, new_code = mapping["from"], mapping["to"]
+            for entry in mapping["sections"]:
+                old_section, new_section, title = entry[:3]
+                note = entry[3] if len(entry) > 3 else None
+                self._add(old_code, old_section, new_code, new_section, title, note)
+                self._add(new_code, new_section, old_code, old_section, title, note)
+
+    def _add(self, code, section, other_code, other_section, title, note):
+        target = {"code": other_code, "section": other_section, "title": title, "note": note}
+        keys = [(code, section)]
+        if _base_section(section) != section:
+            # "BNS 103" should find IPC 302 even though the table says 103(1)
+            keys.append((code, _base_section(section)))
+        for key in keys:
+            targets = self._index.setdefault(key, [])
+            if target not in targets:
+                targets.append(target)
+        self._titles.setdefault((code, section), title)
+
+    def lookup(self, code: str, section: str) -> Optional[dict]:
+        code = normalize_code(code)
+        if code is None:
+            return None
+        section = normalize_section(section)
+        targets = self._index.get((code, section))
+        if targets is None and _base_section(section) != section:
+            targets = self._index.get((code, _base_section(section)))
+        if targets is None:
+            return None
+        return {
+            "code": code,
+            "section": section,
+            "title": self._titles.get((code, section), targets[0]["title"]),
+            "maps_to": targets,
+        }
+
+    def find_citations(self, text: str) -> List[Tuple[str, str]]:
+        """(code, section) pairs cited in text, in order of appearance, without duplicates."""
+        found = []
+        matches = [(m.start(), m.group(1), m.group(2)) for m in _SECTION_FIRST.finditer(text or "")]
+        matches += [(m.start(), m.group(2), m.group(1)) for m in _CODE_FIRST.finditer(text or "")]
+        for _, sections, code in sorted(matches):
+            code = normalize_code(code)
+            if code is None:
+                continue
+            for section in _ONE_SECTION.findall(sections):
+                citation = (code, normalize_section(section))
+                if citation not in found:
+                    found.append(citation)
+        return found
+
+    def cross_references(self, text: str) -> List[str]:
+        """
+        One line per cited section whose counterpart is not cited as well,
+        e.g. "Section 302 IPC → Section 103(1) BNS (Punishment for murder)".
+        """
+        cited = self.find_citations(text)
+        cited_set = set(cited)
+        lines = []
+        for code, section in cited:
+            result = self.lookup(code, section)
+            if result is None:
+                continue
+            targets = [t for t in result["maps_to"] if (t["code"], t["section"]) not in cited_set
+                       and (t["code"], _base_section(t["section"])) not in cited_set]
+            if not targets:
+                continue
+            mapped = " / ".join(f"Section {t['section']} {t['code']}" for t in targets)
+            line = f"Section {section} {code} → {mapped} ({targets[0]['title']})"
+            notes = [t["note"] for t in targets if t["note"]]
+            if notes:
+                line += f". Note: {notes[0]}"
+            lines.append(line)
+        return lines
+
+    def annotate_reply(self, text: str) -> str:
+        """Footer listing the old/new counterparts of sections cited in a model reply ('' if none)."""
+        lines = self.cross_references(text)
+        if not lines:
+            return ""
+        return "\n\n---\n**Statute cross-reference:**\n" + "\n".join(f"- {line}" for line in lines)
+
+    def annotate_question(self, text: str) -> str:
+        """Cross-references to append to a user message before it is sent to the model ('' if none)."""
+        lines = self.cross_references(text)
+        if not lines:
+            return ""
+        return "\n\n[Statute cross-reference: " + "; ".join(lines) + "]"
+
+
+statute_map = StatuteMap()
@@ -0,0 +1,314 @@
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models.case import CaseDocument
+from models.translation import TranslationJob, TranslationChunk
+from services import blob_store, case_export
+from services.document_translation import TranslationCancelled, split_into_chunks, translate_chunks
+from services.lease_queue import LeaseQueue
+from services.pdf_extraction import extract_pdf_text
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+TRANSLATING_PLACEHOLDER = "Translating… please check back in a moment."
+
+
+def enqueue_translation(db: Session, case_id: int, target_language: str) -> TranslationJob:
+    job = TranslationJob(
+        case_id=case_id,
+        target_language=target_language,
+        status=QUEUED,
+        available_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    worker_pool.notify()
+    return job
+
+
+def latest_job(db: Session, case_id: int) -> Optional[TranslationJob]:
+    return db.query(TranslationJob).filter(TranslationJob.case_id == case_id).order_by(TranslationJob.id.desc()).first()
+
+
+def job_progress(job: Optional[TranslationJob]) -> dict:
+    """Status fields shared by GET /cases/{id} and /cases/{id}/status."""
+    if job is None:
+        # Served from an earlier identical upload, or created before the job queue existed
+        return {"status": DONE, "attempts": 0, "chunks_done": None, "chunks_total": None, "progress": 1.0, "error": None}
+    progress = None
+    if job.status == DONE:
+        progress = 1.0
+    elif job.chunks_total:
+        progress = round(job.chunks_done / job.chunks_total, 3)
+    return {
+        "status": job.status,
+        "attempts": job.attempts,
+        "chunks_done": job.chunks_done,
+        "chunks_total": job.chunks_total,
+        "progress": progress,
+        "error": job.error,
+    }
+
+
+def chunks_since(db: Session, case: CaseDocument, job: Optional[TranslationJob], since_chunk: int):
+    """
+    Translated chunks from since_chunk onwards, stopping at the first one not
+    finished yet (chunks complete out of order). Returns (chunks, next_chunk):
+    the client appends the chunks and passes next_chunk on its next poll.
+    """
+    indexes = [
+        row.chunk_index for row in db.query(TranslationChunk.chunk_index).filter(
+            TranslationChunk.case_id == case.id, TranslationChunk.chunk_index >= since_chunk
+        ).order_by(TranslationChunk.chunk_index)
+    ]
+    if not indexes and (job is None or job.status == DONE) and not (job and job.chunks_total):
+        # Not translated chunk by chunk (English, reused or empty): the whole text is chunk 0
+        if since_chunk == 0:
+            return [{"index": 0, "content": case.translated_content or ""}], 1
+        return [], since_chunk
+
+    end = since_chunk
+    for index in indexes:
+        if index != end:
+            break
+        end += 1
+    if end == since_chunk:
+        return [], since_chunk
+    rows = db.query(TranslationChunk).filter(
+        TranslationChunk.case_id == case.id,
+        TranslationChunk.chunk_index >= since_chunk,
+        TranslationChunk.chunk_index < end,
+    ).order_by(TranslationChunk.chunk_index)
+    return [{"index": row.chunk_index, "content": row.content} for row in rows], end
+
+
+def delete_case_translation_state(db: Session, case_id: int):
+    db.query(TranslationChunk).filter(TranslationChunk.case_id == case_id).delete(synchronize_session=False)
+    db.query(TranslationJob).filter(TranslationJob.case_id == case_id).delete(synchronize_session=False)
+
+
+# ── Claiming ─────────────────────────────────────────────────────────────────
+# A running job's lease is its heartbeat; worker_id is the claim token, so a
+# worker whose job was taken over after a stall can no longer write to it.
+
+queue = LeaseQueue(
+    TranslationJob.id,
+    claimed_at=TranslationJob.heartbeat_at,
+    lease_seconds=lambda: settings.TRANSLATION_JOB_LEASE_SECONDS,
+    status=TranslationJob.status,
+    attempts=TranslationJob.attempts,
+    available_at=TranslationJob.available_at,
+    error=TranslationJob.error,
+    owner=TranslationJob.worker_id,
+    retry_seconds=lambda: settings.TRANSLATION_JOB_RETRY_DELAY,
+    max_attempts=lambda: settings.TRANSLATION_JOB_MAX_ATTEMPTS,
+)
+
+
+def claim_job(db: Session, worker_id: str) -> Optional[int]:
+    """Take the oldest claimable job; only one worker wins it, whichever process it runs in."""
+    for _ in range(5):
+        now = datetime.utcnow()
+        if not db.query(TranslationJob.id).filter(queue.claimable(now)).first():
+            return None
+        claimed = queue.claim_next(db, 1, now, owner=worker_id, order_by=TranslationJob.id)
+        if claimed:
+            return claimed[0]
+    return None
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Keeps a claimed job's lease alive while a long chunk is being translated.
+    Sets `lost` once the job turns out to have been taken over, so no more
+    chunks are sent to Together for it.
+    """
+
+    def __init__(self, job_id: int, worker_id: str):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.stop_event = threading.Event()
+        self.lost = threading.Event()
+
+    def run(self):
+        interval = settings.TRANSLATION_JOB_LEASE_SECONDS / 3
+        while not self.stop_event.wait(interval):
+            db = SessionLocal()
+            try:
+                if not queue.renew(db, self.job_id, self.worker_id):
+                    self.lost.set()
+                    return
+            except Exception as e:
+                print(f"Translation heartbeat error (job {self.job_id}): {e}")
+            finally:
+                db.close()
+
+
+# ── Processing ───────────────────────────────────────────────────────────────
+
+def _source_text(db: Session, case: CaseDocument) -> str:
+    if case.blob_sha256:
+        return blob_store.get_text(db, case.blob_sha256)
+    return extract_pdf_text(case.file_path)
+
+
+def process_job(job_id: int, worker_id: str):
+    """Extract → translate (resuming from stored chunks) → save. Failures are retried up to a limit."""
+    db = SessionLocal()
+    heartbeat = _Heartbeat(job_id, worker_id)
+    heartbeat.start()
+    try:
+        job = db.query(TranslationJob).filter(TranslationJob.id == job_id).first()
+        case = db.query(CaseDocument).filter(CaseDocument.id == job.case_id).first()
+        if case is None:
+            queue.finish(db, job_id, worker_id, {TranslationJob.status: FAILED,
+                                                 TranslationJob.error: "Case no longer exists"})
+            return
+
+        language = job.target_language
+        raw_text = _source_text(db, case)
+        cached = blob_store.get_translation(db, case.blob_sha256, language) if case.blob_sha256 else None
+
+        if not raw_text:
+            translated = "Could not extract text from this PDF."
+        elif language.lower() in ("english", "en"):
+            # Already English — just store the extracted text
+            translated = raw_text
+        elif cached is not None:
+            translated = cached
+        else:
+            chunks = split_into_chunks(raw_text, settings.TRANSLATION_CHUNK_CHARS)
+            completed = {
+                c.chunk_index: c.content
+                for c in db.query(TranslationChunk).filter(TranslationChunk.case_id == case.id)
+                if c.chunk_index < len(chunks)
+            }
+            queue.finish(db, job_id, worker_id, {TranslationJob.chunks_total: len(chunks),
+                                                 TranslationJob.chunks_done: len(completed)})
+
+            def on_chunk_done(index: int, content: str):
+                try:
+                    # Chunks are keyed by (case, index), so a stray duplicate is simply refused
+                    db.add(TranslationChunk(case_id=case.id, chunk_index=index, content=content))
+                    db.flush()
+                except IntegrityError:
+                    db.rollback()
+                    return
+                if not queue.finish(db, job_id, worker_id,
+                                    {TranslationJob.chunks_done: TranslationJob.chunks_done + 1,
+                                     TranslationJob.heartbeat_at: datetime.utcnow()}, commit=False):
+                    db.rollback()
+                    heartbeat.lost.set()
+                    return
+                db.commit()
+
+            translated = "".join(translate_chunks(chunks, language, completed, on_chunk_done,
+                                                  cancel=heartbeat.lost))
+            if case.blob_sha256:
+                blob_store.save_translation(db, case.blob_sha256, language, translated)
+
+        # The result is written together with DONE, and only while this worker still holds the job
+        if not queue.finish(db, job_id, worker_id, {TranslationJob.status: DONE, TranslationJob.error: None},
+                            commit=False):
+            db.rollback()
+            print(f"Translation job {job_id} was taken over by another worker; result discarded")
+            return
+        stale_exports = case_export.replace_content(case, translated)
+        db.commit()
+        for sha256 in stale_exports:
+            case_export.release_export(db, sha256)
+    except TranslationCancelled:
+        db.rollback()
+        print(f"Translation job {job_id} was taken over by another worker; stopped translating it")
+    except Exception as e:
+        print(f"Translation job {job_id} error: {e}")
+        db.rollback()
+        _record_failure(db, job_id, worker_id, str(e))
+    finally:
+        heartbeat.stop_event.set()
+        db.close()
+
+
+def _record_failure(db: Session, job_id: int, worker_id: str, error: str):
+    # Back off before the next attempt; finished chunks are kept
+    if queue.record_failure(db, job_id, worker_id, error) != FAILED:
+        return
+    case_id = db.query(TranslationJob.case_id).filter(TranslationJob.id == job_id).scalar()
+    case = db.query(CaseDocument).filter(CaseDocument.id == case_id).first()
+    if case:
+        stale_exports = case_export.replace_content(case, f"Translation failed: {error}")
+        db.commit()
+        for sha256 in stale_exports:
+            case_export.release_export(db, sha256)
+
+
+# ── Worker pool ──────────────────────────────────────────────────────────────
+
+class TranslationWorkerPool:
+    """
+    Threads that claim and run translation jobs. Runs inside the API process
+    (TRANSLATION_WORKERS_IN_APP) or standalone via `python worker.py`; any
+    number of pools can share the jobs table.
+    """
+
+    def __init__(self):
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self, workers: int):
+        for i in range(workers):
+            thread = threading.Thread(target=self._run, args=(f"{self.prefix}:{i}:{uuid.uuid4().hex[:6]}",),
+                                      name=f"translation-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def notify(self):
+        """Wake idle workers now instead of at the next poll."""
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self, worker_id: str):
+        while not self._stop.is_set():
+            job_id = None
+            db = SessionLocal()
+            try:
+                job_id = claim_job(db, worker_id)
+            except Exception as e:
+                print(f"Translation worker {worker_id} claim error: {e}")
+            finally:
+                db.close()
+
+            if job_id is not None:
+                process_job(job_id, worker_id)
+                continue
+            self._wake.wait(settings.TRANSLATION_WORKER_POLL_SECONDS)
+            self._wake.clear()
+
+
+worker_pool = TranslationWorkerPool()
@@ -0,0 +1,329 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+# Outcome of a single upstream attempt
+OK = "ok"
+OVERLOADED = "overloaded"      # 429 / timeout: upstream is alive but saturated
+FAILED = "failed"              # 5xx / connection error: upstream looks unhealthy
+CLIENT_ERROR = "client_error"  # other 4xx: our request is wrong, retrying won't help
+
+RETRYABLE = (OVERLOADED, FAILED)
+
+
+class UpstreamError(Exception):
+    """Base class for calls rejected by the guard before reaching the upstream."""
+
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+
+class UpstreamBusyError(UpstreamError):
+    pass
+
+
+def classify_status(status_code: int) -> str:
+    if status_code < 400:
+        return OK
+    if status_code == 429:
+        return OVERLOADED
+    if status_code >= 500:
+        return FAILED
+    return CLIENT_ERROR
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Waiter:
+    def __init__(self, loop=None):
+        self.loop = loop
+        self.granted = False
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def notify(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._set_future)
+
+    def _set_future(self):
+        if not self.future.done():
+            self.future.set_result(True)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit shared by threads and coroutines. The limit grows by
+    roughly one slot per window of successful calls and halves when the
+    upstream signals overload. Waiters are served FIFO.
+    """
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial, min_limit), max_limit))
+        self.in_flight = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def _has_capacity(self):
+        return self.in_flight < int(self.limit)
+
+    def _try_acquire_locked(self):
+        if not self._waiters and self._has_capacity():
+            self.in_flight += 1
+            return True
+        return False
+
+    def _wake_locked(self):
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self.in_flight += 1
+            waiter.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            if self._try_acquire_locked():
+                return True
+            waiter = _Waiter()
+            self._waiters.append(waiter)
+        if waiter.event.wait(timeout):
+            return True
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire_locked():
+                return
+            waiter = _Waiter(loop)
+            self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self._release_locked()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self, outcome: Optional[str]):
+        with self._lock:
+            if outcome == OK:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            elif outcome == OVERLOADED:
+                self.limit = max(self.min_limit, self.limit / 2)
+            self._release_locked()
+
+    def _release_locked(self):
+        self.in_flight -= 1
+        self._wake_locked()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters),
+            }
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive upstream failures and rejects
+    calls for `reset_timeout` seconds; then lets a single probe through
+    (half-open) which either closes the circuit or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, outcome: Optional[str]):
+        with self._lock:
+            if outcome is None:
+                # Attempt was abandoned (e.g. caller cancelled); says nothing about health
+                self._probe_in_flight = False
+                return
+            if outcome in (OK, CLIENT_ERROR):
+                self.state = self.CLOSED
+                self.consecutive_failures = 0
+                self._probe_in_flight = False
+                return
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == self.OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "rejected": self.rejected,
+                "retry_in_seconds": round(retry_in, 1),
+            }
+
+
+class UpstreamGuard:
+    """
+    Wraps calls to an HTTP upstream with an adaptive concurrency limit,
+    jittered exponential backoff (honouring Retry-After) and a circuit breaker.
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter, breaker: CircuitBreaker, max_retries: int,
+                 base_delay: float, max_delay: float, queue_timeout: float):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.queue_timeout = queue_timeout
+        self.retries = 0
+
+    # ── Primitives (also used directly for streaming calls) ──────────────────
+
+    def before(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError("Upstream circuit is open; failing fast")
+        if not self.limiter.acquire(timeout=self.queue_timeout):
+            self.breaker.record(None)
+            raise UpstreamBusyError("Timed out waiting for an upstream slot")
+
+    async def abefore(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError("Upstream circuit is open; failing fast")
+        try:
+            await asyncio.wait_for(self.limiter.aacquire(), timeout=self.queue_timeout)
+        except BaseException as e:
+            self.breaker.record(None)
+            if isinstance(e, asyncio.TimeoutError):
+                raise UpstreamBusyError("Timed out waiting for an upstream slot")
+            raise
+
+    def after(self, outcome: Optional[str]):
+        self.limiter.release(outcome)
+        self.breaker.record(outcome)
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        if attempt >= self.max_retries:
+            return None
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        # "Full jitter" backoff spreads retries from many callers apart
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    # ── Calls ────────────────────────────────────────────────────────────────
+
+    def call(self, send):
+        """send() -> httpx.Response. Returns the final response or raises the last error."""
+        attempt = 0
+        while True:
+            self.before()
+            response, error, outcome = None, None, None
+            try:
+                response = send()
+                outcome = classify_status(response.status_code)
+            except httpx.TimeoutException as e:
+                error, outcome = e, OVERLOADED
+            except httpx.TransportError as e:
+                error, outcome = e, FAILED
+            finally:
+                self.after(outcome)
+            if outcome not in RETRYABLE:
+                return response
+            delay = self._retry_delay(attempt, response)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            self.retries += 1
+            attempt += 1
+            time.sleep(delay)
+
+    async def acall(self, send):
+        """Async variant of call(); send() -> awaitable httpx.Response."""
+        attempt = 0
+        while True:
+            await self.abefore()
+            response, error, outcome = None, None, None
+            try:
+                response = await send()
+                outcome = classify_status(response.status_code)
+            except httpx.TimeoutException as e:
+                error, outcome = e, OVERLOADED
+            except httpx.TransportError as e:
+                error, outcome = e, FAILED
+            finally:
+                self.after(outcome)
+            if outcome not in RETRYABLE:
+                return response
+            delay = self._retry_delay(attempt, response)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "limiter": self.limiter.stats(),
+            "breaker": self.breaker.stats(),
+            "retries": self.retries,
+        }
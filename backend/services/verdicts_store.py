@@ -0,0 +1,295 @@
+import base64
+import csv
+import hashlib
+import json
+import os
+import re
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.verdict import Verdict, VerdictStatute
+from services.statute_map import normalize_code, normalize_section
+
+SEED_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "landmark_verdicts.jsonl")
+
+_FIELDS = ("title", "citation", "verdict_date", "topic", "statutes", "summary", "details")
+_DATE_FORMATS = ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y", "%d %B %Y", "%d %b %Y", "%a %b %d %Y")
+# "IPC 302", "Section 11 CPC", "Constitution Art. 21", "IT Act s. 66A"
+_STATUTE_RE = re.compile(
+    r"^(?:(?:sections?|sec\.?|s\.|art(?:icle)?\.?)\s*)?(?P<lead>\d+[A-Za-z]*(?:\(\w+\))*)\s*(?:of\s+(?:the\s+)?)?(?P<code1>.+)$"
+    r"|^(?P<code2>.+?)[\s,]+(?:(?:sections?|sec\.?|s\.|art(?:icle)?\.?)\s*)?(?P<trail>\d+[A-Za-z]*(?:\(\w+\))*)$",
+    re.I,
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def normalize_statute(statute: str) -> str:
+    """
+    Key a statute reference is stored and filtered by: the criminal codes get
+    their canonical abbreviation (statute_map), every other act is upper-cased,
+    and "Section"/"Art." words are dropped, so "s. 302 of the Indian Penal
+    Code" and "IPC 302" both become "IPC 302".
+    """
+    statute = " ".join((statute or "").split()).strip(" ,.;")
+    match = _STATUTE_RE.match(statute)
+    if not match:
+        return statute.upper()
+    code = (match.group("code1") or match.group("code2")).strip(" ,.")
+    section = match.group("lead") or match.group("trail")
+    return f"{normalize_code(code) or code.upper()} {normalize_section(section)}"
+
+
+def parse_date(value) -> date:
+    if isinstance(value, date):
+        return value
+    value = (value or "").strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date '{value}'")
+
+
+def _statute_list(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        # CSV cells and hand-written JSONL list several statutes separated by ";"
+        value = value.split(";")
+    return [" ".join(s.split()) for s in value if s and s.strip()]
+
+
+def verdict_ref(record: dict) -> str:
+    """Stable key for upserts: the record's own "ref" if it has one, else its citation, else title and date."""
+    if record.get("ref"):
+        return str(record["ref"]).strip()[:64]
+    basis = record["citation"] or f"{record['title']}|{record['verdict_date'].isoformat()}"
+    return hashlib.sha256(" ".join(basis.lower().split()).encode("utf-8")).hexdigest()[:32]
+
+
+def clean_record(raw: dict) -> dict:
+    """Validate one source record into the column values the loader writes. Raises ValueError."""
+    title = (raw.get("title") or "").strip()
+    if not title:
+        raise ValueError("Missing title")
+    record = {
+        "title": title,
+        "citation": (raw.get("citation") or "").strip() or None,
+        "verdict_date": parse_date(raw.get("date") or raw.get("verdict_date")),
+        "topic": (raw.get("topic") or "").strip() or None,
+        "statutes": _statute_list(raw.get("statutes")),
+        "summary": (raw.get("summary") or "").strip() or None,
+        "details": (raw.get("details") or "").strip() or None,
+    }
+    record["ref"] = verdict_ref(dict(record, ref=raw.get("ref")))
+    return record
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[tuple]:
+    """Stream (line_no, raw record) from a JSONL or CSV file without loading it whole."""
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(f), start=2):
+                yield line_no, row
+            return
+        for line_no, line in enumerate(f, start=1):
+            if line.strip():
+                yield line_no, json.loads(line)
+
+
+# ── Bulk loading ─────────────────────────────────────────────────────────────
+
+def _column_values(record: dict) -> dict:
+    values = {field: record[field] for field in _FIELDS}
+    values["statutes"] = json.dumps(record["statutes"]) if record["statutes"] else None
+    return values
+
+
+def _statute_rows(verdict: Verdict, statutes: List[str]) -> List[VerdictStatute]:
+    keys = dict.fromkeys(normalize_statute(s) for s in statutes)  # ordered and de-duplicated
+    return [VerdictStatute(verdict_id=verdict.id, statute=key[:100], verdict_date=verdict.verdict_date)
+            for key in keys]
+
+
+def load_batch(db: Session, records: List[dict]) -> dict:
+    """
+    Upsert one batch in a single transaction, keyed by ref. Only this batch's
+    refs are looked up, and unchanged records are left alone (their
+    updated_at, and so the catalogue ETag, stays put).
+    """
+    by_ref = {}
+    for record in records:
+        by_ref[record["ref"]] = record  # the last occurrence in the file wins
+    now = datetime.utcnow()
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    existing = {v.ref: v for v in db.query(Verdict).filter(Verdict.ref.in_(list(by_ref))).all()}
+    new, changed = [], []
+    for ref, record in by_ref.items():
+        values = _column_values(record)
+        row = existing.get(ref)
+        if row is None:
+            new.append((Verdict(ref=ref, updated_at=now, **values), record))
+        elif any(getattr(row, k) != v for k, v in values.items()):
+            for k, v in values.items():
+                setattr(row, k, v)
+            row.updated_at = now
+            changed.append((row, record))
+        else:
+            counts["unchanged"] += 1
+
+    db.add_all([row for row, _ in new])
+    db.flush()  # assigns ids to the new rows
+    if changed:
+        db.query(VerdictStatute).filter(
+            VerdictStatute.verdict_id.in_([row.id for row, _ in changed])
+        ).delete(synchronize_session=False)
+    for row, record in new + changed:
+        db.add_all(_statute_rows(row, record["statutes"]))
+    db.commit()
+    counts["inserted"] = len(new)
+    counts["updated"] = len(changed)
+    return counts
+
+
+def load_records(db: Session, rows: Iterable[tuple], batch_size: Optional[int] = None) -> dict:
+    """Load (line_no, raw record) pairs in batches of batch_size, one transaction each."""
+    batch_size = batch_size or settings.VERDICTS_LOAD_BATCH
+    totals = {"inserted": 0, "updated": 0, "unchanged": 0, "invalid": 0}
+
+    def flush(batch):
+        try:
+            counts = load_batch(db, batch)
+        except IntegrityError:
+            # Another loader inserted some of these refs meanwhile; they are updates now
+            db.rollback()
+            counts = load_batch(db, batch)
+        for key, value in counts.items():
+            totals[key] += value
+
+    batch = []
+    for line_no, raw in rows:
+        try:
+            batch.append(clean_record(raw))
+        except (ValueError, TypeError, AttributeError) as e:
+            totals["invalid"] += 1
+            print(f"Verdict record on line {line_no} skipped: {e}")
+            continue
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return totals
+
+
+def load_file(db: Session, path: str, fmt: Optional[str] = None, batch_size: Optional[int] = None) -> dict:
+    return load_records(db, read_records(path, fmt), batch_size)
+
+
+def seed_verdicts(db: Session):
+    """Load the bundled landmark verdicts into an empty catalogue."""
+    if db.query(Verdict.id).first() is not None or not os.path.exists(SEED_PATH):
+        return
+    totals = load_file(db, SEED_PATH)
+    print(f"Seeded verdicts catalogue: {totals['inserted']} verdicts")
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────
+
+def catalogue_version(db: Session) -> str:
+    """
+    Changes whenever the loader inserts or updates a verdict. Two single-
+    aggregate queries so each is answered from an index (SQLite only applies
+    its min/max optimisation to a lone aggregate).
+    """
+    last_update = db.query(func.max(Verdict.updated_at)).scalar()
+    last_id = db.query(func.max(Verdict.id)).scalar()
+    return f"{last_update.isoformat() if last_update else ''}|{last_id or 0}"
+
+
+def encode_cursor(day: date, row_id: int) -> str:
+    raw = f"{day.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day, row_id = raw.split("|")
+        return date.fromisoformat(day), int(row_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def to_item(row: Verdict, details: bool = False) -> dict:
+    item = {
+        "id": row.id,
+        "title": row.title,
+        "citation": row.citation,
+        "date": row.verdict_date.isoformat(),
+        "topic": row.topic,
+        "statutes": json.loads(row.statutes) if row.statutes else [],
+        "summary": row.summary,
+    }
+    if details:
+        item["details"] = row.details
+    return item
+
+
+def list_verdicts(
+    db: Session,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    topic: Optional[str] = None,
+    statute: Optional[str] = None,
+) -> dict:
+    """
+    Newest first by (verdict_date, id), with the cursor holding the last row
+    of the previous page. Filtering by statute walks verdict_statutes'
+    (statute, verdict_date, verdict_id) index instead, so every page is an
+    index range scan whichever filter is used.
+    """
+    if statute:
+        date_col, id_col = VerdictStatute.verdict_date, VerdictStatute.verdict_id
+        query = (
+            db.query(Verdict)
+            .join(VerdictStatute, VerdictStatute.verdict_id == Verdict.id)
+            .filter(VerdictStatute.statute == normalize_statute(statute))
+        )
+    else:
+        date_col, id_col = Verdict.verdict_date, Verdict.id
+        query = db.query(Verdict)
+    if topic:
+        query = query.filter(Verdict.topic == topic)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        query = query.filter(or_(date_col < last_date, and_(date_col == last_date, id_col < last_id)))
+    rows = query.order_by(date_col.desc(), id_col.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [to_item(r) for r in rows],
+        "next_cursor": encode_cursor(rows[-1].verdict_date, rows[-1].id) if has_more else None,
+    }
+
+
+def list_topics(db: Session) -> List[dict]:
+    rows = (
+        db.query(Verdict.topic, func.count(Verdict.id))
+        .filter(Verdict.topic.isnot(None))
+        .group_by(Verdict.topic)
+        .order_by(Verdict.topic)
+        .all()
+    )
+    return [{"topic": topic, "count": count} for topic, count in rows]
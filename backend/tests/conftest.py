@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+# Settings are read from the environment when config is first imported, so
+# point the app at a throwaway database before any backend module loads
+_TMP = tempfile.mkdtemp(prefix="legal_ai_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ["AI_CACHE_DB_PATH"] = os.path.join(_TMP, "ai_cache.db")
+for flag in ("JUDGMENTS_REFRESH_ENABLED", "JUDGMENT_PDF_PREFETCH_ENABLED", "JUDGMENT_SUMMARIES_ENABLED",
+             "REMINDERS_ENABLED", "TRANSLATION_WORKERS_IN_APP"):
+    os.environ[flag] = "0"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+import pytest  # noqa: E402
+
+from database import Base, SessionLocal, engine  # noqa: E402
+import models.judgment  # noqa: E402,F401
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import socket
+import threading
+import time
+from datetime import date, datetime, timedelta
+from email.utils import formatdate
+
+import pytest
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, Response
+
+from config import settings
+from models.judgment import Judgment, JudgmentText
+from sample_pdf import make_pdf
+from services import judgment_pdfs
+from services.judgment_pdfs import DONE, FAILED, FETCHING, QUEUED, claim_batch, page_text
+
+PAGES = 3
+PDF = make_pdf(pages=PAGES)
+
+
+def _stand_in(hits: dict) -> FastAPI:
+    """The parts of sci.gov.in the prefetch talks to: PDFs, viewer pages and busy answers."""
+    app = FastAPI()
+    in_flight = {"now": 0}
+
+    @app.get("/view-pdf/{name}")
+    async def view_pdf(name: str, delay: float = 0.0):
+        hits[name] = hits.get(name, 0) + 1
+        in_flight["now"] += 1
+        hits["max_in_flight"] = max(hits.get("max_in_flight", 0), in_flight["now"])
+        try:
+            await asyncio.sleep(delay)
+            return Response(PDF, media_type="application/pdf")
+        finally:
+            in_flight["now"] -= 1
+
+    @app.get("/viewer/{name}")
+    def viewer(name: str):
+        # The real viewer embeds the file with a relative, entity-escaped link
+        return HTMLResponse(f'<html><body><iframe src="../files/{name}.pdf?v=1&amp;dl=0"></iframe></body></html>')
+
+    @app.get("/files/{name}.pdf")
+    def files(name: str):
+        return Response(PDF, media_type="application/pdf")
+
+    @app.get("/no-pdf")
+    def no_pdf():
+        return HTMLResponse("<html><body>Document not available</body></html>")
+
+    @app.get("/busy")
+    def busy():
+        return Response(status_code=503, headers={"Retry-After": "3600"})
+
+    @app.get("/busy-until")
+    def busy_until():
+        until = datetime.utcnow() + timedelta(hours=2)
+        return Response(status_code=429, headers={"Retry-After": formatdate(until.timestamp(), usegmt=True)})
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    """The stand-in served over real HTTP on a free local port; yields (base_url, hits)."""
+    hits = {}
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(_stand_in(hits), log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        assert time.monotonic() < deadline, "stand-in server did not start"
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{sock.getsockname()[1]}", hits
+    server.should_exit = True
+    thread.join(5)
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "JUDGMENT_PDF_HOST_DELAY", 0.0)
+    monkeypatch.setattr(settings, "JUDGMENT_PDF_RETRY_SECONDS", 60)
+    monkeypatch.setattr(settings, "JUDGMENT_PDF_MAX_ATTEMPTS", 3)
+    # Each test's pipeline starts with fresh per-host spacing
+    monkeypatch.setattr(judgment_pdfs.pdf_pipeline, "_next_start", {})
+
+
+def _add_judgments(db, *links):
+    for i, link in enumerate(links):
+        db.add(Judgment(diary_no=str(i + 1), title=f"Judgment {i + 1}", link=link,
+                        judgment_date=date(2024, 1, 1) + timedelta(days=i)))
+    db.commit()
+    return [row.id for row in db.query(Judgment).order_by(Judgment.id)]
+
+
+def _fetch(db):
+    """Claim whatever is due and run it through the pipeline, as one round of the worker thread does."""
+    batch = claim_batch(db, settings.JUDGMENT_PDF_BATCH)
+    asyncio.run(judgment_pdfs.pdf_pipeline.run_batch(batch))
+    db.expire_all()
+    return batch
+
+
+def _text(db, judgment_id) -> JudgmentText:
+    return db.query(JudgmentText).filter(JudgmentText.judgment_id == judgment_id).one()
+
+
+# ── Claiming ─────────────────────────────────────────────────────────────────
+
+def test_claim_batch_claims_each_judgment_once_newest_first(db):
+    ids = _add_judgments(db, "http://x/1", "http://x/2", "http://x/3")
+
+    first = claim_batch(db, 2)
+    assert [judgment_id for judgment_id, _, _ in first] == [ids[2], ids[1]]
+    assert [judgment_id for judgment_id, _, _ in claim_batch(db, 5)] == [ids[0]]
+    assert claim_batch(db, 5) == []
+    assert _text(db, ids[2]).status == FETCHING
+    assert _text(db, ids[2]).attempts == 1
+
+
+def test_expired_claim_is_taken_over_and_the_stale_result_discarded(db):
+    (judgment_id,) = _add_judgments(db, "http://x/1")
+    [(_, _, stale)] = claim_batch(db, 1)
+    stale -= timedelta(seconds=settings.JUDGMENT_PDF_LEASE_SECONDS + 1)
+    db.query(JudgmentText).update({JudgmentText.claimed_at: stale})
+    db.commit()
+
+    [(_, _, current)] = claim_batch(db, 1)
+    assert not judgment_pdfs._store_text(judgment_id, stale, "http://x/1", "old", 1, ["stale"])
+    assert judgment_pdfs._store_text(judgment_id, current, "http://x/1", "new", 1, ["current"])
+    db.expire_all()
+    row = _text(db, judgment_id)
+    assert (row.status, row.text, row.attempts) == (DONE, "current", 2)
+
+
+# ── Downloading ──────────────────────────────────────────────────────────────
+
+def test_pdf_is_downloaded_and_stored_with_page_offsets(db, upstream):
+    base, _ = upstream
+    (judgment_id,) = _add_judgments(db, f"{base}/view-pdf/direct")
+    _fetch(db)
+
+    row = _text(db, judgment_id)
+    assert row.status == DONE and row.error is None
+    assert row.pdf_url == f"{base}/view-pdf/direct"
+    assert (row.pdf_size, row.pdf_sha256) == (len(PDF), hashlib.sha256(PDF).hexdigest())
+    assert row.page_count == PAGES
+    assert page_text(row, 1).startswith("Page 1.")
+    assert page_text(row, PAGES).startswith(f"Page {PAGES}.")
+    assert page_text(row, PAGES + 1) is None
+    assert claim_batch(db, 5) == []
+
+
+def test_viewer_page_is_followed_to_the_embedded_pdf(db, upstream):
+    base, _ = upstream
+    (judgment_id,) = _add_judgments(db, f"{base}/viewer/embedded")
+    _fetch(db)
+
+    row = _text(db, judgment_id)
+    assert row.status == DONE
+    assert row.pdf_url == f"{base}/files/embedded.pdf?v=1&dl=0"
+    assert row.pdf_sha256 == hashlib.sha256(PDF).hexdigest()
+    assert row.page_count == PAGES
+
+
+def test_page_without_a_pdf_is_queued_for_retry(db, upstream):
+    base, _ = upstream
+    (judgment_id,) = _add_judgments(db, f"{base}/no-pdf")
+    before = datetime.utcnow()
+    _fetch(db)
+
+    row = _text(db, judgment_id)
+    assert row.status == QUEUED
+    assert row.error == "Response is neither a PDF nor a page embedding one"
+    assert row.available_at >= before + timedelta(seconds=60)
+    assert claim_batch(db, 5) == []  # not before available_at
+
+
+@pytest.mark.parametrize("path", ["/busy", "/busy-until"])
+def test_busy_upstream_is_retried_after_its_retry_after(db, upstream, path):
+    base, _ = upstream
+    (judgment_id,) = _add_judgments(db, base + path)
+    _fetch(db)
+
+    row = _text(db, judgment_id)
+    assert row.status == QUEUED
+    assert row.error.startswith("HTTP ")
+    # Retry-After (an hour, or an HTTP date two hours ahead) beats the 60 s backoff
+    assert row.available_at > datetime.utcnow() + timedelta(minutes=55)
+
+
+def test_retries_stop_after_max_attempts(db, upstream, monkeypatch):
+    monkeypatch.setattr(settings, "JUDGMENT_PDF_MAX_ATTEMPTS", 2)
+    base, _ = upstream
+    (judgment_id,) = _add_judgments(db, f"{base}/no-pdf")
+
+    _fetch(db)
+    assert _text(db, judgment_id).status == QUEUED
+    db.query(JudgmentText).update({JudgmentText.available_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    assert len(_fetch(db)) == 1
+
+    row = _text(db, judgment_id)
+    assert (row.status, row.attempts) == (FAILED, 2)
+    assert claim_batch(db, 5) == []
+
+
+def test_requests_to_one_host_respect_the_per_host_limit(db, upstream, monkeypatch):
+    monkeypatch.setattr(settings, "JUDGMENT_PDF_PER_HOST", 1)
+    monkeypatch.setattr(settings, "JUDGMENT_PDF_CONCURRENCY", 4)
+    base, hits = upstream
+    hits.pop("max_in_flight", None)
+    ids = _add_judgments(db, *(f"{base}/view-pdf/slow{i}?delay=0.2" for i in range(3)))
+    _fetch(db)
+
+    assert [_text(db, judgment_id).status for judgment_id in ids] == [DONE] * 3
+    assert hits["max_in_flight"] == 1
@@ -0,0 +1,35 @@
+import sys
+import os
+import argparse
+
+# Add the parent directory to sys.path to allow importing 'backend' module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from database import engine, Base
+from models import user, case, chat, blob, translation, passage
+from services.translation_worker import worker_pool
+from services.pdf_extraction import shutdown_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run translation workers outside the API process.")
+    parser.add_argument("--workers", type=int, default=2, help="number of worker threads")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"Starting {args.workers} translation worker(s)...")
+    worker_pool.start(args.workers)
+    try:
+        worker_pool.join()
+    except KeyboardInterrupt:
+        print("Stopping translation workers...")
+        worker_pool.stop()
+    finally:
+        shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,30 +10,42 @@ interface CaseDetail {
     filename: string;
     uploaded_at: string;
     target_language: string;
-    translated_content: string;
+    status: "queued" | "running" | "done" | "failed";
+    progress: number | null;
+    error: string | null;
+    chunks: { index: number; content: string }[];
+    next_chunk: number;
 }
 
-const POLLING_INTERVAL = 5000; // 5 s — re-fetch while translation is pending
+const POLLING_INTERVAL = 3000; // 3 s — fetch newly translated chunks while the job runs
 
 export default function DocumentViewerPage() {
     const { id } = useParams<{ id: string }>();
     const router = useRouter();
     const [doc, setDoc] = useState<CaseDetail | null>(null);
+    const [content, setContent] = useState("");
     const [loading, setLoading] = useState(true);
     const [downloading, setDownloading] = useState(false);
 
-    const isPending = (content: string) =>
-        !content || content.startsWith("Translating…") || content.startsWith("Translation failed");
-
     useEffect(() => {
         let timer: ReturnType<typeof setTimeout>;
+        let nextChunk = 0;
+        let cancelled = false;
+        setContent("");
 
         const fetch = async () => {
             try {
-                const res = await api.get(`/cases/${id}`);
-                setDoc(res.data);
-                if (isPending(res.data.translated_content)) {
-                    // Poll again after interval
+                // Only chunks translated since the last poll are sent back
+                const res = await api.get(`/cases/${id}`, { params: { since_chunk: nextChunk } });
+                const data: CaseDetail = res.data;
+                if (cancelled) return;
+                nextChunk = data.next_chunk;
+                if (data.chunks.length) {
+                    const added = data.chunks.map((c) => c.content).join("");
+                    setContent((prev) => prev + added);
+                }
+                setDoc(data);
+                if (data.status === "queued" || data.status === "running") {
                     timer = setTimeout(fetch, POLLING_INTERVAL);
                 }
             } catch {
@@ -44,7 +56,10 @@ export default function DocumentViewerPage() {
         };
 
         fetch();
-        return () => clearTimeout(timer);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
     }, [id]);
 
     const handleDownload = async () => {
@@ -87,7 +102,8 @@ export default function DocumentViewerPage() {
         );
     }
 
-    const pending = isPending(doc.translated_content);
+    const pending = doc.status === "queued" || doc.status === "running";
+    const failed = doc.status === "failed";
 
     return (
         <div className="max-w-4xl mx-auto">
@@ -118,7 +134,7 @@ export default function DocumentViewerPage() {
                     </div>
                 </div>
 
-                {!pending && (
+                {!pending && !failed && (
                     <button
                         onClick={handleDownload}
                         disabled={downloading}
@@ -136,7 +152,9 @@ export default function DocumentViewerPage() {
 
             {/* Content box */}
             <div className="bg-white dark:bg-slate-800 rounded-xl shadow-sm border border-slate-200 dark:border-slate-700 p-8">
-                {pending ? (
+                {failed ? (
+                    <p className="text-sm text-red-500">Translation failed: {doc.error}</p>
+                ) : pending && !content ? (
                     <div className="flex flex-col items-center justify-center py-16 text-slate-500 gap-4">
                         <Loader2 size={32} className="animate-spin text-blue-500" />
                         <div className="text-center">
@@ -144,15 +162,21 @@ export default function DocumentViewerPage() {
                                 Translation in progress…
                             </p>
                             <p className="text-sm text-slate-400 mt-1">
-                                This page will automatically refresh once ready.
+                                Translated sections will appear here as they are ready.
                             </p>
                         </div>
                     </div>
                 ) : (
                     <div className="prose prose-slate dark:prose-invert max-w-none">
                         <pre className="whitespace-pre-wrap font-sans text-sm text-slate-700 dark:text-slate-200 leading-relaxed">
-                            {doc.translated_content}
+                            {content}
                         </pre>
+                        {pending && (
+                            <p className="flex items-center gap-2 text-xs text-slate-400 mt-4">
+                                <Loader2 size={12} className="animate-spin" />
+                                Translating… {Math.round((doc.progress ?? 0) * 100)}%
+                            </p>
+                        )}
                     </div>
                 )}
             </div>
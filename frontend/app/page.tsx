@@ -9,11 +9,13 @@ import { Calendar, BookOpen, AlertCircle, Search, ExternalLink, Plus } from "luc
 import { useAuth } from "@/lib/auth-context";
 
 interface Judgment {
+  id: string;
   title: string;
   text: string;
   link: string;
   date: string;
   category: string;
+  sources: string[];
 }
 
 export default function Home() {
@@ -193,7 +195,7 @@ export default function Home() {
             ))
           ) : (
             filteredJudgments.map((item, index) => (
-              <a key={index} href={item.link} target="_blank" rel="noopener noreferrer">
+              <a key={item.id} href={item.link} target="_blank" rel="noopener noreferrer">
                 <motion.div
                   initial={{ opacity: 0, y: 10 }}
                   animate={{ opacity: 1, y: 0 }}
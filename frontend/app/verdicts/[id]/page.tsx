@@ -8,9 +8,12 @@ import api from "@/lib/api";
 interface Verdict {
     id: number;
     title: string;
-    summary: string;
-    effective_date: string;
-    details: string;
+    citation: string | null;
+    date: string;
+    topic: string | null;
+    statutes: string[];
+    summary: string | null;
+    details: string | null;
 }
 
 export default function VerdictPage() {
@@ -20,13 +23,10 @@ export default function VerdictPage() {
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        // In a real app, this would fetch /verdicts/{id}
-        // For now, we simulate fetching the specific verdict from our list
         const fetchVerdict = async () => {
             try {
-                const response = await api.get("/verdicts/recent");
-                const found = response.data.find((v: Verdict) => v.id === Number(params.id));
-                setVerdict(found || null);
+                const response = await api.get(`/verdicts/${params.id}`);
+                setVerdict(response.data);
             } catch (error) {
                 console.error("Error fetching verdict", error);
             } finally {
@@ -61,10 +61,14 @@ export default function VerdictPage() {
                         <div className="flex items-center gap-4 mt-3 text-slate-500 text-sm">
                             <span className="flex items-center gap-1">
                                 <Calendar size={14} />
-                                {verdict.effective_date}
+                                {new Date(verdict.date).toDateString()}
                             </span>
-                            <span>•</span>
-                            <span>Case ID: SC-{verdict.id}-2024</span>
+                            {verdict.citation && (
+                                <>
+                                    <span>•</span>
+                                    <span>{verdict.citation}</span>
+                                </>
+                            )}
                         </div>
                     </div>
                     <div className="flex gap-2">